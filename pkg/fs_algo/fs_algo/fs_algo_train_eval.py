@@ -1,10 +1,14 @@
+import sklearn
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.neural_network import MLPRegressor
 from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.preprocessing import StandardScaler, FunctionTransformer
 from sklearn.pipeline import make_pipeline
-from sklearn.model_selection import GridSearchCV,learning_curve
+from sklearn.model_selection import GridSearchCV,learning_curve,RandomizedSearchCV,KFold
+from sklearn.base import clone
+from sklearn.experimental import enable_halving_search_cv # noqa: required prior to importing the halving search classes
+from sklearn.model_selection import HalvingGridSearchCV,HalvingRandomSearchCV
 import numpy as np
 import pandas as pd
 import xarray as xr
@@ -12,11 +16,12 @@ import pynhd as nhd
 import dask_expr
 import dask.dataframe as dd
 import os
-from collections.abc import Iterable
+from collections.abc import Iterable, Callable
 from typing import List, Optional, Dict
 from pathlib import Path
 import joblib
 import itertools
+import copy
 import yaml
 import warnings
 import matplotlib.pyplot as plt
@@ -25,12 +30,29 @@ from matplotlib.figure import Figure
 import matplotlib.ticker as ticker
 import pathlib
 import seaborn as sns
-from sklearn.decomposition import PCA
+from sklearn.decomposition import PCA, IncrementalPCA
 from shapely.geometry import Point
 import geopandas as gpd
 import urllib
+import urllib.request
+import urllib.parse
+import json
+import time
 import zipfile
 import forestci as fci
+from forestci.calibration import calibrateEB
+from scipy.stats import norm
+import zlib
+import pyarrow as pa
+import pyarrow.dataset as pads
+import pyarrow.parquet as pq
+import shutil
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import multiprocessing
+from types import SimpleNamespace
+from collections import OrderedDict
+import contextlib
+from threadpoolctl import threadpool_limits
 
 # %% BASIN ATTRIBUTES (PREDICTORS) & RESPONSE VARIABLES (e.g. METRICS)
 class AttrConfigAndVars:
@@ -120,8 +142,413 @@ def _check_attr_rm_dupes(attr_df:pd.DataFrame,
         attr_df = attr_df.drop_duplicates(subset=uniq_cols, keep='first')
     return attr_df
 
+# %% CONSOLIDATED ATTRIBUTE STORE
+def std_attr_store_path(dir_db_attrs:str | os.PathLike) -> Path:
+    """Standardized directory of the consolidated attribute store
+
+    :param dir_db_attrs: directory where the per-COMID attribute .parquet files live
+    :type dir_db_attrs: str | os.PathLike
+    :return: directory of the consolidated attribute store, e.g. `/path/to/attributes_store/`
+    :rtype: Path
+
+    note:: The store lives beside `dir_db_attrs` rather than inside it, so that
+    `fs_read_attr_comid(read_type='all')` never reads the compacted data a second time.
+    """
+    dir_db_attrs = Path(dir_db_attrs)
+    return dir_db_attrs.parent/f'{dir_db_attrs.name}_store'
+
+def _std_attr_store_bucket_path(dir_attr_store:str | os.PathLike, bucket:int) -> Path:
+    """Standardized path of a single partition file inside the consolidated attribute store
+
+    :param dir_attr_store: directory of the consolidated attribute store
+    :type dir_attr_store: str | os.PathLike
+    :param bucket: the partition number
+    :type bucket: int
+    :return: path to the partition's parquet file
+    :rtype: Path
+    """
+    return Path(dir_attr_store)/f'bucket_{bucket:04d}.parquet'
+
+def _std_attr_store_meta_path(dir_attr_store:str | os.PathLike) -> Path:
+    """Standardized path of the consolidated attribute store's metadata file
+
+    :param dir_attr_store: directory of the consolidated attribute store
+    :type dir_attr_store: str | os.PathLike
+    :return: path to the yaml metadata file describing the store's partitioning
+    :rtype: Path
+    """
+    return Path(dir_attr_store)/'attr_store_meta.yaml'
+
+def _attr_store_bucket(comids: Iterable, n_buckets:int) -> np.ndarray:
+    """Assign each COMID to a consolidated attribute store partition
+
+    :param comids: COMID/featureID values
+    :type comids: Iterable
+    :param n_buckets: total number of partitions in the store
+    :type n_buckets: int
+    :return: the partition number of each COMID
+    :rtype: np.ndarray
+
+    note:: A crc32 hash is used because it is stable across python sessions, unlike `hash()`
+    """
+    return np.array([zlib.crc32(str(x).encode()) % n_buckets for x in comids], dtype=int)
+
+def _std_attr_store_df(df_attr:pd.DataFrame,
+                       cols:list = ['featureID','featureSource','data_source',
+                                    'attribute','value','dl_timestamp']) -> pd.DataFrame:
+    """Coerce attribute data into the consolidated attribute store's schema
+
+    :param df_attr: attribute data in the proc.attr.hydfab standard long format
+    :type df_attr: pd.DataFrame
+    :param cols: the standard columns retained in the store, defaults to
+        ['featureID','featureSource','data_source','attribute','value','dl_timestamp']
+    :type cols: list, optional
+    :return: attribute data with string identifiers and float64 values
+    :rtype: pd.DataFrame
+    """
+    df_attr = df_attr[cols].copy()
+    for col in cols:
+        if col == 'value':
+            df_attr[col] = pd.to_numeric(df_attr[col], errors='coerce').astype('float64')
+        else:
+            df_attr[col] = df_attr[col].astype(str)
+    return df_attr
+
+def _std_attr_schema() -> pa.Schema:
+    """The standard arrow schema of attribute parquet files
+
+    Used when scanning many attribute files at once, because files written by
+    different tools may store the same column with different types
+    (e.g. proc.attr.hydfab writes 'attribute' as a dictionary, :mod:`tfrm_attr` as a string)
+
+    :return: arrow schema of the standard attribute columns
+    :rtype: pa.Schema
+    """
+    return pa.schema([('featureID', pa.string()), ('featureSource', pa.string()),
+                      ('data_source', pa.string()), ('attribute', pa.string()),
+                      ('value', pa.float64()), ('dl_timestamp', pa.string())])
+
+def _read_attr_files(paths: Iterable[str | os.PathLike], comids: Iterable,
+                     attrs_sel: str | Iterable = 'all') -> pd.DataFrame:
+    """Read a list of attribute parquet files into the standard schema, subset to COMIDs & attributes
+
+    :param paths: attribute parquet filepaths
+    :type paths: Iterable[str | os.PathLike]
+    :param comids: COMID values of interest
+    :type comids: Iterable
+    :param attrs_sel: desired attributes, defaults to 'all'
+    :type attrs_sel: str | Iterable, optional
+    :return: the attribute data with columns of :func:`_std_attr_schema`
+    :rtype: pd.DataFrame
+    """
+    ds_attr = pads.dataset([str(p) for p in paths], schema=_std_attr_schema(), format='parquet')
+    return _read_attr_dataset(ds_attr, comids, attrs_sel=attrs_sel)
+
+def _attr_db_dataset(dir_db_attrs: str | os.PathLike) -> pads.Dataset:
+    """Discover all attribute parquet files inside a directory as a single arrow dataset
+
+    The file listing happens once, so the returned dataset may be read repeatedly
+    (e.g. per chunk of COMIDs) without rescanning the directory.
+
+    :param dir_db_attrs: directory where attribute .parquet files live
+    :type dir_db_attrs: str | os.PathLike
+    :return: the attribute dataset with the schema of :func:`_std_attr_schema`
+    :rtype: pads.Dataset
+    """
+    return pads.dataset(str(dir_db_attrs), schema=_std_attr_schema(), format='parquet')
+
+def _read_attr_dataset(ds_attr: pads.Dataset, comids: Iterable,
+                       attrs_sel: str | Iterable = 'all') -> pd.DataFrame:
+    """Read an attribute dataset, pushing the COMID & attribute subsets into the parquet scan
+
+    :param ds_attr: the attribute dataset, e.g. from :func:`_attr_db_dataset`
+    :type ds_attr: pads.Dataset
+    :param comids: COMID values of interest
+    :type comids: Iterable
+    :param attrs_sel: desired attributes, defaults to 'all'
+    :type attrs_sel: str | Iterable, optional
+    :return: the attribute data with columns of :func:`_std_attr_schema`
+    :rtype: pd.DataFrame
+    """
+    expr = pads.field('featureID').isin([str(x) for x in comids])
+    if not isinstance(attrs_sel, str):
+        expr = expr & pads.field('attribute').isin(list(attrs_sel))
+    return ds_attr.to_table(columns=_std_attr_schema().names, filter=expr).to_pandas(ignore_metadata=True)
+
+def fs_compact_attr_store(dir_db_attrs:str | os.PathLike,
+                          dir_attr_store:str | os.PathLike = None,
+                          n_buckets:int = 64, row_group_size:int = 50000,
+                          files_per_batch:int = 5000, max_workers:int = 8) -> Path:
+    """Compact the per-COMID attribute parquet files into a consolidated attribute store
+
+    The store is partitioned into `n_buckets` parquet files by a hash of the COMID.
+    Each partition is sorted by featureID and attribute, so that the min/max
+    statistics of each row group let readers skip everything but the requested
+    COMIDs & attributes. The per-COMID files remain the ingest format: rerun
+    this compaction after new attributes are acquired or transformed.
+
+    :param dir_db_attrs: directory where the per-COMID attribute .parquet files live
+    :type dir_db_attrs: str | os.PathLike
+    :param dir_attr_store: directory of the consolidated attribute store. Defaults to
+        :func:`std_attr_store_path`
+    :type dir_attr_store: str | os.PathLike, optional
+    :param n_buckets: number of partitions when creating a new store, defaults to 64.
+        An existing store keeps its partitioning.
+    :type n_buckets: int, optional
+    :param row_group_size: maximum rows per parquet row group, defaults to 50000
+    :type row_group_size: int, optional
+    :param files_per_batch: number of per-COMID files held in memory at once, defaults to 5000
+    :type files_per_batch: int, optional
+    :param max_workers: number of threads reading per-COMID files, defaults to 8
+    :type max_workers: int, optional
+    :return: directory of the consolidated attribute store
+    :rtype: Path
+
+    note:: Attribute values already in the store are merged with the per-COMID data,
+    keeping the most recent `dl_timestamp` for each featureID, data_source & attribute.
+    """
+    if not dir_attr_store:
+        dir_attr_store = std_attr_store_path(dir_db_attrs)
+    dir_attr_store = Path(dir_attr_store)
+    dir_attr_store.mkdir(parents=True, exist_ok=True)
+
+    path_meta = _std_attr_store_meta_path(dir_attr_store)
+    if path_meta.exists():
+        with open(path_meta, 'r') as file:
+            n_buckets = yaml.safe_load(file)['n_buckets']
+
+    ls_files = sorted(Path(dir_db_attrs).glob('*.parquet'))
+    if len(ls_files) == 0:
+        warnings.warn(f"No attribute .parquet files to compact inside {dir_db_attrs}", UserWarning)
+
+    # Pass 1: route each batch of per-COMID files into per-partition staging files
+    dir_stage = dir_attr_store/'_staging'
+    if dir_stage.exists():
+        shutil.rmtree(dir_stage)
+    for idx in range(0,len(ls_files),files_per_batch):
+        ls_batch = ls_files[idx:idx+files_per_batch]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            ls_df = list(executor.map(lambda f: _std_attr_store_df(pd.read_parquet(f)), ls_batch))
+        df_batch = pd.concat(ls_df, ignore_index=True)
+        df_batch['bucket'] = _attr_store_bucket(df_batch['featureID'], n_buckets)
+        for bucket, df_bucket in df_batch.groupby('bucket'):
+            dir_stage_bucket = dir_stage/f'bucket_{bucket:04d}'
+            dir_stage_bucket.mkdir(parents=True, exist_ok=True)
+            df_bucket.drop(columns='bucket').to_parquet(dir_stage_bucket/f'batch_{idx}.parquet', index=False)
+        print(f"Staged {idx + len(ls_batch)} of {len(ls_files)} attribute files for compaction")
+
+    # Pass 2: merge each partition with existing store data, then sort & write
+    n_rows = 0
+    if dir_stage.exists():
+        for dir_stage_bucket in sorted(dir_stage.iterdir()):
+            bucket = int(dir_stage_bucket.name.split('_')[-1])
+            path_bucket = _std_attr_store_bucket_path(dir_attr_store, bucket)
+            ls_df = [pd.read_parquet(p) for p in sorted(dir_stage_bucket.glob('*.parquet'))]
+            if path_bucket.exists():
+                ls_df.append(pd.read_parquet(path_bucket))
+            df_bucket = pd.concat(ls_df, ignore_index=True)
+            df_bucket = _check_attr_rm_dupes(df_bucket,
+                                             uniq_cols=['featureID','featureSource','data_source','attribute'],
+                                             ascending=False)
+            df_bucket = df_bucket.sort_values(['featureID','attribute']).reset_index(drop=True)
+            # Write to a temporary file first so that readers never see a partial partition
+            path_tmp = path_bucket.with_suffix('.tmp')
+            df_bucket.to_parquet(path_tmp, index=False, row_group_size=row_group_size)
+            os.replace(path_tmp, path_bucket)
+            n_rows += df_bucket.shape[0]
+        shutil.rmtree(dir_stage)
+
+    with open(path_meta, 'w') as file:
+        yaml.safe_dump({'n_buckets': int(n_buckets),
+                        'row_group_size': int(row_group_size),
+                        'dir_db_attrs': str(dir_db_attrs),
+                        'n_files_compacted': len(ls_files)}, file)
+    print(f"Compacted {len(ls_files)} attribute files ({n_rows} rows rewritten) into {dir_attr_store}")
+    return dir_attr_store
+
+def _read_attr_store(dir_attr_store:str | os.PathLike, comids: Iterable,
+                     attrs_sel: str | Iterable = 'all', storage_options=None) -> dd.DataFrame:
+    """Lazily read the consolidated attribute store, pruned to COMIDs & attributes of interest
+
+    Only the partitions holding the requested COMIDs are opened, and the
+    featureID/attribute filters are pushed down to the parquet row groups.
+
+    :param dir_attr_store: directory of the consolidated attribute store
+    :type dir_attr_store: str | os.PathLike
+    :param comids: COMID values of interest
+    :type comids: Iterable
+    :param attrs_sel: desired attributes, defaults to 'all'
+    :type attrs_sel: str | Iterable, optional
+    :param storage_options: future feature, defaults to None
+    :type storage_options: future feature, optional
+    :raises ValueError: the consolidated attribute store has not been created
+    :return: lazy dataframe of the requested attribute data
+    :rtype: dd.DataFrame
+    :seealso: :func:`fs_compact_attr_store`
+    """
+    path_meta = _std_attr_store_meta_path(dir_attr_store)
+    if not Path(path_meta).exists():
+        raise ValueError(f"No consolidated attribute store exists at {dir_attr_store}. \
+                         \nCreate it using fs_algo_train_eval.fs_compact_attr_store()")
+    with open(path_meta, 'r') as file:
+        n_buckets = yaml.safe_load(file)['n_buckets']
+
+    comids = [str(x) for x in comids]
+    buckets = np.unique(_attr_store_bucket(comids, n_buckets))
+    paths_bucket = [_std_attr_store_bucket_path(dir_attr_store, b) for b in buckets]
+    paths_bucket = [str(p) for p in paths_bucket if p.exists()]
+    if len(paths_bucket) == 0:
+        df_empty = _std_attr_store_df(pd.DataFrame(columns=['featureID','featureSource','data_source',
+                                                            'attribute','value','dl_timestamp']))
+        return dd.from_pandas(df_empty, npartitions=1)
+
+    filters = [('featureID','in',comids)]
+    if not isinstance(attrs_sel, str):
+        filters.append(('attribute','in',list(attrs_sel)))
+    return dd.read_parquet(paths_bucket, filters=filters, storage_options=storage_options)
+
+# %% COMID-TO-FILE INDEX
+# In-process memo of each index, keyed by the index filepath: (index file mtime, {comid: [filenames]})
+_ATTR_FILE_INDEX_CACHE = dict()
+
+def std_attr_file_index_path(dir_db_attrs:str | os.PathLike) -> Path:
+    """Standardized path of the COMID-to-file index of an attribute directory
+
+    :param dir_db_attrs: directory where the per-COMID attribute .parquet files live
+    :type dir_db_attrs: str | os.PathLike
+    :return: path to the index csv, `Path(dir_db_attrs)/'_index'/'comid_file_index.csv'`
+    :rtype: Path
+    """
+    return Path(dir_db_attrs)/'_index'/'comid_file_index.csv'
+
+def _attr_filename_comids(filename:str) -> list:
+    """Identify the location identifiers inside an attribute filename
+
+    Matches the `f'_{comid}_'` convention of standardized attribute filenames,
+    e.g. 'comid_1520007_attrs.parquet' returns ['1520007']
+
+    :param filename: name of the attribute parquet file
+    :type filename: str
+    :return: the identifiers enclosed by underscores in the filename
+    :rtype: list
+    """
+    return Path(filename).stem.split('_')[1:-1]
+
+def _attr_file_index_stale(dir_db_attrs:str | os.PathLike) -> bool:
+    """Determine whether the COMID-to-file index is missing or older than its attribute directory
+
+    :param dir_db_attrs: directory where the per-COMID attribute .parquet files live
+    :type dir_db_attrs: str | os.PathLike
+    :return: True if the index should be rebuilt
+    :rtype: bool
+
+    note:: Adding or removing files updates the directory's modification time,
+    so files written outside of :func:`update_attr_file_index` (e.g. by proc.attr.hydfab)
+    trigger a rebuild.
+    """
+    path_index = std_attr_file_index_path(dir_db_attrs)
+    if not path_index.exists():
+        return True
+    return os.stat(dir_db_attrs).st_mtime_ns > os.stat(path_index).st_mtime_ns
+
+def build_attr_file_index(dir_db_attrs:str | os.PathLike) -> dict:
+    """Scan an attribute directory once & write its COMID-to-file index
+
+    :param dir_db_attrs: directory where the per-COMID attribute .parquet files live
+    :type dir_db_attrs: str | os.PathLike
+    :return: mapping of each COMID to the attribute filenames containing it
+    :rtype: dict
+    """
+    dict_index = dict()
+    with os.scandir(dir_db_attrs) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith('.parquet'):
+                for comid in _attr_filename_comids(entry.name):
+                    dict_index.setdefault(comid, []).append(entry.name)
+
+    path_index = std_attr_file_index_path(dir_db_attrs)
+    path_index.parent.mkdir(parents=True, exist_ok=True)
+    df_index = pd.DataFrame([(k, f) for k, ls_f in dict_index.items() for f in ls_f],
+                            columns=['featureID','filename'])
+    df_index.to_csv(path_index, index=False)
+    _ATTR_FILE_INDEX_CACHE[str(path_index)] = (os.stat(path_index).st_mtime_ns, dict_index)
+    print(f"Indexed {df_index.shape[0]} attribute files in {path_index}")
+    return dict_index
+
+def read_attr_file_index(dir_db_attrs:str | os.PathLike, rebuild:bool = False) -> dict:
+    """Retrieve the COMID-to-file index of an attribute directory, (re)building it when needed
+
+    :param dir_db_attrs: directory where the per-COMID attribute .parquet files live
+    :type dir_db_attrs: str | os.PathLike
+    :param rebuild: Should the index be rebuilt regardless of its state? Default False
+    :type rebuild: bool, optional
+    :return: mapping of each COMID to the attribute filenames containing it
+    :rtype: dict
+    """
+    if not Path(dir_db_attrs).is_dir():
+        return dict()
+    if rebuild or _attr_file_index_stale(dir_db_attrs):
+        return build_attr_file_index(dir_db_attrs)
+
+    path_index = std_attr_file_index_path(dir_db_attrs)
+    mtime_index = os.stat(path_index).st_mtime_ns
+    cached = _ATTR_FILE_INDEX_CACHE.get(str(path_index))
+    if cached and cached[0] == mtime_index:
+        return cached[1]
+
+    df_index = pd.read_csv(path_index, dtype=str).drop_duplicates()
+    dict_index = df_index.groupby('featureID')['filename'].agg(list).to_dict()
+    _ATTR_FILE_INDEX_CACHE[str(path_index)] = (mtime_index, dict_index)
+    return dict_index
+
+def update_attr_file_index(dir_db_attrs:str | os.PathLike, paths_new: Iterable[str | os.PathLike]):
+    """Incrementally add newly-written attribute files to the COMID-to-file index
+
+    :param dir_db_attrs: directory where the per-COMID attribute .parquet files live
+    :type dir_db_attrs: str | os.PathLike
+    :param paths_new: the attribute files just written inside `dir_db_attrs`
+    :type paths_new: Iterable[str | os.PathLike]
+
+    note:: Call :func:`read_attr_file_index` before writing new files, so that
+    any files added by other tools are already indexed.
+    """
+    path_index = std_attr_file_index_path(dir_db_attrs)
+    if not path_index.exists():
+        if Path(dir_db_attrs).is_dir():
+            build_attr_file_index(dir_db_attrs)
+        return
+
+    cached = _ATTR_FILE_INDEX_CACHE.get(str(path_index), (None, dict()))
+    dict_index = cached[1]
+    ls_rows = list()
+    for path_new in paths_new:
+        filename = Path(path_new).name
+        for comid in _attr_filename_comids(filename):
+            if filename not in dict_index.get(comid, []):
+                dict_index.setdefault(comid, []).append(filename)
+                ls_rows.append((comid, filename))
+    if ls_rows:
+        pd.DataFrame(ls_rows, columns=['featureID','filename']).to_csv(path_index, mode='a',
+                                                                       header=False, index=False)
+    if cached[0] is not None:
+        _ATTR_FILE_INDEX_CACHE[str(path_index)] = (os.stat(path_index).st_mtime_ns, dict_index)
+
+def _attr_files_comids(dir_db_attrs:str | os.PathLike, comids: Iterable) -> list:
+    """Look up the attribute files corresponding to COMIDs via the COMID-to-file index
+
+    :param dir_db_attrs: directory where the per-COMID attribute .parquet files live
+    :type dir_db_attrs: str | os.PathLike
+    :param comids: COMID values of interest
+    :type comids: Iterable
+    :return: full paths of the unique attribute files containing any of the COMIDs
+    :rtype: list
+    """
+    dict_index = read_attr_file_index(dir_db_attrs)
+    ls_files = [f for comid in comids for f in dict_index.get(str(comid), [])]
+    return [Path(dir_db_attrs)/f for f in dict.fromkeys(ls_files)]
+
 def fs_read_attr_comid(dir_db_attrs:str | os.PathLike, comids_resp:list | Iterable, attrs_sel: str | Iterable = 'all',
-                       _s3 = None,storage_options=None,read_type:str=['all','filename'][0],
+                       _s3 = None,storage_options=None,read_type:str=['all','filename','store'][0],
                        reindex:bool=False)-> pd.DataFrame:
     """Read attribute data acquired using proc.attr.hydfab R package & subset to desired attributes
 
@@ -136,7 +563,8 @@ def fs_read_attr_comid(dir_db_attrs:str | os.PathLike, comids_resp:list | Iterab
     :param storage_options: future feature, defaults to None
     :type storage_options: future feature, optional
     :param read_type: should all parquet files be lazy-loaded, assign 'all'
-     otherwise just files with comids_resp in the file name? assign 'filename'. Defaults to 'all'
+     otherwise just files with comids_resp in the file name? assign 'filename'.
+     To read from the consolidated attribute store created by :func:`fs_compact_attr_store`, assign 'store'. Defaults to 'all'
     :type read_type: str
     :param reindex: Should attribute dataframe be reindexed? Default False
     :type reindex: bool
@@ -153,33 +581,67 @@ def fs_read_attr_comid(dir_db_attrs:str | os.PathLike, comids_resp:list | Iterab
         # TODO  Setup the s3fs filesystem that will be used, with xarray to open the parquet files
         #_s3 = s3fs.S3FileSystem(anon=True)
 
+    # The featureID column is stored as a string by proc.attr.hydfab
+    comids_resp = [str(x) for x in comids_resp]
+    # Standard columns projected from the attribute parquet files
+    cols_attr = ['featureID','featureSource','data_source','attribute','value','dl_timestamp']
+
     # ------------------- Subset based on comids of interest ------------------
     if read_type == 'all': # Considering all parquet files inside directory
-        # Read attribute data acquired using proc.attr.hydfab R package
-        all_attr_ddf = dd.read_parquet(dir_db_attrs, storage_options = storage_options)
-        attr_df_sub = all_attr_ddf.compute()
-        attr_ddf_subloc = all_attr_ddf[all_attr_ddf['featureID'].isin(comids_resp)]
+        # Push the comid & attribute subsets into the parquet scan, so only
+        # matching row groups/rows of the attribute database are loaded
+        filters = [('featureID','in',comids_resp)]
+        if not isinstance(attrs_sel,str):
+            filters.append(('attribute','in',list(attrs_sel)))
+        attr_df_subloc = dd.read_parquet(dir_db_attrs, filters=filters, columns=cols_attr,
+                                         dataset={'schema': _std_attr_schema()},
+                                         arrow_to_pandas={'ignore_metadata': True},
+                                         storage_options = storage_options).compute()
 
     elif read_type == 'filename': # Read based on comid being located in the parquet filename
-        matching_files = [file for file in Path(dir_db_attrs).iterdir() \
-                          if file.is_file() and any(f'_{sub}_' in file.name for sub in comids_resp)]
-        attr_ddf_subloc = dd.read_parquet(matching_files, storage_options=storage_options)
+        # Dictionary lookups into the persistent COMID-to-file index rather than scanning the directory
+        matching_files = _attr_files_comids(dir_db_attrs, comids_resp)
+        attr_df_subloc = _read_attr_files(matching_files, comids_resp, attrs_sel=attrs_sel)
+    elif read_type == 'store': # Read the consolidated attribute store, pruned to comids & attributes
+        attr_df_subloc = _read_attr_store(std_attr_store_path(dir_db_attrs), comids_resp,
+                                          attrs_sel=attrs_sel, storage_options=storage_options).compute()
     else:
-        # Initialize attr_ddf_sub
-        attr_ddf_sub = None
         raise ValueError(f"Unrecognized read_type provided in fs_read_attr_comid: {read_type}")
-    
-    if attr_ddf_subloc.shape[0].compute() == 0:
+
+    attr_df_sub = _subset_check_attr_df(attr_df_subloc, comids_resp, attrs_sel, dir_db_attrs)
+    # TODO should re-indexing happen???
+    if reindex:
+        attr_df_sub = attr_df_sub.reindex()
+
+    return attr_df_sub
+
+def _subset_check_attr_df(attr_df_subloc: pd.DataFrame, comids_resp: list,
+                          attrs_sel: str | Iterable, dir_db_attrs: str | os.PathLike) -> pd.DataFrame:
+    """Subset the attribute data read by :func:`fs_read_attr_comid` to the comids & attributes of interest,
+      remove duplicates & check that all attributes exist
+
+    :param attr_df_subloc: The attribute data read from the attribute database
+    :type attr_df_subloc: pd.DataFrame
+    :param comids_resp: The COMID values of interest, as strings
+    :type comids_resp: list
+    :param attrs_sel: desired attributes, or 'all'
+    :type attrs_sel: str | Iterable
+    :param dir_db_attrs: directory where attribute .parquet files live, used in warnings
+    :type dir_db_attrs: str | os.PathLike
+    :return: The checked attribute data
+    :rtype: pd.DataFrame
+    """
+    # Apply any remaining subsetting in memory
+    attr_df_subloc = attr_df_subloc[attr_df_subloc['featureID'].isin(comids_resp)]
+    if attr_df_subloc.shape[0] == 0:
         warnings.warn(f'None of the provided featureIDs exist in {dir_db_attrs}: \
-                      \n {", ".join(attrs_sel)} ', UserWarning)
+                      \n {", ".join(comids_resp)} ', UserWarning)
     
     # ------------------- Subset based on attributes of interest ------------------
-    if attrs_sel == 'all':
-        attrs_sel = attr_ddf_subloc['attribute'].unique().compute()
+    if isinstance(attrs_sel,str) and attrs_sel == 'all':
+        attrs_sel = pd.Series(attr_df_subloc['attribute'].unique())
 
-    attr_ddf_sub = attr_ddf_subloc[attr_ddf_subloc['attribute'].isin(attrs_sel)]
-    
-    attr_df_sub = attr_ddf_sub.compute()
+    attr_df_sub = attr_df_subloc[attr_df_subloc['attribute'].isin(attrs_sel)].copy()
 
     if attr_df_sub.shape[0] == 0:
         warnings.warn(f'The provided attributes do not exist with the retrieved featureIDs : \
@@ -200,13 +662,132 @@ def fs_read_attr_comid(dir_db_attrs:str | os.PathLike, comids_resp:list | Iterab
                       which may be problematic for some algo training/testing. \
                       \nConsider reprocessing the attribute grabber (proc.attr.hydfab R package)',
                       UserWarning)
-        
-    # TODO should re-indexing happen???
-    if reindex:
-        attr_df_sub = attr_df_sub.reindex()
-
     return attr_df_sub
 
+class AttrWideMatrix:
+    def __init__(self, arr: np.ndarray, comids: Iterable, attrs: Iterable):
+        """A run-level, wide-format attribute matrix shared across datasets & metrics
+
+        Rather than each dataset calling :func:`fs_read_attr_comid` and pivoting
+        separately, the union of all comids is read and pivoted once. Each
+        dataset then retrieves its own rows with :meth:`AttrWideMatrix.wide_df`.
+
+        :param arr: The attribute values, with shape (len(comids), len(attrs))
+        :type arr: np.ndarray
+        :param comids: The comid (featureID) of each row, sorted ascending
+        :type comids: Iterable
+        :param attrs: The attribute name of each column
+        :type attrs: Iterable
+
+        .. note::
+            Typically created with :meth:`AttrWideMatrix.from_attr_db` or :meth:`AttrWideMatrix.from_df_attr`
+        """
+        self.arr = arr
+        self.comids = pd.Index([str(x) for x in comids], name='featureID')
+        self.attrs = pd.Index(attrs, name='attribute')
+        if self.arr.shape != (len(self.comids), len(self.attrs)):
+            raise ValueError(f"Attribute matrix shape {self.arr.shape} does not match the \
+                             {len(self.comids)} comids and {len(self.attrs)} attributes")
+
+    @classmethod
+    def from_df_attr(cls, df_attr: pd.DataFrame, dtype = np.float64) -> 'AttrWideMatrix':
+        """Create the wide attribute matrix from long-format attribute data
+
+        :param df_attr: The long-format attribute data, as generated by :func:`fs_read_attr_comid`
+        :type df_attr: pd.DataFrame
+        :param dtype: The numeric type of the attribute matrix, e.g. np.float32 to halve memory. Defaults to np.float64
+        :type dtype: type, optional
+        :return: The wide attribute matrix
+        :rtype: AttrWideMatrix
+        """
+        df_attr_wide = df_attr.pivot(index='featureID', columns = 'attribute', values = 'value')
+        arr = np.ascontiguousarray(df_attr_wide.to_numpy(dtype=dtype))
+        return cls(arr, df_attr_wide.index, df_attr_wide.columns)
+
+    @classmethod
+    def from_attr_db(cls, dir_db_attrs: str | os.PathLike, comids: Iterable,
+                     attrs_sel: str | Iterable = 'all', read_type: str = 'all',
+                     dtype = np.float64, storage_options=None) -> 'AttrWideMatrix':
+        """Read the attributes for the union of all comids of interest once, and pivot to a wide matrix
+
+        :param dir_db_attrs: directory where attribute .parquet files live
+        :type dir_db_attrs: str | os.PathLike
+        :param comids: The comids of interest, e.g. the union of comids across all datasets. Duplicates are ignored.
+        :type comids: Iterable
+        :param attrs_sel: desired attributes to select from the attributes .parquet files, defaults to 'all'
+        :type attrs_sel: str | Iterable, optional
+        :param read_type: The approach for reading attribute data. Refer to :func:`fs_read_attr_comid`. Defaults to 'all'
+        :type read_type: str, optional
+        :param dtype: The numeric type of the attribute matrix. Defaults to np.float64
+        :type dtype: type, optional
+        :param storage_options: future feature, defaults to None
+        :type storage_options: future feature, optional
+        :return: The wide attribute matrix
+        :rtype: AttrWideMatrix
+        """
+        comids_union = list(dict.fromkeys([str(x) for x in comids if not pd.isna(x)]))
+        df_attr = fs_read_attr_comid(dir_db_attrs, comids_union, attrs_sel = attrs_sel,
+                                     _s3 = None, storage_options=storage_options,
+                                     read_type=read_type)
+        return cls.from_df_attr(df_attr, dtype=dtype)
+
+    def _rows(self, comids: Iterable | None) -> np.ndarray | slice:
+        """Locate the rows of the requested comids, as a slice whenever they are contiguous
+
+        :param comids: The comids of interest. If None, all rows.
+        :type comids: Iterable | None
+        :return: The row positions in ascending order, or a slice when contiguous
+        :rtype: np.ndarray | slice
+        """
+        if comids is None:
+            return slice(0, len(self.comids))
+        comids = pd.Index(pd.unique(pd.Series([str(x) for x in comids], dtype=object)))
+        idxs = self.comids.get_indexer(comids)
+        if (idxs < 0).any():
+            warnings.warn(f"{(idxs < 0).sum()} of the requested comids are not in the attribute matrix.",
+                          UserWarning)
+        idxs = np.sort(idxs[idxs >= 0])
+        if len(idxs) > 0 and idxs[-1] - idxs[0] + 1 == len(idxs):
+            return slice(int(idxs[0]), int(idxs[-1]) + 1)
+        return idxs
+
+    def wide_df(self, comids: Iterable | None = None, attrs: Iterable | None = None,
+                drop_empty_attrs: bool = True) -> pd.DataFrame:
+        """Retrieve the wide-format attribute DataFrame for a subset of comids
+
+        Equivalent to pivoting the output of :func:`fs_read_attr_comid` for these comids.
+
+        :param comids: The comids of interest. Default None returns all comids.
+        :type comids: Iterable | None, optional
+        :param attrs: The attributes of interest. Default None returns all attributes.
+        :type attrs: Iterable | None, optional
+        :param drop_empty_attrs: Drop attributes with no values across the
+            requested comids, as they would be absent from a per-dataset read. Default True.
+        :type drop_empty_attrs: bool, optional
+        :return: The wide attribute data indexed by 'featureID' with 'attribute' columns
+        :rtype: pd.DataFrame
+
+        .. note::
+            Contiguous comid subsets are views into the shared matrix (zero-copy),
+            and must be treated as read-only. Other subsets gather a copy of only the requested rows.
+        """
+        rows = self._rows(comids)
+        if attrs is None:
+            arr = self.arr[rows]
+            cols = self.attrs
+        else:
+            idxs_attr = self.attrs.get_indexer(pd.Index(attrs))
+            if (idxs_attr < 0).any():
+                raise ValueError(f"Attributes not in the attribute matrix: {list(pd.Index(attrs)[idxs_attr < 0])}")
+            arr = self.arr[rows][:, idxs_attr]
+            cols = self.attrs[idxs_attr]
+        df_attr_wide = pd.DataFrame(arr, index=self.comids[rows], columns=cols, copy=False)
+        if drop_empty_attrs:
+            mask_empty = np.isnan(arr).all(axis=0)
+            if mask_empty.any():
+                df_attr_wide = df_attr_wide.loc[:, ~mask_empty]
+        return df_attr_wide
+
 def _check_attributes_exist(df_attr: pd.DataFrame, attrs_sel:pd.Series | Iterable) -> Dict[pd.DataFrame, pd.Series]:
     """ Checks if any COMIDs have different numbers of attributes. It's expected that they all have the same attributes.
 
@@ -326,53 +907,159 @@ def _find_feat_srce_id(dat_resp: Optional[xr.core.dataset.Dataset] = None,
 
     return [featureSource, featureID]
 
-def fs_retr_nhdp_comids_geom(featureSource:str,featureID:str,gage_ids: Iterable[str] 
+# %% NLDI COMID RESOLUTION
+# In-process memo of resolved locations: {(featureSource, featureID): (comid, lon, lat)}
+_NLDI_COMID_CACHE = dict()
+
+def std_nldi_cache_path(dir_std_base: str | os.PathLike) -> Path:
+    """Standardized path of the persistent NLDI COMID cache
+
+    :param dir_std_base: The directory containing the standardized datasets generated from `fs_proc`
+    :type dir_std_base: str | os.PathLike
+    :return: path to the cache csv, `Path(dir_std_base)/'nldi_comid_cache.csv'`
+    :rtype: Path
+    """
+    return Path(dir_std_base)/'nldi_comid_cache.csv'
+
+def _read_nldi_cache(path_cache: str | os.PathLike) -> dict:
+    """Read the persistent NLDI COMID cache
+
+    :param path_cache: path to the cache csv
+    :type path_cache: str | os.PathLike
+    :return: mapping of (featureSource, featureID) to (comid, lon, lat). Locations
+        that NLDI could not find have a comid of NA.
+    :rtype: dict
+    """
+    if not Path(path_cache).exists():
+        return dict()
+    df_cache = pd.read_csv(path_cache, dtype={'featureSource':str,'featureID':str,'comid':str,
+                                              'lon':float,'lat':float})
+    df_cache = df_cache.drop_duplicates(subset=['featureSource','featureID'], keep='last')
+    return {(fs, fid): (comid, lon, lat) for fs, fid, comid, lon, lat in
+            df_cache[['featureSource','featureID','comid','lon','lat']].itertuples(index=False)}
+
+def _write_nldi_cache(path_cache: str | os.PathLike, dict_new: dict):
+    """Append newly resolved locations to the persistent NLDI COMID cache
+
+    :param path_cache: path to the cache csv
+    :type path_cache: str | os.PathLike
+    :param dict_new: mapping of (featureSource, featureID) to (comid, lon, lat)
+    :type dict_new: dict
+    """
+    if len(dict_new) == 0:
+        return
+    Path(path_cache).parent.mkdir(parents=True, exist_ok=True)
+    df_new = pd.DataFrame([(*k, *v) for k, v in dict_new.items()],
+                          columns=['featureSource','featureID','comid','lon','lat'])
+    df_new.to_csv(path_cache, mode='a', header=not Path(path_cache).exists(), index=False)
+
+def _nldi_navigate_comid(navigate_byid: Callable, featureSource: str, fid: str,
+                         retries: int = 3, backoff: float = 1.0) -> tuple:
+    """Query NLDI for the COMID & first flowline coordinate upstream of a single location
+
+    :param navigate_byid: The NLDI navigation function, e.g. :meth:`pynhd.NLDI.navigate_byid`
+    :type navigate_byid: Callable
+    :param featureSource: the NLDI datasource for `fid`, e.g. 'nwissite'
+    :type featureSource: str
+    :param fid: the NLDI feature identifier, e.g. 'USGS-01031500'
+    :type fid: str
+    :param retries: number of retries after transient failures, defaults to 3
+    :type retries: int, optional
+    :param backoff: seconds to wait before the first retry, doubling each retry. Defaults to 1.0
+    :type backoff: float, optional
+    :raises Exception: The location could not be resolved after all retries
+    :return: the (comid, lon, lat) of the location. The comid is NA if NLDI does not know the location.
+    :rtype: tuple
+    """
+    for attempt in range(retries + 1):
+        try:
+            upstr_flowline = navigate_byid(fsource=featureSource, fid=fid,
+                                           navigation='upstreamMain',
+                                           source='flowlines',
+                                           distance=1 # the shortest distance
+                                           ).loc[0]
+        except (KeyError, IndexError, nhd.exceptions.ZeroMatchedError): # NLDI does not know this location
+            return (np.nan, np.nan, np.nan)
+        except (nhd.exceptions.InputValueError, nhd.exceptions.InputTypeError): # Not worth retrying
+            raise
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2**attempt)
+        else:
+            geom = upstr_flowline['geometry']
+            if geom.geom_type == 'MultiLineString':
+                geom = geom.geoms[0]
+            lon, lat = geom.coords[0][:2]
+            return (str(upstr_flowline['nhdplus_comid']), lon, lat)
+
+def fs_retr_nhdp_comids_geom(featureSource:str,featureID:str,gage_ids: Iterable[str],
+                             path_cache: str | os.PathLike = None, max_workers: int = 8,
+                             retries: int = 3, backoff: float = 1.0,
+                             navigate_byid: Callable = None
                              ) -> gpd.geodataframe.GeoDataFrame:    
     """Retrieve response variable's comids & point geom, querying the shortest distance in the flowline
 
+    Locations are resolved concurrently, and each result is cached in memory and,
+    when `path_cache` is provided, on disk. Repeat requests for a (featureSource,
+    featureID) already in the cache make no network calls.
+
     :param featureSource: the datasource for featureID from the R function :mod:`nhdplusTools` :func:`get_nldi_features()`, e.g. 'nwissite'
     :type featureSource: str
     :param featureID: The conversion format of `gage_ids` into a recognizable string for :mod:`nhdplusTools`, which is an f-string configured conversion of `gage_id` e.g. `'USGS-{gage_id}'`. Expected to contain the string `"{gage_id}"`
     :type featureID: str
     :param gage_ids: The location identifiers compatible with the format specified in `featureID`
     :type gage_ids: Iterable[str]
-    :raises warnings.warn: In case number of retrieved comids does not match total requested gage ids
+    :param path_cache: path to the persistent cache csv, e.g. :func:`std_nldi_cache_path`. Default None only uses the in-memory cache.
+    :type path_cache: str | os.PathLike, optional
+    :param max_workers: maximum number of concurrent NLDI requests, defaults to 8
+    :type max_workers: int, optional
+    :param retries: number of retries after transient failures, defaults to 3
+    :type retries: int, optional
+    :param backoff: seconds to wait before the first retry, doubling each retry. Defaults to 1.0
+    :type backoff: float, optional
+    :param navigate_byid: The NLDI navigation function called for each location, with the
+        signature of :meth:`pynhd.NLDI.navigate_byid`. Defaults to None, meaning a new :class:`pynhd.NLDI`,
+        which is only created when a location is missing from the cache.
+    :type navigate_byid: Callable, optional
     :return: The COMIDs & point geometry corresponding to the provided location identifiers, `gage_ids`
     :rtype: GeoDataFrame
 
     Changelog:
         2024-12-01 refactor: return GeoDataFrame with coordinates instead of a list of just comids, GL
     """
+    fids = [featureID.format(gage_id=gage_id) for gage_id in gage_ids]
+
+    if path_cache:
+        _NLDI_COMID_CACHE.update({k:v for k,v in _read_nldi_cache(path_cache).items()
+                                  if k not in _NLDI_COMID_CACHE})
+    fids_need = [fid for fid in dict.fromkeys(fids) if (featureSource, fid) not in _NLDI_COMID_CACHE]
+
+    dict_new = dict()
+    if len(fids_need) > 0:
+        print(f"Querying NLDI for {len(fids_need)} of {len(set(fids))} locations")
+        if navigate_byid is None:
+            navigate_byid = nhd.NLDI().navigate_byid
+        def _resolve(fid):
+            try:
+                return _nldi_navigate_comid(navigate_byid, featureSource, fid,
+                                            retries=retries, backoff=backoff)
+            except Exception as e:
+                print(f"Error processing featureID {fid}: {e}")
+                return None # Transient failures are not cached
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            ls_rslt = list(executor.map(_resolve, fids_need))
+        dict_new = {(featureSource, fid): rslt for fid, rslt in zip(fids_need, ls_rslt) if rslt is not None}
+        _NLDI_COMID_CACHE.update(dict_new)
+        if path_cache:
+            _write_nldi_cache(path_cache, dict_new)
 
-    nldi = nhd.NLDI()
-    
-    comids_miss = []
     comids_resp = []
     geom_pts = []
-    for gage_id in gage_ids:
-        try:
-            upstr_flowline = nldi.navigate_byid(
-                fsource=featureSource,
-                fid=featureID.format(gage_id=gage_id),
-                navigation='upstreamMain',
-                source='flowlines',
-                distance=1
-            ).loc[0]
-            geom_pts.append(Point(upstr_flowline['geometry'].coords[0]))
-            comid = upstr_flowline['nhdplus_comid']
-            comids_resp.append(comid)
-        except Exception as e:
-            print(f"Error processing gage_id {gage_id}: {e}")
-            # Handle the error (e.g., log it, append None, or any other fallback mechanism)
-
-            # TODO Attempt a different approach for retrieving comid:
-            comids_miss.append(comid)
-            geom_pts.append(np.nan)
-            comids_resp.append(np.nan)  # Appending NA for failed gage_id, or handle differently as needed
-
-    # if len(comids_resp) != len(gage_ids) or comids_resp.count(None) > 0: # May not be an important check
-    #     raise warnings.warn("The total number of retrieved comids does not match \
-    #                   total number of provided gage_ids",UserWarning)
+    for fid in fids:
+        comid, lon, lat = _NLDI_COMID_CACHE.get((featureSource, fid), (np.nan, np.nan, np.nan))
+        comids_resp.append(comid)
+        geom_pts.append(Point(lon, lat) if not pd.isna(comid) else np.nan)
 
     gdf_comid = gpd.GeoDataFrame(pd.DataFrame({ 'comid': comids_resp}),
                                             geometry=geom_pts,crs=4326 
@@ -494,13 +1181,282 @@ def _open_response_data_fs(dir_std_base: str | os.PathLike, ds:str, mtch_str:str
     try:
         dat_resp = xr.open_dataset(path_nc[0], engine='netcdf4')
     except:
-        path_zarr = [x for x in Path(dir_std_base/Path(ds)).glob("*.zarr")]
+        # fs_proc.proc_eval_metrics.proc_col_schema() writes zarr stores named '*_zarr'
+        path_zarr = [x for x in Path(dir_std_base/Path(ds)).glob("*") 
+                     if x.is_dir() and (x.name.endswith('.zarr') or x.name.endswith('_zarr'))]
         try:
-            dat_resp = xr.open_dataset(path_zarr[0],engine='zarr')
+            try: # Read all variables' metadata at once from the consolidated metadata
+                dat_resp = xr.open_dataset(path_zarr[0],engine='zarr', consolidated=True)
+            except KeyError:
+                dat_resp = xr.open_dataset(path_zarr[0],engine='zarr', consolidated=False)
         except:
             raise ValueError(f"Could not identify an approach to read in dataset via {path_nc} nor {path_zarr}")
     return dat_resp
 
+def sel_response_arrays(dat_resp: xr.Dataset, metrics: Iterable[str] | None = None,
+                        gage_ids: Iterable | None = None, dim: str = 'gage_id') -> dict:
+    """Load only the requested metrics and gage subset from a lazily opened response dataset
+
+    :param dat_resp: The standardized response dataset, e.g. from :func:`_open_response_data_fs`
+    :type dat_resp: xr.Dataset
+    :param metrics: The metrics (data variables) to load. Defaults to None, meaning
+        all metrics listed in the dataset's 'metric_mappings' attribute
+    :type metrics: Iterable[str] | None, optional
+    :param gage_ids: The gage ids to load, in the desired order. Defaults to None, meaning all gage ids
+    :type gage_ids: Iterable | None, optional
+    :param dim: The location dimension of the dataset, defaults to 'gage_id'
+    :type dim: str, optional
+    :raises ValueError: When a requested metric does not exist in the dataset
+    :return: dict of numpy arrays aligned to the same gage ids, with the `dim` key
+        containing the gage ids and a key for each metric. Gage ids absent from the dataset are NaN.
+    :rtype: dict
+
+    .. note::
+        Only the contiguous span of the dataset containing the requested gage ids
+        is read for each requested metric. The remaining variables are never read.
+    """
+    if metrics is None:
+        metrics = dat_resp.attrs['metric_mappings'].split('|')
+    metrics = list(metrics)
+    missing = [metr for metr in metrics if metr not in dat_resp.data_vars]
+    if missing:
+        raise ValueError(f"The following metrics are not in the response dataset: {missing}")
+
+    if gage_ids is None:
+        dict_arrs = {dim: dat_resp[dim].values}
+        dict_arrs.update({metr: dat_resp[metr].values for metr in metrics})
+        return dict_arrs
+
+    gage_ids = np.asarray(gage_ids)
+    idx = dat_resp.indexes[dim].get_indexer(gage_ids)
+    has_gage = idx >= 0
+    idx_read = np.unique(idx[has_gage]) # Sorted positions permit sliced reads from file
+    dat_sub = dat_resp[metrics].isel({dim: idx_read})
+    dict_arrs = {dim: gage_ids}
+    for metr in metrics:
+        vals = dat_sub[metr].values
+        arr = np.full(gage_ids.shape[0], np.nan, dtype=np.result_type(vals.dtype, np.float64))
+        arr[has_gage] = vals[np.searchsorted(idx_read, idx[has_gage])]
+        dict_arrs[metr] = arr
+    return dict_arrs
+
+def fs_read_response_arrays(dir_std_base: str | os.PathLike, ds: str,
+                            metrics: Iterable[str] | None = None,
+                            gage_ids: Iterable | None = None,
+                            mtch_str: str = '*.nc') -> dict:
+    """Lazily open the standardized response dataset generated from :mod:`fs_proc`
+      and load only the requested metrics and gage subset
+
+    :param dir_std_base: The directory containing the standardized dataset generated from `fs_proc`
+    :type dir_std_base: str | os.PathLike
+    :param ds: a string that represents the dataset of interest
+    :type ds: str
+    :param metrics: The metrics to load. Defaults to None, meaning all metrics.
+    :type metrics: Iterable[str] | None, optional
+    :param gage_ids: The gage ids to load, in the desired order. Defaults to None, meaning all gage ids
+    :type gage_ids: Iterable | None, optional
+    :param mtch_str: The matching string of the netcdf dataset, defaults to '*.nc'
+    :type mtch_str: str, optional
+    :return: dict of numpy arrays aligned to the same gage ids. Refer to :func:`sel_response_arrays`
+    :rtype: dict
+    """
+    dat_resp = _open_response_data_fs(dir_std_base, ds, mtch_str=mtch_str)
+    try:
+        return sel_response_arrays(dat_resp, metrics=metrics, gage_ids=gage_ids)
+    finally:
+        dat_resp.close()
+
+# %% COMPUTE RESOURCE BUDGET
+def compute_budget(n_cores: int = -1, n_jobs_outer: int = 1, blas_threads: int = 1) -> dict:
+    """Divide the total compute resources between outer & inner parallelism
+
+    The outer parallelism distributes independent (dataset, metric) training jobs
+    across processes (refer to :func:`train_eval_parallel_wrap`). The inner
+    parallelism is used by each job's estimators, hyperparameter searches, 
+    learning curves, and predictions.
+
+    :param n_cores: The total number of cores available for the run. Values less than 1
+        use all available cores. Defaults to -1.
+    :type n_cores: int, optional
+    :param n_jobs_outer: The number of parallel (dataset, metric) jobs. Values less than 1
+        assign one job per core. Defaults to 1.
+    :type n_jobs_outer: int, optional
+    :param blas_threads: The number of BLAS/OpenMP threads per worker, defaults to 1
+    :type blas_threads: int, optional
+    :return: dict of the following keys:
+        - `n_cores`: The total number of cores used
+        - `n_jobs_outer`: The number of parallel (dataset, metric) jobs
+        - `n_jobs_inner`: The number of parallel jobs within each (dataset, metric) job
+        - `blas_threads`: The number of BLAS/OpenMP threads per worker
+    :rtype: dict
+    """
+    n_cores_avail = joblib.cpu_count()
+    if n_cores is None or n_cores < 1:
+        n_cores = n_cores_avail
+    elif n_cores > n_cores_avail:
+        warnings.warn(f"Requested {n_cores} cores, but only {n_cores_avail} are available.", UserWarning)
+        n_cores = n_cores_avail
+    if n_jobs_outer is None or n_jobs_outer < 1:
+        n_jobs_outer = n_cores
+    n_jobs_outer = min(n_jobs_outer, n_cores)
+    budget = {'n_cores': n_cores,
+              'n_jobs_outer': n_jobs_outer,
+              'n_jobs_inner': max(1, n_cores // n_jobs_outer),
+              'blas_threads': max(1, blas_threads if blas_threads else 1)}
+    return budget
+
+def _blas_limits(blas_threads: int | None = None):
+    """Limit the BLAS/OpenMP threadpools inside the current process
+
+    :param blas_threads: The maximum number of BLAS/OpenMP threads. Defaults to None, meaning no limit.
+    :type blas_threads: int | None, optional
+    :return: The context manager applying the limit
+    :rtype: threadpoolctl.threadpool_limits | contextlib.nullcontext
+    """
+    if not blas_threads:
+        return contextlib.nullcontext()
+    return threadpool_limits(limits=blas_threads)
+
+# %% RANDOM FOREST UNCERTAINTY
+def _rf_var_unbiased(forest: RandomForestRegressor, X_train_shape: tuple,
+                     X_chunk: pd.DataFrame | np.ndarray, inbag: np.ndarray,
+                     idx_sub: np.ndarray | None = None) -> tuple:
+    """Compute the uncalibrated infinitesimal jackknife variance for a chunk of prediction locations
+
+    :param forest: The trained random forest
+    :type forest: RandomForestRegressor
+    :param X_train_shape: The (n_samples, n_features) shape of the training data
+    :type X_train_shape: tuple
+    :param X_chunk: The chunk of prediction data
+    :type X_chunk: pd.DataFrame | np.ndarray
+    :param inbag: The inbag matrix of the forest, as generated by :func:`forestci.calc_inbag`
+    :type inbag: np.ndarray
+    :param idx_sub: The indices of the forest's trees used for calibration, defaults to None
+    :type idx_sub: np.ndarray, optional
+    :return: The variance using all trees, and the variance using the `idx_sub` trees (None if `idx_sub` is None)
+    :rtype: tuple
+    """
+    var_chunk = fci.random_forest_error(forest, X_train_shape, X_chunk, inbag=inbag, calibrate=False)
+    if idx_sub is None:
+        return var_chunk, None
+    # Shallow copy of the forest using a subset of its trees
+    forest_sub = copy.copy(forest)
+    forest_sub.estimators_ = [forest.estimators_[i] for i in idx_sub]
+    forest_sub.n_estimators = len(idx_sub)
+    var_chunk_sub = fci.random_forest_error(forest_sub, X_train_shape, X_chunk,
+                                            inbag=inbag[:, idx_sub], calibrate=False)
+    return var_chunk, var_chunk_sub
+
+def rf_uncertainty_chunked(forest: RandomForestRegressor, X_test: pd.DataFrame | np.ndarray,
+                           n_train: int | None = None, chunk_size: int = 1000,
+                           calibrate: bool = True, n_jobs: int = 1,
+                           random_state: int | None = None) -> np.ndarray:
+    """Compute the random forest's prediction variance in bounded-memory chunks of prediction locations
+
+    The infinitesimal jackknife variance of Wager et al. (2014), as implemented by 
+    :func:`forestci.random_forest_error`, creates an n_train x n_test intermediate
+    matrix. Here the inbag matrix is computed once, the uncalibrated variance is computed 
+    for each chunk of `chunk_size` locations in parallel, and the empirical Bayes 
+    calibration is then applied once across all locations.
+
+    :param forest: The trained random forest. Must have been trained with bootstrap=True
+    :type forest: RandomForestRegressor
+    :param X_test: The prediction data, transformed as the forest expects
+    :type X_test: pd.DataFrame | np.ndarray
+    :param n_train: The number of training samples, defaults to None, meaning it is 
+        inferred from the trained forest
+    :type n_train: int, optional
+    :param chunk_size: The maximum number of locations processed at once, defaults to 1000.
+        Peak memory scales with n_train x chunk_size x n_jobs.
+    :type chunk_size: int, optional
+    :param calibrate: Should the empirical Bayes calibration be applied? Defaults to True.
+    :type calibrate: bool, optional
+    :param n_jobs: The number of chunks processed in parallel (threads), defaults to 1
+    :type n_jobs: int, optional
+    :param random_state: The random seed for selecting the calibration trees, defaults to None
+    :type random_state: int, optional
+    :raises ValueError: When the number of training samples cannot be determined, or the forest
+        was not trained with bootstrap=True
+    :return: The prediction variance of each location in `X_test`
+    :rtype: np.ndarray
+    """
+    if n_train is None:
+        n_train = getattr(forest, '_n_samples', None)
+        if n_train is None:
+            raise ValueError("Could not infer the number of training samples from the forest. Provide n_train.")
+    if not forest.bootstrap:
+        raise ValueError("The random forest uncertainty requires a forest trained with bootstrap=True")
+    X_train_shape = (n_train, forest.n_features_in_)
+    # The individual trees are fitted without feature names
+    X_test = np.asarray(X_test)
+    # The inbag matrix (n_train x n_trees) is shared by all chunks
+    inbag = fci.calc_inbag(n_train, forest)
+
+    n_test = X_test.shape[0]
+    calibrate = calibrate and n_test > 20
+    idx_sub = None
+    if calibrate:
+        # Calibration compares against a forest of half the trees to estimate Monte Carlo noise
+        n_sub = int(np.ceil(forest.n_estimators / 2))
+        idx_sub = np.random.default_rng(random_state).permutation(forest.n_estimators)[:n_sub]
+
+    ls_bounds = [(i, min(i + chunk_size, n_test)) for i in range(0, n_test, chunk_size)]
+    ls_var = joblib.Parallel(n_jobs=n_jobs, prefer='threads')(
+        joblib.delayed(_rf_var_unbiased)(forest, X_train_shape, X_test[i:j], inbag, idx_sub)
+        for i, j in ls_bounds)
+    var = np.concatenate([v[0] for v in ls_var]) if ls_var else np.array([])
+    if not calibrate:
+        return var
+
+    var_sub = np.concatenate([v[1] for v in ls_var])
+    sigma2_ss = np.mean((var_sub - var) ** 2)
+    delta = n_sub / forest.n_estimators
+    sigma2 = (delta ** 2 + (1 - delta) ** 2) / (2 * (1 - delta) ** 2) * sigma2_ss
+    return calibrateEB(var, sigma2)
+
+def rf_pred_interval(y_pred: np.ndarray, var: np.ndarray, ci_level: float = 0.9) -> tuple:
+    """Compute the normal-approximation prediction interval from the random forest variance
+
+    :param y_pred: The predicted values
+    :type y_pred: np.ndarray
+    :param var: The prediction variance, e.g. from :func:`rf_uncertainty_chunked`
+    :type var: np.ndarray
+    :param ci_level: The confidence level of the interval, defaults to 0.9
+    :type ci_level: float, optional
+    :return: The lower and upper bounds of the interval
+    :rtype: tuple(np.ndarray, np.ndarray)
+    """
+    half_width = norm.ppf(0.5 + ci_level / 2) * np.sqrt(np.clip(var, 0, None))
+    return y_pred - half_width, y_pred + half_width
+
+def _pipe_rf_uncertainty(pipe, X: pd.DataFrame, y_pred: np.ndarray,
+                         uncertainty_config: dict, n_jobs: int = 1, 
+                         random_state: int | None = None) -> dict:
+    """Compute the random forest variance & prediction interval from a trained pipeline
+
+    :param pipe: The trained pipeline whose final step is a random forest
+    :type pipe: sklearn.pipeline.Pipeline
+    :param X: The untransformed prediction data
+    :type X: pd.DataFrame
+    :param y_pred: The pipeline's predictions of `X`
+    :type y_pred: np.ndarray
+    :param uncertainty_config: The uncertainty options: `chunk_size`, `ci_level`, and `calibrate`
+    :type uncertainty_config: dict
+    :param n_jobs: The number of chunks processed in parallel, defaults to 1
+    :type n_jobs: int, optional
+    :param random_state: The random seed for selecting the calibration trees, defaults to None
+    :type random_state: int, optional
+    :return: dict of 'y_var', 'y_lower', and 'y_upper'
+    :rtype: dict
+    """
+    X_forest = pipe[:-1].transform(X) if len(pipe) > 1 else X
+    y_var = rf_uncertainty_chunked(pipe[-1], X_forest,
+                                   chunk_size=uncertainty_config.get('chunk_size', 1000),
+                                   calibrate=uncertainty_config.get('calibrate', True),
+                                   n_jobs=n_jobs, random_state=random_state)
+    y_lower, y_upper = rf_pred_interval(y_pred, y_var, ci_level=uncertainty_config.get('ci_level', 0.9))
+    return {'y_var': y_var, 'y_lower': y_lower, 'y_upper': y_upper}
+
 # %% ALGORITHM TRAINING AND EVALUATION
 
 def std_algo_path(dir_out_alg_ds:str | os.PathLike, algo: str, metric: str, dataset_id: str) -> str:
@@ -521,6 +1477,35 @@ def std_algo_path(dir_out_alg_ds:str | os.PathLike, algo: str, metric: str, data
     path_algo = Path(dir_out_alg_ds) / Path(basename_alg_ds_metr + '.joblib')
     return path_algo
 
+def std_algo_fingerprint_path(path_algo: str | os.PathLike) -> pathlib.PosixPath:
+    """Standardize the path of the input fingerprint recorded next to a saved algorithm
+
+    :param path_algo: The algorithm save path generated by :func:`std_algo_path`
+    :type path_algo: str | os.PathLike
+    :return: full save path for the fingerprint json file,
+        e.g. `algo_rf_NSE__dataset.fingerprint.json` next to `algo_rf_NSE__dataset.joblib`
+    :rtype: pathlib.PosixPath
+    """
+    return Path(path_algo).with_suffix('.fingerprint.json')
+
+def _read_algo_fingerprint(path_algo: str | os.PathLike) -> dict:
+    """Read the input fingerprint recorded next to a saved algorithm
+
+    :param path_algo: The algorithm save path generated by :func:`std_algo_path`
+    :type path_algo: str | os.PathLike
+    :return: The fingerprint record, or an empty dict if the algorithm or its
+        fingerprint does not exist, or the fingerprint cannot be read
+    :rtype: dict
+    """
+    path_fprt = std_algo_fingerprint_path(path_algo)
+    if not Path(path_algo).exists() or not path_fprt.exists():
+        return dict()
+    try:
+        with open(path_fprt, 'r') as file:
+            return json.load(file)
+    except (json.JSONDecodeError, OSError):
+        return dict()
+
 def std_pred_path(dir_out: str | os.PathLike, algo: str, metric: str, dataset_id: str
                   ) -> pathlib.PosixPath:
     """Standardize the prediction results save path
@@ -615,6 +1600,11 @@ def _read_pred_comid(path_pred_locs: str | os.PathLike, comid_pred_col:str ) ->
             comids_pred = pd.read_csv(path_pred_locs)[comid_pred_col].values
         except:
             raise ValueError(f"Could not successfully read in {path_pred_locs} & select col {comid_pred_col}")
+    elif '.parquet' in Path(path_pred_locs).suffix:
+        try:
+            comids_pred = pd.read_parquet(path_pred_locs, columns=[comid_pred_col])[comid_pred_col].values
+        except:
+            raise ValueError(f"Could not successfully read in {path_pred_locs} & select col {comid_pred_col}")
     else:
         raise ValueError(f"NEED TO ADD CAPABILITY THAT HANDLES {Path(path_pred_locs).suffix} file extensions")
     comids_pred = [str(x) for x in comids_pred]
@@ -670,7 +1660,8 @@ def combine_resp_gdf_comid_wrap(dir_std_base:str|os.PathLike,ds:str,
     # Grab the comid and associated coords/geodataframe 
     gdf_comid = fs_retr_nhdp_comids_geom(featureSource=featureSource,
                                                 featureID=featureID,
-                                                gage_ids=dat_resp['gage_id'].values)
+                                                gage_ids=dat_resp['gage_id'].values,
+                                                path_cache=std_nldi_cache_path(dir_std_base))
     # Ensure the original identifier gage_id matches up to the coords
     gdf_comid['gage_id'] = dat_resp['gage_id']
  
@@ -762,7 +1753,10 @@ class AlgoTrainEval:
                  dir_out_alg_ds: str | os.PathLike, dataset_id: str,
                  metr: str, test_size: float = 0.3,rs: int = 32,
                  test_ids = None,test_id_col:str = 'comid',
-                 verbose: bool = False):
+                 verbose: bool = False, compress: int = 0,
+                 search_config: dict = None, n_jobs: int = -1,
+                 blas_threads: int = None, uncertainty_config: dict = None,
+                 skip_unchanged: bool = False):
         """The algorithm training and evaluation class.
 
         :param df: The combined response variable and predictor variables DataFrame.
@@ -791,6 +1785,38 @@ class AlgoTrainEval:
         :type test_id_col: str
         :param verbose: Should print, defaults to False.
         :type verbose: bool, optional
+        :param compress: The :func:`joblib.dump` compression level for saving pipelines, defaults to 0.
+            Keep 0 so the saved pipelines may be loaded with memory-mapped arrays using :func:`load_algo_pipeline`
+        :type compress: int, optional
+        :param search_config: The hyperparameter search strategy for algorithms with multiple
+            hyperparameter options. Defaults to None, meaning an exhaustive grid search. Allowable keys include:
+            - `search_type`: 'grid' (:class:`sklearn.model_selection.GridSearchCV`),
+              'random' (:class:`sklearn.model_selection.RandomizedSearchCV`),
+              'halving_grid' (:class:`sklearn.model_selection.HalvingGridSearchCV`), or
+              'halving_random' (:class:`sklearn.model_selection.HalvingRandomSearchCV`). Default 'grid'.
+            - `cv`: The number of cross-validation folds. Default 5.
+            - `scoring`: The scoring metric. Default 'neg_mean_absolute_error'.
+            - `n_iter`: The number of sampled hyperparameter combinations for 'random'. Default 10.
+            - `factor`: The successive halving proportion of candidates retained each iteration. Default 3.
+            - `resource`: The successive halving resource, 'n_samples' or 'n_estimators' (random forest only). Default 'n_samples'.
+            - `min_resources`: The successive halving resource amount for the first iteration. Default 'exhaust' for 'halving_grid', 'smallest' for 'halving_random'.
+            - `max_resources`: The successive halving maximum resource amount. Default 'auto' for 'n_samples', or the largest `n_estimators` option.
+            - `n_candidates`: The number of candidates sampled for 'halving_random'. Default 'exhaust'.
+        :type search_config: dict, optional
+        :param n_jobs: The number of parallel jobs used by the random forest and hyperparameter searches,
+            defaults to -1 for all available cores. Refer to :func:`compute_budget`
+        :type n_jobs: int, optional
+        :param blas_threads: The maximum number of BLAS/OpenMP threads while training, defaults to None for no limit.
+        :type blas_threads: int, optional
+        :param uncertainty_config: The random forest prediction uncertainty options. Defaults to None, meaning
+            no uncertainty is computed. Refer to :func:`rf_uncertainty_chunked`. Allowable keys include:
+            - `chunk_size`: The maximum number of test locations processed at once. Default 1000.
+            - `ci_level`: The confidence level of the prediction interval. Default 0.9.
+            - `calibrate`: Should the empirical Bayes calibration be applied? Default True.
+        :type uncertainty_config: dict, optional
+        :param skip_unchanged: Should algorithms be reloaded from file rather than retrained when their
+            inputs are unchanged since they were saved? Defaults to False. Refer to :meth:`load_unchanged_algos`
+        :type skip_unchanged: bool, optional
         """
         # class args
         self.df = df
@@ -804,6 +1830,12 @@ class AlgoTrainEval:
         self.rs = rs
         self.dataset_id = dataset_id
         self.verbose = verbose
+        self.compress = compress
+        self.search_config = search_config if search_config else dict()
+        self.n_jobs = n_jobs
+        self.blas_threads = blas_threads
+        self.uncertainty_config = uncertainty_config
+        self.skip_unchanged = skip_unchanged
 
         # train/test split
         self.X_train = pd.DataFrame()
@@ -820,6 +1852,10 @@ class AlgoTrainEval:
         self.preds_dict = {}
         self.eval_dict = {}
 
+        # The input fingerprints of each algorithm & the algorithms reloaded rather than retrained
+        self.fingerprints = {}
+        self.algs_reused = list()
+
         # The evaluation summary result
         self.eval_df = pd.DataFrame()
 
@@ -944,29 +1980,86 @@ class AlgoTrainEval:
             # e.g. {'activation':'relu'} becomes {'activation':['relu']}
             self.algo_config_grid  = self.convert_to_list(self.algo_config_grid)
 
-    def calculate_rf_uncertainty(self, forest, X_train, X_test):
+    def calculate_rf_uncertainty(self, forest: RandomForestRegressor, X_train: pd.DataFrame,
+                                 X_test: pd.DataFrame) -> np.ndarray:
+        """Calculate the prediction variance of a random forest model in bounded-memory chunks
+
+        :param forest: The trained random forest
+        :type forest: RandomForestRegressor
+        :param X_train: The training data
+        :type X_train: pd.DataFrame
+        :param X_test: The test data
+        :type X_test: pd.DataFrame
+        :return: The prediction variance of each test location
+        :rtype: np.ndarray
         """
-        Calculate uncertainty using forestci for a Random Forest model.
+        uncn_cfg = self.uncertainty_config if self.uncertainty_config else dict()
+        return rf_uncertainty_chunked(forest, X_test, n_train=X_train.shape[0],
+                                      chunk_size=uncn_cfg.get('chunk_size', 1000),
+                                      calibrate=uncn_cfg.get('calibrate', True),
+                                      n_jobs=self.n_jobs, random_state=self.rs)
+
+    def algo_fingerprint(self, algo: str) -> str:
+        """Generate the fingerprint of the inputs that determine a trained algorithm
 
-        Parameters:
-            forest (RandomForestRegressor): Trained Random Forest model.
-            X_train (ndarray): Training data.
-            X_test (ndarray): Test data.
+        :param algo: The algorithm key, e.g. 'rf' or 'mlp'
+        :type algo: str
+        :return: The hash of the train/test split data, the algorithm's hyperparameter config,
+            the search config (hyperparameter search only), the random seed, and the sklearn version
+        :rtype: str
 
-        Returns:
-            ndarray: Confidence intervals for each prediction.
+        .. note::
+            Must be called after :meth:`split_data`. The split data include the attribute
+            column names and the location index, so changes to `attrs`, `test_size`,
+            `test_ids`, or the attribute & response values all change the fingerprint.
         """
-        ci = fci.random_forest_error(
-            forest=forest,
-            X_train_shape=X_train.shape,
-            X_test=X_test,
-            inbag=None, 
-            calibrate=True, 
-            memory_constrained=False, 
-            memory_limit=None, 
-            y_output=0  # Change this if multi-output
-        )
-        return ci
+        is_grid = algo in self.algo_config_grid
+        cfg_algo = self.algo_config_grid[algo] if is_grid else self.algo_config.get(algo)
+        inputs = {'algo': algo,
+                  'algo_config': cfg_algo,
+                  'search_config': self.search_config if is_grid else None,
+                  'rs': self.rs,
+                  'sklearn': sklearn.__version__,
+                  'data': [(list(X.columns), X.index.values, X.to_numpy()) for X in [self.X_train, self.X_test]] +
+                          [(y.index.values, y.to_numpy()) for y in [self.y_train, self.y_test]]}
+        return joblib.hash(inputs)
+
+    def load_unchanged_algos(self) -> list:
+        """Reload the saved algorithms whose input fingerprints match the current inputs,
+          and remove them from the algorithms to train
+
+        :return: The algorithm keys reloaded from file, also recorded in `algs_reused`
+        :rtype: list
+
+        .. note::
+            Must be called after :meth:`split_data` and :meth:`select_algs_grid_search`.
+            Reloaded algorithms are still used for prediction & evaluation of the test data,
+            which is much faster than fitting. A grid-searched random forest is saved as its
+            best pipeline, whereas a grid-searched multi-layer perceptron is saved as the
+            search object, whose `best_estimator_` provides the reloaded `algo`.
+        """
+        algo_types = {'rf': 'random forest regressor',
+                      'mlp': 'multi-layer perceptron regressor'}
+        for algo in list(self.algo_config_grid.keys()) + list(self.algo_config.keys()):
+            self.fingerprints[algo] = self.algo_fingerprint(algo)
+            path_algo = std_algo_path(self.dir_out_alg_ds, algo, self.metric, self.dataset_id)
+            if _read_algo_fingerprint(path_algo).get('fingerprint') != self.fingerprints[algo]:
+                continue
+            if self.verbose:
+                print(f"      Reusing unchanged {algo} pipeline for {self.metric}")
+            pipe = load_algo_pipeline(path_algo)
+            best_pipe = pipe.best_estimator_ if hasattr(pipe, 'best_estimator_') else pipe
+            self.algs_dict[algo] = {'algo': best_pipe.steps[-1][1],
+                                    'pipeline': pipe,
+                                    'type': algo_types.get(algo, algo),
+                                    'metric': self.metric,
+                                    'file_pipe': str(path_algo.name)}
+            self.algs_reused.append(algo)
+            self.algo_config.pop(algo, None)
+            self.algo_config_grid.pop(algo, None)
+            if algo in self.grid_search_algs:
+                self.grid_search_algs.remove(algo)
+        return self.algs_reused
 
     def train_algos(self):
         """Train algorithms based on what has been defined in the algo config file
@@ -987,35 +2080,17 @@ class AlgoTrainEval:
                                        min_samples_leaf=self.algo_config['rf'].get('min_samples_leaf',1),
                                        oob_score=True,
                                        random_state=self.rs,
+                                       n_jobs=self.n_jobs
                                        )
             pipe_rf = make_pipeline(rf)                       
             pipe_rf.fit(self.X_train, self.y_train)
             
-            # --- Make predictions using the RandomForest model ---
-            y_pred_rf = rf.predict(self.X_test)
-
-            # # --- Inserting forestci for uncertainty calculation ---
-            # ci = fci.random_forest_error(
-            #     forest=rf,
-            #     X_train_shape=self.X_train.shape,
-            #     X_test=self.X_test,  # Assuming X contains test samples
-            #     inbag=None, 
-            #     calibrate=True, 
-            #     memory_constrained=False, 
-            #     memory_limit=None, 
-            #     y_output=0  # Change this if multi-output
-            # )
-            # # ci now contains the confidence intervals for each prediction
-            
-            # --- Calculate confidence intervals ---
-            # ci = self.calculate_rf_uncertainty(rf, self.X_train, self.X_test)
 
-            # --- Compare predictions with confidence intervals ---
+            # The prediction uncertainty is computed in predict_algos() when uncertainty_config is provided
             self.algs_dict['rf'] = {'algo': rf,
                                     'pipeline': pipe_rf,
                                     'type': 'random forest regressor',
-                                    'metric': self.metric}#,
-                                    #'ci': ci}
+                                    'metric': self.metric}
 
         if 'mlp' in self.algo_config:  # MULTI-LAYER PERCEPTRON
             
@@ -1039,19 +2114,75 @@ class AlgoTrainEval:
                                      'type': 'multi-layer perceptron regressor',
                                      'metric': self.metric}
 
+    def _gen_search_cv(self, pipe, param_grid: dict, step_name: str):
+        """Generate the hyperparameter search object based on `search_config`
+
+        :param pipe: The pipeline containing the algorithm
+        :type pipe: sklearn.pipeline.Pipeline
+        :param param_grid: The hyperparameter options, with keys formatted as `'{step_name}__{param}'`
+        :type param_grid: dict
+        :param step_name: The name of the algorithm step inside `pipe`, e.g. 'randomforestregressor'
+        :type step_name: str
+        :raises ValueError: When an unrecognized `search_type` is provided
+        :return: The unfitted hyperparameter search object
+        :rtype: sklearn.model_selection.GridSearchCV | RandomizedSearchCV | HalvingGridSearchCV | HalvingRandomSearchCV
+        """
+        search_type = self.search_config.get('search_type','grid')
+        cv = self.search_config.get('cv', 5)
+        scoring = self.search_config.get('scoring', 'neg_mean_absolute_error')
+
+        if search_type == 'grid':
+            return GridSearchCV(pipe, param_grid, cv=cv, scoring=scoring, n_jobs=self.n_jobs)
+        elif search_type == 'random':
+            return RandomizedSearchCV(pipe, param_grid, n_iter=self.search_config.get('n_iter', 10),
+                                      cv=cv, scoring=scoring, n_jobs=self.n_jobs, random_state=self.rs)
+        elif search_type in ['halving_grid','halving_random']:
+            resource = self.search_config.get('resource', 'n_samples')
+            max_resources = self.search_config.get('max_resources', 'auto')
+            if resource != 'n_samples':
+                param_resource = f'{step_name}__{resource}'
+                if param_resource not in pipe.get_params():
+                    warnings.warn(f"The successive halving resource {resource} does not apply to {step_name}. Using 'n_samples' instead.",
+                                  UserWarning)
+                    resource = 'n_samples'
+                else:
+                    # The resource is allocated by the search, and may not also be a hyperparameter option
+                    opts_resource = param_grid.pop(param_resource, None)
+                    if max_resources == 'auto':
+                        if opts_resource is None:
+                            raise ValueError(f"Provide 'max_resources' in the search config when using {resource} as the resource")
+                        max_resources = int(max(opts_resource))
+                    resource = param_resource
+            kwargs_halving = {'factor': self.search_config.get('factor', 3),
+                              'resource': resource,
+                              'min_resources': self.search_config.get('min_resources',
+                                                  'exhaust' if search_type == 'halving_grid' else 'smallest'),
+                              'max_resources': max_resources,
+                              'cv': cv, 'scoring': scoring, 'n_jobs': self.n_jobs,
+                              'random_state': self.rs}
+            if search_type == 'halving_grid':
+                return HalvingGridSearchCV(pipe, param_grid, **kwargs_halving)
+            return HalvingRandomSearchCV(pipe, param_grid,
+                                         n_candidates=self.search_config.get('n_candidates', 'exhaust'),
+                                         **kwargs_halving)
+        else:
+            raise ValueError(f"Unrecognized search_type provided in the search config: {search_type}")
+
     def train_algos_grid_search(self):
-        """Train algorithms using GridSearchCV based on the algo config file.
+        """Train algorithms using a hyperparameter search based on the algo config file.
         
         .. note::
             Algorithm options include the following:
                 - `rf` for :class:`sklearn.ensemble.RandomForestRegressor`
                 - `mlp` for :class:`sklearn.neural_network.MLPRegressor`
+            The search strategy (e.g. :class:`sklearn.model_selection.GridSearchCV`) is defined by `search_config`.
         """
-
+        search_type = self.search_config.get('search_type','grid')
         if 'rf' in self.algo_config_grid:  # RANDOM FOREST
             if self.verbose:
-                print(f"      Performing Random Forest Training with Grid Search")
-            rf = RandomForestRegressor(oob_score=True, random_state=self.rs)
+                print(f"      Performing Random Forest Training with {search_type} search")
+            # The search parallelizes across candidates & folds, so each forest uses a single core
+            rf = RandomForestRegressor(oob_score=True, random_state=self.rs, n_jobs=1)
             # TODO move into main Param dict
             param_grid_rf = {
                 'randomforestregressor__n_estimators': self.algo_config_grid['rf'].get('n_estimators', [100, 200, 300]),
@@ -1060,7 +2191,7 @@ class AlgoTrainEval:
                 'randomforestregressor__min_samples_split': self.algo_config_grid['rf'].get('min_samples_split', [2, 5, 10])
             }
             pipe_rf = make_pipeline(rf)
-            grid_rf = GridSearchCV(pipe_rf, param_grid_rf, cv=5, scoring='neg_mean_absolute_error', n_jobs=-1)
+            grid_rf = self._gen_search_cv(pipe_rf, param_grid_rf, 'randomforestregressor')
             
             grid_rf.fit(self.X_train, self.y_train)
             self.algs_dict['rf'] = {'algo': grid_rf.best_estimator_.named_steps['randomforestregressor'],
@@ -1071,7 +2202,7 @@ class AlgoTrainEval:
         
         if 'mlp' in self.algo_config_grid:  # MULTI-LAYER PERCEPTRON
             if self.verbose:
-                print(f"      Performing Multilayer Perceptron Training with Grid Search")
+                print(f"      Performing Multilayer Perceptron Training with {search_type} search")
             mlpcfg = self.algo_config_grid['mlp']
             mlp = MLPRegressor(random_state=self.rs)
             param_grid_mlp = {
@@ -1083,7 +2214,7 @@ class AlgoTrainEval:
                 'mlpregressor__max_iter': mlpcfg.get('max_iter', [200, 300])
             }
             pipe_mlp = make_pipeline(StandardScaler(), mlp)
-            grid_mlp = GridSearchCV(pipe_mlp, param_grid_mlp, cv=5, scoring='neg_mean_absolute_error', n_jobs=-1)
+            grid_mlp = self._gen_search_cv(pipe_mlp, param_grid_mlp, 'mlpregressor')
             grid_mlp.fit(self.X_train, self.y_train)
             self.algs_dict['mlp'] = {'algo': grid_mlp.best_estimator_,
                                     'pipeline': grid_mlp,
@@ -1097,6 +2228,8 @@ class AlgoTrainEval:
             - `y_pred`: The predicted values vector
             - `type`: The type of algorithm used for prediction (e.g. `"random forest"`)
             - `metric`: The formulation evaluation metric or hydrologic signature represented by `y_pred`
+            - `y_var`, `y_lower`, `y_upper`: The random forest prediction variance and interval, 
+              only when `uncertainty_config` is provided
         :rtype: dict
         """
           
@@ -1111,6 +2244,12 @@ class AlgoTrainEval:
             self.preds_dict[k] = {'y_pred': y_pred,
                              'type': v['type'],
                              'metric': v['metric']}
+            if self.uncertainty_config is not None and isinstance(algo, RandomForestRegressor):
+                if self.verbose:
+                    print(f"      Computing prediction uncertainty for {type_algo} algorithm.")
+                self.preds_dict[k].update(_pipe_rf_uncertainty(pipe, self.X_test, y_pred,
+                                                               self.uncertainty_config,
+                                                               n_jobs=self.n_jobs, random_state=self.rs))
         return self.preds_dict
 
     def evaluate_algos(self) -> dict:
@@ -1136,21 +2275,42 @@ class AlgoTrainEval:
         return self.eval_dict
 
     def save_algos(self):
-        """ Write pipeline to file & record save path in `algs_dict['file_pipe']`
+        """ Write pipeline to file & record save path in `algs_dict['file_pipe']`.
+            The inputs' fingerprint & evaluation are recorded next to each pipeline
+            using :func:`std_algo_fingerprint_path`. Reloaded pipelines are not rewritten.
 
+        .. note::
+            The object saved is `algs_dict[algo]['pipeline']`: the best pipeline of a
+            grid-searched random forest, but the hyperparameter search object itself for a
+            grid-searched multi-layer perceptron.
         """
         
         for algo in self.algs_dict.keys():
-            if self.verbose:
-                print(f"      Saving {algo} pipeline for {self.metric} to file")
-
             path_algo = std_algo_path(self.dir_out_alg_ds, algo, self.metric, self.dataset_id)
             # basename_alg_ds_metr = f'algo_{algo}_{self.metric}__{self.dataset_id}'
             # path_algo = Path(self.dir_out_alg_ds) / Path(basename_alg_ds_metr + '.joblib')
             
-            # write trained algorithm
-            joblib.dump(self.algs_dict[algo]['pipeline'], path_algo)
+            if algo not in self.algs_reused:
+                if self.verbose:
+                    print(f"      Saving {algo} pipeline for {self.metric} to file")
+                # write trained algorithm. Uncompressed numpy arrays may later be memory-mapped on load
+                joblib.dump(self.algs_dict[algo]['pipeline'], path_algo, compress=self.compress)
             self.algs_dict[algo]['file_pipe'] = str(path_algo.name)
+
+            # Record the inputs' fingerprint next to the algorithm, so unchanged algorithms may be reloaded
+            if algo not in self.fingerprints:
+                self.fingerprints[algo] = self.algo_fingerprint(algo)
+            eval_algo = self.eval_dict.get(algo, dict())
+            dict_fprt = {'fingerprint': self.fingerprints[algo],
+                         'algo': algo,
+                         'dataset': self.dataset_id,
+                         'metric': self.metric,
+                         'n_train': int(self.X_train.shape[0]),
+                         'n_test': int(self.X_test.shape[0]),
+                         'sklearn': sklearn.__version__,
+                         'eval': {k: float(v) for k, v in eval_algo.items() if k in ['mse','r2']}}
+            with open(std_algo_fingerprint_path(path_algo), 'w') as file:
+                json.dump(dict_fprt, file, indent=2)
    
     def org_metadata_alg(self):
         """Must be called after running AlgoTrainEval.save_algos(). Records saved location of trained algorithm
@@ -1177,15 +2337,20 @@ class AlgoTrainEval:
         # Check whether supplied params designed for grid search:
         self.select_algs_grid_search()
 
-        # Train algorithms; returns self.algs_dict 
-        if self.grid_search_algs: # Perform hyperparameterization grid search for these algos
-            self.train_algos_grid_search()
+        # Reload algorithms whose inputs are unchanged since last saved, rather than retraining
+        if self.skip_unchanged:
+            self.load_unchanged_algos()
+
+        with _blas_limits(self.blas_threads):
+            # Train algorithms; returns self.algs_dict 
+            if self.grid_search_algs: # Perform hyperparameterization grid search for these algos
+                self.train_algos_grid_search()
 
-        if self.algo_config: # Just run a single simulation for these algos
-            self.train_algos()
+            if self.algo_config: # Just run a single simulation for these algos
+                self.train_algos()
 
-        # Make predictions  (aka validation) 
-        self.predict_algos()
+            # Make predictions  (aka validation) 
+            self.predict_algos()
 
         # Evaluate predictions; returns self.eval_dict
         self.evaluate_algos()
@@ -1196,12 +2361,382 @@ class AlgoTrainEval:
         # Generate metadata dataframe
         self.org_metadata_alg() # Must be called after save_algos()
 
+# %% PARALLEL TRAINING ACROSS DATASETS & METRICS
+def _train_eval_job(df: pd.DataFrame, attrs: Iterable[str], algo_config: dict,
+                    dir_out_alg_ds: str | os.PathLike, dataset_id: str,
+                    metr: str, test_size: float = 0.3, rs: int = 32,
+                    test_ids = None, verbose: bool = False, compress: int = 0,
+                    search_config: dict = None, n_jobs: int = -1,
+                    blas_threads: int = None, uncertainty_config: dict = None,
+                    skip_unchanged: bool = False) -> AlgoTrainEval:
+    """Train, test, and evaluate the algorithms for a single (dataset, metric) job
+
+    :param df: The combined response variable and predictor variables DataFrame.
+    :type df: pd.DataFrame
+    :param attrs: The column names of attributes.
+    :type attrs: Iterable[str]
+    :param algo_config: The algorithm configuration. Refer to :class:`AlgoTrainEval`
+    :type algo_config: dict
+    :param dir_out_alg_ds: Directory where algorithm's output stored.
+    :type dir_out_alg_ds: str | os.PathLike
+    :param dataset_id: Unique identifier/descriptor of the dataset of interest
+    :type dataset_id: str
+    :param metr: Column name in `df` of the metric or hydrologic signature of interest
+    :type metr: str
+    :param test_size: Proportion of dataset to include in the test split, defaults to 0.3.
+    :type test_size: float, optional
+    :param rs: The random seed, defaults to 32.
+    :type rs: int, optional
+    :param test_ids: The explicit comids of interest for testing. Defaults to None.
+    :type test_ids: Iterable or None
+    :param verbose: Should print, defaults to False.
+    :type verbose: bool, optional
+    :param compress: The :func:`joblib.dump` compression level for saving pipelines, defaults to 0.
+    :type compress: int, optional
+    :param search_config: The hyperparameter search strategy. Refer to :class:`AlgoTrainEval`. Defaults to None.
+    :type search_config: dict, optional
+    :param n_jobs: The inner number of parallel jobs for the estimators & searches, defaults to -1.
+    :type n_jobs: int, optional
+    :param blas_threads: The maximum number of BLAS/OpenMP threads, defaults to None for no limit.
+    :type blas_threads: int, optional
+    :param uncertainty_config: The random forest uncertainty options. Refer to :class:`AlgoTrainEval`. Defaults to None.
+    :type uncertainty_config: dict, optional
+    :param skip_unchanged: Should algorithms with unchanged inputs be reloaded rather than retrained? Defaults to False.
+    :type skip_unchanged: bool, optional
+    :return: The trained & evaluated algorithm class object
+    :rtype: AlgoTrainEval
+
+    .. note::
+        `AlgoTrainEval.select_algs_grid_search` pops keys from `algo_config`,
+        so each job works on its own deep copy of the algorithm config.
+    """
+    print(f' - Processing {metr} for {dataset_id}')
+    train_eval = AlgoTrainEval(df=df,
+                               attrs=list(attrs),
+                               algo_config=copy.deepcopy(algo_config),
+                               dir_out_alg_ds=dir_out_alg_ds, dataset_id=dataset_id,
+                               metr=metr,test_size=test_size, rs = rs,
+                               test_ids=test_ids,
+                               verbose=verbose, compress=compress,
+                               search_config=search_config,
+                               n_jobs=n_jobs, blas_threads=blas_threads,
+                               uncertainty_config=uncertainty_config,
+                               skip_unchanged=skip_unchanged)
+    train_eval.train_eval() # Train, test, eval wrapper
+    return train_eval
+
+def train_eval_parallel_wrap(ls_job_kwargs: List[dict], n_jobs: int = 1,
+                             backend: str = 'loky', blas_threads: int = None) -> List[AlgoTrainEval]:
+    """Fan out independent (dataset, metric) training jobs over a worker pool
+
+    :param ls_job_kwargs: Each element is the dict of keyword arguments for a
+        single job, as expected by :func:`_train_eval_job` (e.g. `df`, `attrs`,
+        `algo_config`, `dir_out_alg_ds`, `dataset_id`, `metr`, `test_size`, `rs`,
+        `test_ids`, `verbose`, `compress`, `search_config`, `n_jobs`, `blas_threads`,
+        `uncertainty_config`, `skip_unchanged`)
+    :type ls_job_kwargs: List[dict]
+    :param n_jobs: The number of parallel workers. Default 1 runs each job
+        sequentially inside the current process. -1 uses all available cores.
+    :type n_jobs: int, optional
+    :param backend: The :class:`joblib.Parallel` backend, defaults to 'loky'
+    :type backend: str, optional
+    :param blas_threads: The maximum number of BLAS/OpenMP threads in each worker process,
+        defaults to None, meaning joblib's default of the available cores divided by `n_jobs`
+    :type blas_threads: int, optional
+    :return: The trained & evaluated algorithm class objects, in the same order
+        as `ls_job_kwargs`
+    :rtype: List[AlgoTrainEval]
+
+    .. note::
+        Each job writes its trained pipelines to the standard paths defined by
+        :func:`std_algo_path`. With the 'loky' backend, numeric arrays larger
+        than 1MB (e.g. the attribute data blocks within each job's `df`) are
+        memory-mapped read-only into the workers rather than copied.
+    """
+    if n_jobs is None or n_jobs == 1 or len(ls_job_kwargs) <= 1:
+        return [_train_eval_job(**kwargs) for kwargs in ls_job_kwargs]
+
+    n_jobs = min(n_jobs, len(ls_job_kwargs)) if n_jobs > 0 else n_jobs
+    print(f"Training {len(ls_job_kwargs)} dataset-metric jobs across {n_jobs} workers")
+    if blas_threads:
+        # Worker processes (and any processes they spawn) inherit the BLAS/OpenMP thread limit
+        cfg_parallel = joblib.parallel_config(backend=backend, inner_max_num_threads=blas_threads)
+    else:
+        cfg_parallel = contextlib.nullcontext()
+    with cfg_parallel:
+        ls_train_eval = joblib.Parallel(n_jobs=n_jobs, backend=backend, mmap_mode='r')(
+            joblib.delayed(_train_eval_job)(**kwargs) for kwargs in ls_job_kwargs)
+    return ls_train_eval
+
+# %% BATCH PREDICTION
+def std_pred_dataset_path(dir_out: str | os.PathLike) -> pathlib.PosixPath:
+    """Standardize the partitioned prediction dataset directory
+
+    :param dir_out: The base directory for saving output
+    :type dir_out: str | os.PathLike
+    :return: The root directory of the parquet dataset containing all predictions,
+        partitioned by 'dataset', 'metric', and 'algo'
+    :rtype: pathlib.PosixPath
+    """
+    dir_pred_dataset = Path(Path(dir_out)/Path('algorithm_predictions_dataset'))
+    dir_pred_dataset.mkdir(exist_ok=True,parents=True)
+    return dir_pred_dataset
+
+def load_algo_pipeline(path_algo: str | os.PathLike, mmap_mode: str | None = None):
+    """Load a trained algorithm pipeline, optionally memory-mapping its numpy arrays
+
+    :param path_algo: The path to the trained algorithm pipeline, e.g. from :func:`std_algo_path`
+    :type path_algo: str | os.PathLike
+    :param mmap_mode: The :func:`joblib.load` memory-map mode, e.g. 'r' for read-only.
+        Defaults to None, meaning arrays are read fully into memory.
+    :type mmap_mode: str | None, optional
+    :return: The trained pipeline
+    :rtype: sklearn.pipeline.Pipeline
+
+    .. note::
+        Memory-mapping requires pipelines saved without compression, the default
+        in :meth:`AlgoTrainEval.save_algos`. Compressed pipelines are read fully into memory.
+        Arrays such as scaler statistics and multilayer perceptron weights remain
+        memory-mapped, so processes loading the same file share those pages.
+        Random forest trees copy their node arrays into their own buffers when
+        loaded, so memory-mapping only avoids the intermediate read buffer for these.
+    """
+    return joblib.load(path_algo, mmap_mode=mmap_mode)
+
+class AlgoModelCache:
+    def __init__(self, maxsize: int = 8, mmap_mode: str | None = None):
+        """A least-recently-used cache of trained algorithm pipelines
+
+        Each pipeline is read from file with :func:`load_algo_pipeline` only once,
+        so long as it remains within the `maxsize` most recently used pipelines.
+
+        :param maxsize: The maximum number of pipelines kept in memory, defaults to 8
+        :type maxsize: int, optional
+        :param mmap_mode: The memory-map mode passed to :func:`load_algo_pipeline`, defaults to None
+        :type mmap_mode: str | None, optional
+        """
+        self.maxsize = maxsize
+        self.mmap_mode = mmap_mode
+        self._cache = OrderedDict()
+
+    def get(self, path_algo: str | os.PathLike):
+        """Retrieve the trained pipeline, loading it from file if not already cached
+
+        :param path_algo: The path to the trained algorithm pipeline, e.g. from :func:`std_algo_path`
+        :type path_algo: str | os.PathLike
+        :raises FileNotFoundError: When the algorithm file does not exist
+        :return: The trained pipeline
+        :rtype: sklearn.pipeline.Pipeline
+        """
+        key = str(path_algo)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        if not Path(path_algo).exists():
+            raise FileNotFoundError(f"The following algorithm path does not exist: \n{path_algo}")
+        pipe = load_algo_pipeline(path_algo, mmap_mode=self.mmap_mode)
+        self._cache[key] = pipe
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return pipe
+
+def iter_attr_wide_chunks(dir_db_attrs: str | os.PathLike, comids: Iterable,
+                          attrs_sel: str | Iterable = 'all', chunk_size: int = 100000,
+                          read_type: str = 'all'):
+    """Stream the wide-format attribute data in chunks of comids
+
+    :param dir_db_attrs: directory where attribute .parquet files live
+    :type dir_db_attrs: str | os.PathLike
+    :param comids: The comids of interest
+    :type comids: Iterable
+    :param attrs_sel: desired attributes to select from the attributes .parquet files, defaults to 'all'
+    :type attrs_sel: str | Iterable, optional
+    :param chunk_size: The maximum number of comids per chunk, defaults to 100000
+    :type chunk_size: int, optional
+    :param read_type: The approach for reading attribute data. Refer to
+        :func:`fs_read_attr_comid`. Defaults to 'all'. The 'store' option is
+        strongly recommended for large domains, as only the matching partitions are read per chunk.
+    :type read_type: str, optional
+    :return: generator of wide-format attribute DataFrames indexed by 'featureID'
+    :rtype: Generator[pd.DataFrame]
+
+    .. note::
+        With `read_type='all'`, the attribute files are discovered once, and only the
+        comid filter of each chunk is pushed into each read.
+    """
+    comids = list(dict.fromkeys([str(x) for x in comids]))
+    if read_type == 'all':
+        ds_attr = _attr_db_dataset(dir_db_attrs)
+    for idx in range(0, len(comids), chunk_size):
+        comids_chunk = comids[idx:idx+chunk_size]
+        if read_type == 'all':
+            df_attr = _subset_check_attr_df(_read_attr_dataset(ds_attr, comids_chunk, attrs_sel=attrs_sel),
+                                            comids_chunk, attrs_sel, dir_db_attrs)
+        else:
+            df_attr = fs_read_attr_comid(dir_db_attrs, comids_chunk, attrs_sel = attrs_sel,
+                                         _s3 = None, storage_options=None, read_type=read_type)
+        if df_attr.shape[0] == 0:
+            continue
+        yield df_attr.pivot(index='featureID', columns = 'attribute', values = 'value')
+
+def _pipe_set_n_jobs(pipe: sklearn.pipeline.Pipeline, n_jobs: int = None) -> sklearn.pipeline.Pipeline:
+    """Set the parallel jobs of a pipeline's final estimator without modifying the original pipeline
+
+    :param pipe: The trained pipeline, e.g. as shared by :class:`AlgoModelCache`
+    :type pipe: sklearn.pipeline.Pipeline
+    :param n_jobs: The number of parallel jobs, defaults to None, meaning the pipeline is returned as-is
+    :type n_jobs: int, optional
+    :return: A shallow copy of `pipe` whose final estimator uses `n_jobs`, or `pipe` itself
+    :rtype: sklearn.pipeline.Pipeline
+    """
+    if n_jobs is None or 'n_jobs' not in pipe[-1].get_params(deep=False):
+        return pipe
+    name_est, est = pipe.steps[-1]
+    pipe_jobs = copy.copy(pipe)
+    pipe_jobs.steps = pipe.steps[:-1] + [(name_est, copy.copy(est).set_params(n_jobs=n_jobs))]
+    return pipe_jobs
+
+def fs_pred_batch(dir_db_attrs: str | os.PathLike, comids_pred: Iterable,
+                  ds: str, resp_vars: Iterable[str], algos: Iterable[str],
+                  dir_out_alg_ds: str | os.PathLike, dir_out: str | os.PathLike,
+                  attrs_sel: str | Iterable = 'all', read_type: str = 'all',
+                  chunk_size: int = 100000, model_cache: AlgoModelCache = None,
+                  n_jobs: int = None, blas_threads: int = None,
+                  uncertainty_config: dict = None
+                  ) -> pathlib.PosixPath:
+    """Predict all metrics & algorithms of a dataset in chunks of comids, writing to a partitioned parquet dataset
+
+    :param dir_db_attrs: directory where attribute .parquet files live
+    :type dir_db_attrs: str | os.PathLike
+    :param comids_pred: The comids of the prediction locations
+    :type comids_pred: Iterable
+    :param ds: Unique identifier/descriptor of the dataset used for training
+    :type ds: str
+    :param resp_vars: The response variables (e.g. metrics, hydrologic signatures) to predict
+    :type resp_vars: Iterable[str]
+    :param algos: The algorithm types to predict with (e.g. rf, mlp)
+    :type algos: Iterable[str]
+    :param dir_out_alg_ds: Directory where the trained algorithms for `ds` are stored
+    :type dir_out_alg_ds: str | os.PathLike
+    :param dir_out: The base directory for saving output
+    :type dir_out: str | os.PathLike
+    :param attrs_sel: desired attributes to select from the attributes .parquet files, defaults to 'all'
+    :type attrs_sel: str | Iterable, optional
+    :param read_type: The approach for reading attribute data. Refer to :func:`fs_read_attr_comid`. Defaults to 'all'.
+    :type read_type: str, optional
+    :param chunk_size: The maximum number of comids predicted at once, defaults to 100000
+    :type chunk_size: int, optional
+    :param model_cache: The trained pipeline cache, defaults to None, meaning a new :class:`AlgoModelCache`
+    :type model_cache: AlgoModelCache, optional
+    :param n_jobs: The number of parallel jobs for algorithms that predict in parallel (e.g. random forest).
+        Defaults to None, meaning the algorithm's saved setting.
+    :type n_jobs: int, optional
+    :param blas_threads: The maximum number of BLAS/OpenMP threads, defaults to None for no limit.
+    :type blas_threads: int, optional
+    :param uncertainty_config: The random forest uncertainty options. Refer to :class:`AlgoTrainEval`.
+        Defaults to None, meaning no uncertainty is computed. Otherwise random forest predictions
+        also contain 'pred_var', 'pred_lower', and 'pred_upper' columns.
+    :type uncertainty_config: dict, optional
+    :return: The root directory of the prediction dataset, as defined by :func:`std_pred_dataset_path`
+    :rtype: pathlib.PosixPath
+
+    .. note::
+        Peak memory is bounded by `chunk_size` rather than the total number of
+        prediction locations. Any prior predictions for `ds` inside the
+        prediction dataset are replaced. The random forest uncertainty is
+        calibrated within each chunk of `chunk_size` locations.
+    """
+    if model_cache is None:
+        model_cache = AlgoModelCache()
+    dir_pred_dataset = std_pred_dataset_path(dir_out)
+    # Replace any existing predictions corresponding to this dataset
+    dir_pred_dataset_ds = Path(dir_pred_dataset)/f'dataset={ds}'
+    if dir_pred_dataset_ds.exists():
+        shutil.rmtree(dir_pred_dataset_ds)
+
+    # Ensure all trained algorithms exist before predicting
+    dict_path_algo = dict()
+    for metric in resp_vars:
+        for algo in algos:
+            path_algo = std_algo_path(dir_out_alg_ds, algo=algo, metric=metric, dataset_id=ds)
+            if not Path(path_algo).exists():
+                raise FileNotFoundError(f"The following algorithm path does not exist: \n{path_algo}")
+            dict_path_algo[(metric, algo)] = path_algo
+
+    for idx_chunk, df_attr_wide in enumerate(iter_attr_wide_chunks(dir_db_attrs, comids_pred,
+                                                                   attrs_sel=attrs_sel,
+                                                                   chunk_size=chunk_size,
+                                                                   read_type=read_type)):
+        ls_df_pred = list()
+        for (metric, algo), path_algo in dict_path_algo.items():
+            pipe = _pipe_set_n_jobs(model_cache.get(path_algo), n_jobs)
+            feat_names = list(pipe.feature_names_in_)
+            attrs_missing = [x for x in feat_names if x not in df_attr_wide.columns]
+            if attrs_missing:
+                raise KeyError(f"The following attributes required by {Path(path_algo).name} are absent "
+                               f"from prediction chunk {idx_chunk}: {attrs_missing}")
+            X_pred = df_attr_wide[feat_names]
+            with _blas_limits(blas_threads):
+                resp_pred = pipe.predict(X_pred)
+                df_pred_algo = pd.DataFrame({'comid': df_attr_wide.index.values,
+                                             'prediction': resp_pred,
+                                             'metric': metric,
+                                             'dataset': ds,
+                                             'algo': algo,
+                                             'name_algo': Path(path_algo).name})
+                if uncertainty_config is not None and isinstance(pipe[-1], RandomForestRegressor):
+                    dict_uncn = _pipe_rf_uncertainty(pipe, X_pred, resp_pred, uncertainty_config,
+                                                     n_jobs=n_jobs if n_jobs is not None else 1)
+                    df_pred_algo['pred_var'] = dict_uncn['y_var']
+                    df_pred_algo['pred_lower'] = dict_uncn['y_lower']
+                    df_pred_algo['pred_upper'] = dict_uncn['y_upper']
+            ls_df_pred.append(df_pred_algo)
+        df_pred = pd.concat(ls_df_pred, ignore_index=True)
+        pq.write_to_dataset(pa.Table.from_pandas(df_pred, preserve_index=False),
+                            root_path=dir_pred_dataset,
+                            partition_cols=['dataset','metric','algo'],
+                            basename_template=f'part-{idx_chunk:05d}-{{i}}.parquet',
+                            existing_data_behavior='overwrite_or_ignore')
+        print(f"   Completed prediction chunk {idx_chunk} of {df_attr_wide.shape[0]} locations for {ds}")
+    return dir_pred_dataset
+
+def read_pred_dataset(dir_out: str | os.PathLike, ds: str, metric: str, algo: str) -> pd.DataFrame:
+    """Read the predictions for a dataset, metric, and algorithm
+
+    :param dir_out: The base directory for saving output
+    :type dir_out: str | os.PathLike
+    :param ds: Unique identifier/descriptor of the dataset
+    :type ds: str
+    :param metric: The metric or hydrologic signature identifier of interest
+    :type metric: str
+    :param algo: The type of algorithm
+    :type algo: str
+    :return: The predictions, containing 'comid', 'prediction', 'metric', 'dataset', 'algo', 'name_algo' columns,
+        and 'pred_var', 'pred_lower', 'pred_upper' columns when the uncertainty was computed
+    :rtype: pd.DataFrame
+
+    .. note::
+        Reads from the partitioned dataset written by :func:`fs_pred_batch`.
+        Falls back to the individual file from :func:`std_pred_path` when the partition does not exist.
+    """
+    dir_pred_part = Path(dir_out)/'algorithm_predictions_dataset'/f'dataset={ds}'/f'metric={metric}'/f'algo={algo}'
+    if not dir_pred_part.exists():
+        return pd.read_parquet(std_pred_path(dir_out, algo=algo, metric=metric, dataset_id=ds))
+    df_pred = pd.read_parquet(dir_pred_part)
+    df_pred['metric'] = metric
+    df_pred['dataset'] = ds
+    df_pred['algo'] = algo
+    cols_uncn = [col for col in ['pred_var','pred_lower','pred_upper'] if col in df_pred.columns]
+    return df_pred[['comid','prediction','metric','dataset','algo','name_algo'] + cols_uncn]
+
 ###############################################################################
 ###############################################################################
 ###############################################################################
 # %% DATASERT CORRELATION ANALYSIS
 def plot_corr_mat(df_X: pd.DataFrame,
-                title='Feature Correlation Matrix'
+                title='Feature Correlation Matrix',
+                df_corr_rslt: pd.DataFrame = None,
+                max_attrs: int = 50
                 ) -> matplotlib.figure.Figure:
     """Generate a plot of the correlation matrix
 
@@ -1209,15 +2744,66 @@ def plot_corr_mat(df_X: pd.DataFrame,
     :type df_X: pd.DataFrame
     :param title: Plot title, defaults to 'Feature Correlation Matrix'
     :type title: str, optional
+    :param df_corr_rslt: The table of correlated attribute pairings generated by
+        :func:`corr_attrs_thr_table`, defaults to None
+    :type df_corr_rslt: pd.DataFrame, optional
+    :param max_attrs: When `df_X` contains more attributes than this and `df_corr_rslt` 
+        is provided, only the correlated attributes from `df_corr_rslt` are plotted, defaults to 50
+    :type max_attrs: int, optional
     :return: The correlation matrix figure
     :rtype: matplotlib.figure.Figure
     """
-    # Calculate the correlation matrix
-    df_corr = df_X.corr()
+    df_corr = corr_mat_plot_df(df_X, df_corr_rslt=df_corr_rslt, max_attrs=max_attrs)
+    return _plot_corr_df(df_corr, title=title, max_attrs=max_attrs)
+
+def corr_mat_plot_df(df_X: pd.DataFrame, df_corr_rslt: pd.DataFrame = None,
+                     max_attrs: int = 50) -> pd.DataFrame:
+    """Generate the correlation matrix shown by :func:`plot_corr_mat`
+
+    :param df_X: The dataset dataframe
+    :type df_X: pd.DataFrame
+    :param df_corr_rslt: The table of correlated attribute pairings generated by
+        :func:`corr_attrs_thr_table`, defaults to None
+    :type df_corr_rslt: pd.DataFrame, optional
+    :param max_attrs: When `df_X` contains more attributes than this and `df_corr_rslt` 
+        is provided, only the correlated attributes from `df_corr_rslt` are retained, defaults to 50
+    :type max_attrs: int, optional
+    :return: The correlation matrix, with NaN for attribute pairings absent from `df_corr_rslt`
+    :rtype: pd.DataFrame
+    """
+    if df_corr_rslt is not None and df_X.shape[1] > max_attrs:
+        # Build the correlation matrix of the correlated attributes from the pairings table
+        attrs_corr = pd.unique(pd.concat([df_corr_rslt['attr1'], df_corr_rslt['attr2']]))
+        arr_corr = np.full((len(attrs_corr), len(attrs_corr)), np.nan)
+        np.fill_diagonal(arr_corr, 1.0)
+        idx_attr = pd.Index(attrs_corr)
+        idx1 = idx_attr.get_indexer(df_corr_rslt['attr1'])
+        idx2 = idx_attr.get_indexer(df_corr_rslt['attr2'])
+        arr_corr[idx1, idx2] = df_corr_rslt['corr'].values
+        arr_corr[idx2, idx1] = df_corr_rslt['corr'].values
+        df_corr = pd.DataFrame(arr_corr, index=attrs_corr, columns=attrs_corr)
+    else:
+        # Calculate the correlation matrix
+        df_corr = df_X.corr()
+    return df_corr
+
+def _plot_corr_df(df_corr: pd.DataFrame, title='Feature Correlation Matrix',
+                  max_attrs: int = 50) -> matplotlib.figure.Figure:
+    """Plot a correlation matrix
 
+    :param df_corr: The correlation matrix, e.g. from :func:`corr_mat_plot_df`
+    :type df_corr: pd.DataFrame
+    :param title: Plot title, defaults to 'Feature Correlation Matrix'
+    :type title: str, optional
+    :param max_attrs: The correlation values are annotated when there are at most this many attributes, defaults to 50
+    :type max_attrs: int, optional
+    :return: The correlation matrix figure
+    :rtype: matplotlib.figure.Figure
+    """
     #  Plot the correlation matrix
     plt.figure(figsize=(10,8))
-    sns.heatmap(df_corr, annot=True, cmap ='coolwarm',linewidths=0.5, fmt='.2f')
+    sns.heatmap(df_corr, annot=df_corr.shape[1] <= max_attrs, cmap ='coolwarm',linewidths=0.5, fmt='.2f',
+                mask=df_corr.isna())
     plt.title(title)
 
     fig = plt.gcf()
@@ -1241,7 +2827,8 @@ def std_corr_mat_plot_path(dir_out_viz_base: str | os.PathLike,
 
 def plot_corr_mat_save_wrap(df_X:pd.DataFrame, title:str,
                             dir_out_viz_base:str | os.PathLike,
-                            ds:str)-> matplotlib.figure.Figure:
+                            ds:str, df_corr_rslt:pd.DataFrame = None
+                            )-> matplotlib.figure.Figure:
     """Wrapper to plot and save the dataset correlation matrix
 
     :param df_X: The full dataset of interest, e.g. used for training/validation
@@ -1252,14 +2839,29 @@ def plot_corr_mat_save_wrap(df_X:pd.DataFrame, title:str,
     :type dir_out_viz_base: str | os.PathLike
     :param ds: The dataset name to use in plot title and filename
     :type ds: str
+    :param df_corr_rslt: The table of correlated attribute pairings. Refer to :func:`plot_corr_mat`. Defaults to None.
+    :type df_corr_rslt: pd.DataFrame, optional
     :return: The correlation matrix plot
     :rtype: matplotlib.figure.Figure
     """
-    fig_corr_mat = plot_corr_mat(df_X, title)
+    fig_corr_mat = plot_corr_mat(df_X, title, df_corr_rslt=df_corr_rslt)
+    _save_corr_mat_plot(fig_corr_mat, dir_out_viz_base, ds)
+    return fig_corr_mat
+
+def _save_corr_mat_plot(fig_corr_mat: matplotlib.figure.Figure,
+                        dir_out_viz_base: str | os.PathLike, ds: str):
+    """Save the dataset correlation matrix plot to its standardized filepath
+
+    :param fig_corr_mat: The correlation matrix plot
+    :type fig_corr_mat: matplotlib.figure.Figure
+    :param dir_out_viz_base: base directory for saving visualization
+    :type dir_out_viz_base: str | os.PathLike
+    :param ds: The dataset name to use in the filename
+    :type ds: str
+    """
     path_corr_mat = std_corr_mat_plot_path(dir_out_viz_base,ds)
     fig_corr_mat.savefig(path_corr_mat)
     print(f"Wrote the {ds} dataset correlation matrix to:\n{path_corr_mat}")
-    return fig_corr_mat
 
 def std_corr_path(dir_out_anlys_base: str|os.PathLike, ds:str,
                    cstm_str:str=None) -> pathlib.PosixPath:
@@ -1282,30 +2884,76 @@ def std_corr_path(dir_out_anlys_base: str|os.PathLike, ds:str,
     path_corr_attrs.parent.mkdir(parents=True,exist_ok=True)
     return path_corr_attrs
 
+def _corr_pairs_upper(corr: np.ndarray, corr_thr: float,
+                      offset_row: int = 0, offset_col: int = 0) -> tuple:
+    """Identify the upper-triangle indices of a correlation (sub)matrix whose absolute values exceed a threshold
+
+    :param corr: The correlation matrix, or a block of it
+    :type corr: np.ndarray
+    :param corr_thr: The absolute correlation threshold
+    :type corr_thr: float
+    :param offset_row: The row position of the block inside the full correlation matrix, defaults to 0
+    :type offset_row: int, optional
+    :param offset_col: The column position of the block inside the full correlation matrix, defaults to 0
+    :type offset_col: int, optional
+    :return: The row indices, column indices, and correlation values in the full correlation matrix
+    :rtype: tuple(np.ndarray, np.ndarray, np.ndarray)
+    """
+    row_idx, col_idx = np.nonzero(np.abs(corr) > corr_thr)
+    row_idx = row_idx + offset_row
+    col_idx = col_idx + offset_col
+    is_upper = col_idx > row_idx
+    row_idx, col_idx = row_idx[is_upper], col_idx[is_upper]
+    return row_idx, col_idx, corr[row_idx - offset_row, col_idx - offset_col]
+
 def corr_attrs_thr_table(df_X:pd.DataFrame, 
-                        corr_thr:float = 0.8) -> pd.DataFrame:
+                        corr_thr:float = 0.8,
+                        block_size:int = 1000,
+                        dtype = np.float64) -> pd.DataFrame:
     """Create a table of correlated attributes exceeding a threshold, with correlation values
 
     :param df_X: The attribute dataset
     :type df_X: pd.DataFrame
     :param corr_thr: The correlation threshold, between 0 & 1. Absolute values above this should be reduced, defaults to 0.8
     :type corr_thr: float, optional
-    :return: The table of attribute pairings whose absolute correlations exceed a threshold
+    :param block_size: The number of attributes correlated against each other at once, defaults to 1000.
+        Peak memory scales with block_size x block_size rather than the total number of attributes squared.
+    :type block_size: int, optional
+    :param dtype: The numeric type of the computation, defaults to np.float64. Use np.float32 to halve memory.
+    :type dtype: np.dtype, optional
+    :return: The table of attribute pairings whose absolute correlations exceed a threshold. 
+        Each pairing is listed once, with 'attr1' preceding 'attr2' in `df_X` column order.
     :rtype: pd.DataFrame
-    """
-    df_corr = df_X.corr()
-
-    # TODO Change code to selecting upper triangle of correlation matrix
-    upper = df_corr.abs().where(np.triu(np.ones(df_corr.shape), k=1).astype(bool))
 
-    # Find attributes with correlation greater than a certain threshold
-    row_idx, col_idx = np.where(df_corr.abs() > corr_thr)
-    df_corr_rslt = pd.DataFrame({'attr1': df_corr.columns[row_idx],
-                'attr2': df_corr.columns[col_idx],
-                'corr' : [df_corr.iat[row, col] for row, col in zip(row_idx, col_idx)]
-                })
-    # Remove the identical attributes
-    df_corr_rslt = df_corr_rslt[df_corr_rslt['attr1']!= df_corr_rslt['attr2']].drop_duplicates()
+    .. note::
+        Pearson correlations are computed blockwise as the product of z-scored attributes.
+        Data containing NA values instead use the pairwise-complete :meth:`pandas.DataFrame.corr`.
+    """
+    attrs = df_X.columns
+    X = df_X.to_numpy(dtype=dtype)
+    if np.isnan(X).any():
+        row_idx, col_idx, corr_vals = _corr_pairs_upper(df_X.corr().to_numpy(), corr_thr)
+    else:
+        # Standardize each attribute once. Constant attributes have undefined correlations
+        std = X.std(axis=0)
+        std[std == 0] = np.nan
+        Z = (X - X.mean(axis=0)) / std
+        Z = np.nan_to_num(Z, copy=False)
+        n_samples = Z.shape[0]
+        ls_row, ls_col, ls_corr = list(), list(), list()
+        for i in range(0, Z.shape[1], block_size):
+            for j in range(i, Z.shape[1], block_size):
+                corr_blk = Z[:, i:i+block_size].T @ Z[:, j:j+block_size] / n_samples
+                row_blk, col_blk, corr_vals_blk = _corr_pairs_upper(corr_blk, corr_thr, i, j)
+                ls_row.append(row_blk)
+                ls_col.append(col_blk)
+                ls_corr.append(corr_vals_blk)
+        row_idx = np.concatenate(ls_row) if ls_row else np.array([], dtype=int)
+        col_idx = np.concatenate(ls_col) if ls_col else np.array([], dtype=int)
+        corr_vals = np.concatenate(ls_corr) if ls_corr else np.array([], dtype=dtype)
+    df_corr_rslt = pd.DataFrame({'attr1': attrs[row_idx],
+                                 'attr2': attrs[col_idx],
+                                 'corr': corr_vals})
     return df_corr_rslt
 
 def write_corr_attrs_thr(df_corr_rslt:pd.DataFrame,path_corr_attrs: str | os.PathLike):
@@ -1322,7 +2970,8 @@ def write_corr_attrs_thr(df_corr_rslt:pd.DataFrame,path_corr_attrs: str | os.Pat
     print("The user may now inspect the correlated attributes and make decisions on which ones to exclude")
 
 def corr_thr_write_table_wrap(df_X:pd.DataFrame,dir_out_anlys_base:str|os.PathLike,
-                              ds:str,corr_thr:float=0.8)->pd.DataFrame:
+                              ds:str,corr_thr:float=0.8,
+                              block_size:int=1000, dtype=np.float64)->pd.DataFrame:
     """Wrapper to generate high correlation pairings table above an absolute threshold of interest and write to file
     
     :param df_X: The attribute dataset
@@ -1333,19 +2982,48 @@ def corr_thr_write_table_wrap(df_X:pd.DataFrame,dir_out_anlys_base:str|os.PathLi
     :type ds: str
     :param corr_thr: The correlation threshold, between 0 & 1. Absolute values above this detected, defaults to 0.8
     :type corr_thr: float, optional
+    :param block_size: The number of attributes correlated against each other at once. Refer to :func:`corr_attrs_thr_table`
+    :type block_size: int, optional
+    :param dtype: The numeric type of the computation, defaults to np.float64
+    :type dtype: np.dtype, optional
     :return: The table of attribute pairings whose absolute correlations exceed a threshold
     :rtype: pd.DataFrame
     """
     # Generate the paired table of attributes correlated above an absolute threshold
-    df_corr_rslt = corr_attrs_thr_table(df_X,corr_thr)
+    df_corr_rslt = corr_attrs_thr_table(df_X,corr_thr, block_size=block_size, dtype=dtype)
     path_corr_attrs_cstm = std_corr_path(dir_out_anlys_base=dir_out_anlys_base,
                                           ds=ds,
                                          cstm_str=f'thr{corr_thr}') 
     write_corr_attrs_thr(df_corr_rslt,path_corr_attrs_cstm)
     return df_corr_rslt
 #%% PRINCIPAL COMPONENT ANALYSIS
+def _trunc_pca_var_thr(pca: PCA | IncrementalPCA, var_thr: float | None = None) -> PCA | IncrementalPCA:
+    """Truncate a fitted PCA to the fewest principal components reaching a cumulative explained variance
+
+    :param pca: The fitted principal components analysis object
+    :type pca: PCA | IncrementalPCA
+    :param var_thr: The target cumulative proportion of variance explained, between 0 & 1. 
+        Defaults to None, meaning no truncation.
+    :type var_thr: float, optional
+    :return: The principal components analysis object, truncated in place
+    :rtype: PCA | IncrementalPCA
+    """
+    if var_thr is None:
+        return pca
+    cum_var = np.cumsum(pca.explained_variance_ratio_)
+    n_keep = min(int(np.searchsorted(cum_var, var_thr) + 1), len(cum_var))
+    for attr in ['components_', 'explained_variance_', 'explained_variance_ratio_', 'singular_values_']:
+        setattr(pca, attr, getattr(pca, attr)[:n_keep])
+    pca.n_components_ = n_keep
+    return pca
+
 def pca_stdscaled_tfrm(df_X:pd.DataFrame, 
-                       std_scale:bool=True
+                       std_scale:bool=True,
+                       pca_type:str='full',
+                       var_thr:float=None,
+                       n_components:int=None,
+                       batch_size:int=None,
+                       random_state:int=None
                        )->PCA:
     """Generate the PCA object, and perform a standardized scaler transformation if desired
 
@@ -1353,6 +3031,23 @@ def pca_stdscaled_tfrm(df_X:pd.DataFrame,
     :type df_X: pd.DataFrame
     :param std_scale: Should the data be standard scaled?, defaults to True
     :type std_scale: bool, optional
+    :param pca_type: The PCA approach, defaults to 'full'. Options include:
+        - 'full': :class:`sklearn.decomposition.PCA` computing every component
+        - 'randomized': :class:`sklearn.decomposition.PCA` with a randomized SVD, computing only 
+          `n_components`, which doubles until `var_thr` is reached
+        - 'incremental': :class:`sklearn.decomposition.IncrementalPCA`, fitting `batch_size` rows at a time
+    :type pca_type: str, optional
+    :param var_thr: The target cumulative proportion of variance explained, between 0 & 1. 
+        Components beyond this target are dropped. Defaults to None, meaning all computed components are retained.
+    :type var_thr: float, optional
+    :param n_components: The (initial) number of components for 'randomized' and 'incremental'.
+        Defaults to None, meaning 10 for 'randomized' and all components for 'incremental'
+    :type n_components: int, optional
+    :param batch_size: The number of rows per 'incremental' batch, defaults to None for 5 x the number of attributes
+    :type batch_size: int, optional
+    :param random_state: The random seed for 'randomized', defaults to None
+    :type random_state: int, optional
+    :raises ValueError: When an unrecognized `pca_type` is provided
     :return: The principal components analysis object
     :rtype: PCA
     """
@@ -1363,11 +3058,28 @@ def pca_stdscaled_tfrm(df_X:pd.DataFrame,
         df_X_scaled = pd.DataFrame(scaler.transform(df_X), index=df_X.index.values, columns=df_X.columns.values)
     else:
         df_X_scaled = df_X.copy()
-    pca_scaled = PCA()
-    pca_scaled.fit(df_X_scaled)
+
+    max_components = min(df_X_scaled.shape)
+    if pca_type == 'full':
+        pca_scaled = PCA()
+        pca_scaled.fit(df_X_scaled)
+    elif pca_type == 'randomized':
+        n_cpts = min(n_components if n_components else 10, max_components)
+        while True:
+            pca_scaled = PCA(n_components=n_cpts, svd_solver='randomized', random_state=random_state)
+            pca_scaled.fit(df_X_scaled)
+            if var_thr is None or n_cpts >= max_components or \
+                np.sum(pca_scaled.explained_variance_ratio_) >= var_thr:
+                break
+            n_cpts = min(2*n_cpts, max_components)
+    elif pca_type == 'incremental':
+        pca_scaled = IncrementalPCA(n_components=n_components, batch_size=batch_size)
+        pca_scaled.fit(df_X_scaled)
+    else:
+        raise ValueError(f"Unrecognized pca_type: {pca_type}")
     #cpts_scaled = pd.DataFrame(pca.transform(df_X_scaled))
 
-    return pca_scaled
+    return _trunc_pca_var_thr(pca_scaled, var_thr)
 
 def plot_pca_stdscaled_tfrm(pca_scaled:PCA, 
                             title:str = 'Explained Variance Ratio by Principal Component',
@@ -1463,7 +3175,8 @@ def std_pca_plot_path(dir_out_viz_base: str|os.PathLike,
 def plot_pca_save_wrap(df_X:pd.DataFrame, 
                         dir_out_viz_base:str|os.PathLike,
                         ds:str, 
-                        std_scale:bool=True)->PCA:
+                        std_scale:bool=True,
+                        pca_config:dict=None)->PCA:
     """Wrapper function to generate PCA plots on dataset
 
     :param df_X: The attribute dataset of interest
@@ -1474,14 +3187,39 @@ def plot_pca_save_wrap(df_X:pd.DataFrame,
     :type ds: str
     :param std_scale: Should dataset be standardized using StandardScaler, defaults to True
     :type std_scale: bool, optional
+    :param pca_config: The PCA options `pca_type`, `var_thr`, `n_components`, `batch_size`, and `random_state`.
+        Refer to :func:`pca_stdscaled_tfrm`. Defaults to None, meaning a full PCA.
+    :type pca_config: dict, optional
     :return: The principal components analysis object
     :rtype: PCA
     """
+    pca_config = pca_config if pca_config else dict()
+    pca_scaled = pca_stdscaled_tfrm(df_X,std_scale,
+                                    pca_type=pca_config.get('pca_type','full'),
+                                    var_thr=pca_config.get('var_thr',None),
+                                    n_components=pca_config.get('n_components',None),
+                                    batch_size=pca_config.get('batch_size',None),
+                                    random_state=pca_config.get('random_state',None))
+    _save_pca_plots(pca_scaled, dir_out_viz_base, ds, std_scale=std_scale)
+    return pca_scaled
+
+def _save_pca_plots(pca_scaled: PCA, dir_out_viz_base: str|os.PathLike,
+                    ds: str, std_scale: bool = True):
+    """Save the PCA explained variance ratio & cumulative variance plots
+
+    :param pca_scaled: The PCA object, or any object with `n_components_` & `explained_variance_ratio_`
+    :type pca_scaled: PCA
+    :param dir_out_viz_base: Standardized output directory for visualization
+    :type dir_out_viz_base: str | os.PathLike
+    :param ds: The dataset name
+    :type ds: str
+    :param std_scale: Was the dataset standardized using StandardScaler, defaults to True
+    :type std_scale: bool, optional
+    """
     # CREATE THE EXPLAINED VARIANCE RATIO PLOT
     cstm_str = ''
     if std_scale:
         cstm_str = 'std_scaled'
-    pca_scaled = pca_stdscaled_tfrm(df_X,std_scale)
     fig_pca_stdscale = plot_pca_stdscaled_tfrm(pca_scaled)
     path_pca_stdscaled_fig = std_pca_plot_path(dir_out_viz_base,ds,cstm_str=cstm_str)
     fig_pca_stdscale.savefig(path_pca_stdscaled_fig)
@@ -1498,7 +3236,6 @@ def plot_pca_save_wrap(df_X:pd.DataFrame,
     print(f"Wrote the {ds} PCA cumulative variance explained plot to\n{path_pca_stdscaled_cum_fig}")
     plt.clf()
     plt.close()
-    return None
 
 # %% RANDOM-FOREST FEATURE IMPORTANCE
 def _extr_rf_algo(train_eval:AlgoTrainEval)->RandomForestRegressor:
@@ -1598,6 +3335,26 @@ def std_lc_plot_path(dir_out_viz_base: str|os.PathLike,
     path_lc_plot.parent.mkdir(parents=True,exist_ok=True)
     return path_lc_plot
 
+def std_lc_cache_path(dir_out_viz_base: str|os.PathLike,
+                      ds:str, metr:str, algo_str:str
+                      ) -> pathlib.PosixPath:
+    """Standardize the filepath of the cached learning curve scores
+
+    :param dir_out_viz_base: The base directory for saving plots
+    :type dir_out_viz_base: str | os.PathLike
+    :param ds: The unique dataset name
+    :type ds: str
+    :param metr: The metric or hydrologic signature identifier of interest
+    :type metr: str
+    :param algo_str: The algorithm type, e.g. 'rf', 'mlp'
+    :type algo_str: str
+    :return: The path to the learning curve scores .npz file
+    :rtype: pathlib.PosixPath
+    """
+    path_lc_cache = Path(f"{dir_out_viz_base}/{ds}/lc_cache/learning_curve_{ds}_{metr}_{algo_str}.npz")
+    path_lc_cache.parent.mkdir(parents=True,exist_ok=True)
+    return path_lc_cache
+
 class AlgoEvalPlotLC:
     def __init__(self,X,y):
         # The entire dataset of predictors/response    
@@ -1609,18 +3366,80 @@ class AlgoEvalPlotLC:
         self.train_scores_lc = np.empty(1)
         self.valid_scores_lc = np.empty(1)
 
+        # The K-fold indices, shared by every algorithm's learning curve
+        self.cv_splits = dict()
+
+    def _get_cv_splits(self, cv: int) -> list:
+        """Generate the K-fold train/validation indices once, and reuse them for every algorithm
+
+        :param cv: The number of folds in a K-fold cross validation
+        :type cv: int
+        :return: The (train, validation) index arrays of each fold
+        :rtype: list
+        """
+        if cv not in self.cv_splits:
+            self.cv_splits[cv] = list(KFold(n_splits=cv).split(self.X, self.y))
+        return self.cv_splits[cv]
 
     def gen_learning_curve(self,model, cv = 5,n_jobs=-1,
                             train_sizes =np.linspace(0.1, 1.0, 10),
-                            scoring = 'neg_mean_squared_error'
+                            scoring = 'neg_mean_squared_error',
+                            path_cache: str | os.PathLike = None,
+                            exploit_incremental_learning: bool = False
                             ):
-        
+        """Generate the learning curve scores, reusing cached scores when available
+
+        :param model: The trained algorithm or pipeline. When a hyperparameter search object
+            is provided, the learning curve is generated for its best estimator.
+        :type model: sklearn.base.BaseEstimator
+        :param cv: The number of folds in a K-fold cross validation, defaults to 5
+        :type cv: int, optional
+        :param n_jobs: The number of parallel jobs, defaults to -1
+        :type n_jobs: int, optional
+        :param train_sizes: Relative or absolute numbers of training examples, defaults to np.linspace(0.1, 1.0, 10)
+        :type train_sizes: array-like, optional
+        :param scoring: A str or a scorer callable object/function, defaults to 'neg_mean_squared_error'
+        :type scoring: str, optional
+        :param path_cache: The .npz file of cached scores. Defaults to None, meaning no caching.
+            Refer to :func:`std_lc_cache_path`
+        :type path_cache: str | os.PathLike, optional
+        :param exploit_incremental_learning: Should estimators that implement `partial_fit` grow the
+            training size incrementally rather than refitting each size? Defaults to False.
+            Incremental scores differ from refitted scores, e.g. an MLP's early stopping is not applied.
+        :type exploit_incremental_learning: bool, optional
+
+        .. note::
+            The cached scores are reused only when the model configuration, data, folds,
+            train sizes, scoring, and incremental learning all match.
+        """
+        # Refitting a hyperparameter search for each fold & train size is unnecessary
+        model = getattr(model, 'best_estimator_', model)
+        cv_splits = self._get_cv_splits(cv)
+        incremental = exploit_incremental_learning and hasattr(model, 'partial_fit')
+
+        lc_key = joblib.hash((clone(model), self.X, self.y, cv_splits,
+                              np.asarray(train_sizes), scoring, incremental))
+        if path_cache is not None and Path(path_cache).exists():
+            with np.load(path_cache) as lc_cache:
+                if str(lc_cache['key']) == lc_key:
+                    self.train_sizes_lc = lc_cache['train_sizes']
+                    self.train_scores_lc = lc_cache['train_scores']
+                    self.valid_scores_lc = lc_cache['valid_scores']
+                    self._summarize_learning_curve()
+                    return
+
         # Generate learning curve data
         self.train_sizes_lc, self.train_scores_lc, self.valid_scores_lc = learning_curve(
-            model, self.X, self.y, cv=cv, n_jobs=n_jobs, train_sizes=train_sizes, 
-            scoring=scoring
+            model, self.X, self.y, cv=cv_splits, n_jobs=n_jobs, train_sizes=train_sizes, 
+            scoring=scoring, exploit_incremental_learning=incremental
         )
+        if path_cache is not None:
+            np.savez(path_cache, key=lc_key, train_sizes=self.train_sizes_lc,
+                     train_scores=self.train_scores_lc, valid_scores=self.valid_scores_lc)
+        self._summarize_learning_curve()
 
+    def _summarize_learning_curve(self):
+        """Calculate the mean and standard deviation of the learning curve scores"""
         # Calculate mean and standard deviation
         self.train_mean_lc = np.mean(-self.train_scores_lc, axis=1)  # Negate to get positive MSE
         self.train_std_lc = np.std(-self.train_scores_lc, axis=1)
@@ -1663,7 +3482,10 @@ def plot_learning_curve_save_wrap(algo_plot:AlgoEvalPlotLC, train_eval:AlgoTrain
                             train_sizes = np.linspace(0.1, 1.0, 10),
                             scoring:str = 'neg_mean_squared_error',
                             ylabel_scoring:str = "Mean Squared Error (MSE)",
-                            training_uncn:bool = False
+                            training_uncn:bool = False,
+                            blas_threads:int = None,
+                            use_cache:bool = True,
+                            exploit_incremental_learning:bool = False
                             ):
     """Wrapper to generate & write learning curve plots forsklearn ML algorithms
 
@@ -1688,6 +3510,14 @@ def plot_learning_curve_save_wrap(algo_plot:AlgoEvalPlotLC, train_eval:AlgoTrain
     :type ylabel_scoring: str, optional
     :param training_uncn: Should training uncertainty be represented as a shaded object?, defaults to False
     :type training_uncn: bool, optional
+    :param blas_threads: The maximum number of BLAS/OpenMP threads, defaults to None for no limit.
+    :type blas_threads: int, optional
+    :param use_cache: Should learning curve scores be cached & reused? Defaults to True.
+        Refer to :func:`std_lc_cache_path`
+    :type use_cache: bool, optional
+    :param exploit_incremental_learning: Should estimators that implement `partial_fit` grow the
+        training size incrementally? Defaults to False. Refer to :meth:`AlgoEvalPlotLC.gen_learning_curve`
+    :type exploit_incremental_learning: bool, optional
 
     """
     algs_dict = train_eval.algs_dict
@@ -1704,8 +3534,12 @@ def plot_learning_curve_save_wrap(algo_plot:AlgoEvalPlotLC, train_eval:AlgoTrain
         algo_str = f'{algo_str}' # Custom filepath string (e.g. 'rf', 'mlp')
         
         # Generate learning curve data
-        algo_plot.gen_learning_curve(model=best_algo, cv=cv,n_jobs=n_jobs,
-                            train_sizes =train_sizes,scoring=scoring)
+        path_lc_cache = std_lc_cache_path(dir_out_viz_base, ds, metr, algo_str) if use_cache else None
+        with _blas_limits(blas_threads):
+            algo_plot.gen_learning_curve(model=best_algo, cv=cv,n_jobs=n_jobs,
+                                train_sizes =train_sizes,scoring=scoring,
+                                path_cache=path_lc_cache,
+                                exploit_incremental_learning=exploit_incremental_learning)
         # Create learning curve figure
         fig_lc = algo_plot.plot_learning_curve(ylabel_scoring=ylabel_scoring,
                             title=cstm_title,training_uncn=training_uncn)
@@ -1850,9 +3684,30 @@ def std_map_pred_path(dir_out_viz_base:str|os.PathLike, ds:str,
     path_pred_map_plot.parent.mkdir(parents=True,exist_ok=True)
     return path_pred_map_plot
 
+# The CONUS basemaps already loaded in this process, keyed by the cached basemap filepath
+_BASEMAP_MEMO = dict()
+
+def std_basemap_cache_path(dir_out_basemap: str | os.PathLike, fn_basemap: str,
+                           simplify_tol: float | None = None) -> pathlib.PosixPath:
+    """Standardize the filepath of the preprocessed basemap GeoParquet file
+
+    :param dir_out_basemap: The standard directory for saving the CONUS basemap
+    :type dir_out_basemap: str | os.PathLike
+    :param fn_basemap: The filename of the basemap shapefile, e.g. 'cb_2018_us_state_500k.shp'
+    :type fn_basemap: str
+    :param simplify_tol: The geometry simplification tolerance in degrees, defaults to None
+    :type simplify_tol: float, optional
+    :return: The filepath of the reprojected (and simplified) basemap
+    :rtype: pathlib.PosixPath
+    """
+    cstm_str = f'_simplify{simplify_tol}' if simplify_tol else ''
+    return Path(dir_out_basemap)/f'{Path(fn_basemap).stem}_epsg4326{cstm_str}.parquet'
+
 def gen_conus_basemap(dir_out_basemap:str | os.PathLike, # This should be the data_visualizations directory
                     url:str = 'https://www2.census.gov/geo/tiger/GENZ2018/shp/cb_2018_us_state_500k.zip',
-                    fn_basemap:str='cb_2018_us_state_500k.shp') -> gpd.geodataframe.GeoDataFrame:
+                    fn_basemap:str='cb_2018_us_state_500k.shp',
+                    simplify_tol:float = 0.005,
+                    path_local:str | os.PathLike = None) -> gpd.geodataframe.GeoDataFrame:
     """Retrieve the basemap for CONUS
 
     :param dir_out_basemap: The standard directory for saving the CONUS basemap
@@ -1861,23 +3716,51 @@ def gen_conus_basemap(dir_out_basemap:str | os.PathLike, # This should be the da
     :type url: str
     :param fn_basemap: The filename to use for saving basemap, defaults to 'cb_2018_us_state_500k.shp'
     :type fn_basemap: str, optional
+    :param simplify_tol: The geometry simplification tolerance in degrees, defaults to 0.005.
+        None preserves the original geometries.
+    :type simplify_tol: float, optional
+    :param path_local: A local copy of the basemap .zip or shapefile, used instead of downloading from `url`.
+        Defaults to None.
+    :type path_local: str | os.PathLike, optional
     :return: The geopandas dataframe of the basemap
     :rtype: gpd.geodataframe.GeoDataFrame
-    """
-    url = 'https://www2.census.gov/geo/tiger/GENZ2018/shp/cb_2018_us_state_500k.zip'
-    path_zip_basemap = f'{dir_out_basemap}/cb_2018_us_state_500k.zip'
-    path_shp_basemap = f'{dir_out_basemap}/{fn_basemap}'
-
-    if not Path(path_zip_basemap).exists():
-        print('Downloading shapefile...')
-        urllib.request.urlretrieve(url, path_zip_basemap)
-    if not Path(path_shp_basemap).exists():
-        with zipfile.ZipFile(path_zip_basemap, 'r') as zip_ref:
-            zip_ref.extractall(f'{path_shp_basemap}')
 
-    states = gpd.read_file(path_shp_basemap)
-    states = states.to_crs("EPSG:4326")
-    return states
+    .. note::
+        The first call reprojects the basemap to EPSG:4326, simplifies it, and writes it to 
+        a GeoParquet file (refer to :func:`std_basemap_cache_path`). Subsequent calls read that file,
+        and calls within the same process reuse the basemap kept in memory. Once the GeoParquet
+        file exists, no download is needed.
+    """
+    path_cache_basemap = std_basemap_cache_path(dir_out_basemap, fn_basemap, simplify_tol)
+    key_memo = str(path_cache_basemap.resolve())
+    if key_memo in _BASEMAP_MEMO:
+        return _BASEMAP_MEMO[key_memo].copy()
+
+    if not path_cache_basemap.exists():
+        Path(dir_out_basemap).mkdir(parents=True, exist_ok=True)
+        if path_local is not None and Path(path_local).suffix != '.zip':
+            path_shp_basemap = path_local
+        else:
+            path_zip_basemap = path_local if path_local is not None \
+                else f'{dir_out_basemap}/{Path(urllib.parse.urlparse(url).path).name}'
+            path_shp_basemap = f'{dir_out_basemap}/{fn_basemap}'
+
+            if not Path(path_zip_basemap).exists():
+                print('Downloading shapefile...')
+                urllib.request.urlretrieve(url, path_zip_basemap)
+            if not Path(path_shp_basemap).exists():
+                with zipfile.ZipFile(path_zip_basemap, 'r') as zip_ref:
+                    zip_ref.extractall(f'{path_shp_basemap}')
+
+        states = gpd.read_file(path_shp_basemap)
+        states = states.to_crs("EPSG:4326")
+        if simplify_tol:
+            states['geometry'] = states.geometry.simplify(simplify_tol, preserve_topology=True)
+        states.to_parquet(path_cache_basemap)
+    else:
+        states = gpd.read_parquet(path_cache_basemap)
+    _BASEMAP_MEMO[key_memo] = states
+    return states.copy()
     
 def plot_map_pred(geo_df:gpd.GeoDataFrame, states,title:str,metr:str,
                   colname_data:str='performance'):
@@ -1922,7 +3805,8 @@ def plot_map_pred(geo_df:gpd.GeoDataFrame, states,title:str,metr:str,
 def plot_map_pred_wrap(test_gdf,dir_out_viz_base, ds,
                       metr,algo_str,
                       split_type='test',
-                      colname_data='performance'):
+                      colname_data='performance',
+                      title=None):
 
     path_pred_map_plot = std_map_pred_path(dir_out_viz_base,ds,metr,algo_str,split_type)
     dir_out_basemap = path_pred_map_plot.parent.parent
@@ -1932,7 +3816,7 @@ def plot_map_pred_wrap(test_gdf,dir_out_viz_base, ds,
     test_gdf = test_gdf.to_crs(4326)
 
     # Generate the map
-    plot_title = f"Predicted Values: {metr} - {ds}"
+    plot_title = title if title else f"Predicted Values: {metr} - {ds}"
     plot_pred_map = plot_map_pred(geo_df=test_gdf, states=states,title=plot_title,
                                   metr=metr,colname_data=colname_data)
 
@@ -2017,3 +3901,256 @@ def plot_best_algo_wrap(geo_df, dir_out_viz_base,subdir_anlys, metr,comparison_c
 
     plt.clf()
     plt.close()
+
+# %% PLOT RENDERING QUEUE
+def _render_corr_mat(df_corr: pd.DataFrame, title: str,
+                     dir_out_viz_base: str | os.PathLike, ds: str, max_attrs: int = 50):
+    """Render the dataset correlation matrix plot from the correlation matrix
+
+    :param df_corr: The correlation matrix generated by :func:`corr_mat_plot_df`
+    :type df_corr: pd.DataFrame
+    :param title: Title to place in the correlation matrix plot
+    :type title: str
+    :param dir_out_viz_base: The base directory for saving plots
+    :type dir_out_viz_base: str | os.PathLike
+    :param ds: The unique dataset name
+    :type ds: str
+    :param max_attrs: Refer to :func:`_plot_corr_df`, defaults to 50
+    :type max_attrs: int, optional
+    """
+    fig_corr_mat = _plot_corr_df(df_corr, title=title, max_attrs=max_attrs)
+    _save_corr_mat_plot(fig_corr_mat, dir_out_viz_base, ds)
+
+def _render_pca(explained_variance_ratio: np.ndarray, dir_out_viz_base: str | os.PathLike,
+                ds: str, std_scale: bool = True):
+    """Render the PCA plots from the explained variance ratio of each component
+
+    :param explained_variance_ratio: The fitted PCA's `explained_variance_ratio_`,
+        e.g. from :func:`pca_stdscaled_tfrm`
+    :type explained_variance_ratio: np.ndarray
+    :param dir_out_viz_base: The base directory for saving plots
+    :type dir_out_viz_base: str | os.PathLike
+    :param ds: The unique dataset name
+    :type ds: str
+    :param std_scale: Was the dataset standardized using StandardScaler, defaults to True
+    :type std_scale: bool, optional
+    """
+    # The minimal subset of the PCA object used by the PCA plots
+    pca_scaled = SimpleNamespace(explained_variance_ratio_=np.asarray(explained_variance_ratio),
+                                 n_components_=len(explained_variance_ratio))
+    _save_pca_plots(pca_scaled, dir_out_viz_base, ds, std_scale=std_scale)
+
+def _render_feat_imp(feat_imprt: np.ndarray, attrs: Iterable[str],
+                     dir_out_viz_base: str | os.PathLike, ds: str, metr: str):
+    """Render the random forest feature importance plot from the importance values
+
+    :param feat_imprt: The random forest's `feature_importances_`
+    :type feat_imprt: np.ndarray
+    :param attrs: The attribute names corresponding to `feat_imprt`
+    :type attrs: Iterable[str]
+    :param dir_out_viz_base: The base directory for saving plots
+    :type dir_out_viz_base: str | os.PathLike
+    :param ds: The unique dataset name
+    :type ds: str
+    :param metr: The metric or hydrologic signature identifier of interest
+    :type metr: str
+    """
+    title_rf_imp = f"Random Forest feature importance of {metr}: {ds}"
+    fig_feat_imp = plot_rf_importance(feat_imprt, attrs=attrs, title= title_rf_imp)
+    path_fig_imp = std_feat_imp_plot_path(dir_out_viz_base, ds,metr)
+    fig_feat_imp.savefig(path_fig_imp)
+    print(f"Wrote feature importance plot to {path_fig_imp}")
+
+def _render_learning_curves(X: pd.DataFrame, y: pd.Series, dict_algos: dict,
+                            dir_out_viz_base: str | os.PathLike, ds: str, **kwargs):
+    """Render the learning curves of trained algorithms that were saved to file
+
+    :param X: The full predictor matrix
+    :type X: pd.DataFrame
+    :param y: The full response variable values
+    :type y: pd.Series
+    :param dict_algos: Keys are the algorithm type (e.g. 'rf'), values are dicts of the
+        saved algorithm filepath ('path_algo'), 'metric', and 'type'
+    :type dict_algos: dict
+    :param dir_out_viz_base: The base directory for saving plots
+    :type dir_out_viz_base: str | os.PathLike
+    :param ds: The unique dataset name
+    :type ds: str
+    :param kwargs: Keyword arguments passed to :func:`plot_learning_curve_save_wrap`
+    """
+    # The minimal subset of AlgoTrainEval used by plot_learning_curve_save_wrap
+    train_eval = SimpleNamespace(
+        algs_dict={k: {'pipeline': joblib.load(v['path_algo'])} for k, v in dict_algos.items()},
+        eval_dict={k: {'metric': v['metric'], 'type': v['type']} for k, v in dict_algos.items()})
+    plot_learning_curve_save_wrap(AlgoEvalPlotLC(X, y), train_eval,
+                                  dir_out_viz_base=dir_out_viz_base, ds=ds, **kwargs)
+
+# The plot job types and the functions that render them
+_PLOT_RENDERERS = {'corr_mat': _render_corr_mat,
+                   'pca': _render_pca,
+                   'feat_imp': _render_feat_imp,
+                   'learning_curve': _render_learning_curves,
+                   'pred_vs_obs': plot_pred_vs_obs_wrap,
+                   'map_pred': plot_map_pred_wrap}
+
+def std_plot_payload_dir(dir_out_viz_base: str | os.PathLike) -> pathlib.PosixPath:
+    """Standardize the directory of saved plot job payloads
+
+    :param dir_out_viz_base: The base directory for saving plots
+    :type dir_out_viz_base: str | os.PathLike
+    :return: The directory containing the plot payload .joblib files
+    :rtype: pathlib.PosixPath
+    """
+    dir_payloads = Path(dir_out_viz_base)/'plot_payloads'
+    dir_payloads.mkdir(parents=True, exist_ok=True)
+    return dir_payloads
+
+def _init_plot_worker():
+    """Use the non-interactive Agg backend inside plot rendering processes"""
+    matplotlib.use('Agg')
+
+def render_plot_payload(path_payload: str | os.PathLike, style_path: str | os.PathLike = None) -> str:
+    """Render the plot described by a saved plot payload
+
+    :param path_payload: The plot payload filepath written by :meth:`PlotQueue.submit`
+    :type path_payload: str | os.PathLike
+    :param style_path: The matplotlib style file applied while rendering, defaults to None,
+        meaning the style saved inside the payload, if any
+    :type style_path: str | os.PathLike, optional
+    :raises ValueError: When the payload's plot type is not recognized
+    :return: The plot payload filepath
+    :rtype: str
+    """
+    payload = joblib.load(path_payload)
+    renderer = _PLOT_RENDERERS.get(payload['kind'])
+    if renderer is None:
+        raise ValueError(f"Unrecognized plot type {payload['kind']} inside {path_payload}")
+    style_path = style_path or payload.get('style_path')
+    try:
+        # The style must be applied here, as rendering processes do not inherit the submitting process' style
+        with plt.style.context(style_path if style_path else []):
+            renderer(**payload['kwargs'])
+    finally:
+        plt.close('all')
+    return str(path_payload)
+
+class PlotQueue:
+    def __init__(self, dir_payloads: str | os.PathLike, n_workers: int = 1,
+                 render: bool = True, clear: bool = True,
+                 style_path: str | os.PathLike = None):
+        """Serialize plot jobs as small payloads & render them in a pool of worker processes
+
+        :param dir_payloads: The directory for saving plot payloads. Refer to :func:`std_plot_payload_dir`
+        :type dir_payloads: str | os.PathLike
+        :param n_workers: The number of plot rendering processes, defaults to 1. 
+            0 renders each plot immediately in the current process.
+        :type n_workers: int, optional
+        :param render: Should plots be rendered? Defaults to True. If False, only the payloads are saved
+            and may be rendered later with :func:`render_plot_payloads`.
+        :type render: bool, optional
+        :param clear: Should pre-existing payloads inside `dir_payloads` be removed? Defaults to True.
+        :type clear: bool, optional
+        :param style_path: The matplotlib style file applied when rendering each plot, e.g. RaFTS_theme.mplstyle.
+            Defaults to None for matplotlib's default style. The style is saved inside each payload.
+        :type style_path: str | os.PathLike, optional
+
+        .. note::
+            Worker processes are spawned and use the Agg backend, so the
+            submitting process never waits on matplotlib. Call :meth:`wait`
+            (or use the queue as a context manager) before exiting.
+        """
+        self.dir_payloads = Path(dir_payloads)
+        self.dir_payloads.mkdir(parents=True, exist_ok=True)
+        if clear:
+            for path_payload in self.dir_payloads.glob('*.joblib'):
+                path_payload.unlink()
+        self.n_workers = n_workers
+        self.render = render
+        self.style_path = str(style_path) if style_path else None
+        self.ls_path_payload = list()
+        self._futures = dict()
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wait()
+
+    def submit(self, kind: str, **kwargs) -> pathlib.PosixPath:
+        """Save a plot job payload & queue it for rendering
+
+        :param kind: The plot type, e.g. 'corr_mat', 'pca', 'feat_imp', 'learning_curve', 'pred_vs_obs', 'map_pred'
+        :type kind: str
+        :param kwargs: Keyword arguments of the plot type's rendering function
+        :raises ValueError: When an unrecognized plot type is provided
+        :return: The plot payload filepath
+        :rtype: pathlib.PosixPath
+        """
+        if kind not in _PLOT_RENDERERS:
+            raise ValueError(f"Unrecognized plot type {kind}. Options include {list(_PLOT_RENDERERS.keys())}")
+        path_payload = self.dir_payloads/f'{len(self.ls_path_payload):05d}_{kind}.joblib'
+        joblib.dump({'kind': kind, 'kwargs': kwargs, 'style_path': self.style_path}, path_payload)
+        self.ls_path_payload.append(path_payload)
+        if self.render:
+            self._queue_render(path_payload)
+        return path_payload
+
+    def _queue_render(self, path_payload: str | os.PathLike):
+        """Render a saved plot payload in the worker pool, or immediately when `n_workers` is 0
+
+        :param path_payload: The plot payload filepath
+        :type path_payload: str | os.PathLike
+        """
+        if self.n_workers > 0:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.n_workers,
+                                                     mp_context=multiprocessing.get_context('spawn'),
+                                                     initializer=_init_plot_worker)
+            self._futures[self._executor.submit(render_plot_payload, str(path_payload),
+                                                self.style_path)] = path_payload
+        else:
+            render_plot_payload(path_payload, self.style_path)
+
+    def wait(self) -> list:
+        """Wait for all queued plots to finish rendering
+
+        :return: The payload filepaths of plots that failed to render
+        :rtype: list
+        """
+        ls_failed = list()
+        for future in as_completed(self._futures):
+            try:
+                future.result()
+            except Exception as e:
+                warnings.warn(f"Could not render the plot from {self._futures[future]}: {e}", UserWarning)
+                ls_failed.append(self._futures[future])
+        self._futures = dict()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        return ls_failed
+
+def render_plot_payloads(dir_payloads: str | os.PathLike, n_workers: int = 1,
+                         style_path: str | os.PathLike = None) -> list:
+    """Regenerate all plots from the payloads saved inside a directory, without retraining
+
+    :param dir_payloads: The directory containing plot payloads. Refer to :func:`std_plot_payload_dir`
+    :type dir_payloads: str | os.PathLike
+    :param n_workers: The number of plot rendering processes, defaults to 1
+    :type n_workers: int, optional
+    :param style_path: The matplotlib style file applied when rendering, defaults to None,
+        meaning the style saved inside each payload
+    :type style_path: str | os.PathLike, optional
+    :return: The payload filepaths of plots that failed to render
+    :rtype: list
+    """
+    plot_queue = PlotQueue(dir_payloads, n_workers=n_workers, clear=False, style_path=style_path)
+    ls_failed = list()
+    for path_payload in sorted(Path(dir_payloads).glob('*.joblib')):
+        try:
+            plot_queue._queue_render(path_payload)
+        except Exception as e:
+            warnings.warn(f"Could not render the plot from {path_payload}: {e}", UserWarning)
+            ls_failed.append(path_payload)
+    return ls_failed + plot_queue.wait()
@@ -0,0 +1,34 @@
+"""Attribute store compaction script
+Using the attribute configuration file, compact the per-COMID attribute
+parquet files into a single consolidated attribute store.
+
+Details:
+The per-COMID files written by proc.attr.hydfab and fs_tfrm_attrs.py remain
+the ingest format. The natural step in the workflow is to run this script
+after attributes have been acquired or transformed, and before running
+fs_proc_algo.py or fs_pred_algo.py with `read_type: 'store'`.
+
+Refer to the example config file, e.g.
+`Path(f'{home_dir}/git/formulation-selector/scripts/eval_ingest/xssa/xssa_attr_config.yaml')`
+
+Usage:
+python fs_compact_attrs.py "/path/to/attr_config.yaml"
+"""
+
+import argparse
+import fs_algo.fs_algo_train_eval as fsate
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'compact the attribute parquet files into a consolidated store')
+    parser.add_argument('path_attr_config', type=str, help='Path to the YAML configuration file specific for attribute acquisition')
+    parser.add_argument('--n_buckets', type=int, default=64, help='Number of partitions when creating a new store. Default 64.')
+    parser.add_argument('--row_group_size', type=int, default=50000, help='Maximum rows per parquet row group. Default 50000.')
+    args = parser.parse_args()
+
+    attr_cfig = fsate.AttrConfigAndVars(args.path_attr_config)
+    attr_cfig._read_attr_config()
+    dir_db_attrs = attr_cfig.attrs_cfg_dict.get('dir_db_attrs')
+
+    dir_attr_store = fsate.fs_compact_attr_store(dir_db_attrs=dir_db_attrs,
+                                                 n_buckets=args.n_buckets,
+                                                 row_group_size=args.row_group_size)
@@ -104,9 +104,17 @@ if __name__ == "__main__":
     dir_out = fsate.fs_save_algo_dir_struct(dir_base).get('dir_out')
     dir_out_viz_base = Path(dir_out/Path("data_visualizations"))
 
-    # Enforce style
+    # Enforce style. Applied by each plot rendering process.
     style_path = pkg_resources.resource_filename('fs_algo', 'RaFTS_theme.mplstyle')
-    plt.style.use(style_path)
+
+    # Seed the CONUS basemap cache once, prior to the rendering processes reading it
+    if 'pred_map' in true_keys:
+        fsate.gen_conus_basemap(dir_out_viz_base)
+
+    # Plots are saved as payloads & rendered in separate processes
+    plot_queue = fsate.PlotQueue(fsate.std_plot_payload_dir(dir_out_viz_base),
+                                 n_workers=viz_cfg.get('n_plot_workers',1),
+                                 style_path=style_path)
 
     # Loop through all datasets
     for ds in datasets:
@@ -117,9 +125,8 @@ if __name__ == "__main__":
         for algo in algos:
             # Loop through all metrics
             for metric in metrics:
-                # Pull the predictions
-                path_pred = fsate.std_pred_path(dir_out,algo=algo,metric=metric,dataset_id=ds)
-                pred = pd.read_parquet(path_pred)
+                # Pull the predictions from the partitioned prediction dataset (or the individual prediction file)
+                pred = fsate.read_pred_dataset(dir_out, ds=ds, metric=metric, algo=algo)
                 data = pd.merge(meta_pred, pred, how = 'inner', on = 'comid')
                 Path(f'{dir_out}/data_visualizations').mkdir(parents=True, exist_ok=True)
                 # If you want to export the merged data for any reason: 
@@ -127,8 +134,6 @@ if __name__ == "__main__":
 
                 # Does the user want a scatter plot comparing the observed module performance and the predicted module performance by RaFTS?
                 if 'pred_map' in true_keys:
-                    states = fsate.gen_conus_basemap(f'{dir_out}/data_visualizations/')
-
                     # Plot performance on map
                     lat = data['Y']
                     lon = data['X']
@@ -137,17 +142,10 @@ if __name__ == "__main__":
                     geo_df['performance'] = data['prediction'].values
                     geo_df.crs = ("EPSG:4326")
 
-                    fsate.plot_map_pred(geo_df=geo_df, states=states, 
-                                        title=f'RaFTS Predicted Performance Map: {ds}', 
-                                        metr=metric, colname_data='performance')
-
-                    # Save the plot as a .png file
-                    output_path = fsate.std_map_pred_path(dir_out_viz_base=dir_out_viz_base,
-                                                          ds=ds, metr=metric, algo_str=algo,
-                                                          split_type='prediction')
-                    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-                    plt.clf()
-                    plt.close()
+                    plot_queue.submit('map_pred', test_gdf=geo_df, dir_out_viz_base=dir_out_viz_base,
+                                      ds=ds, metr=metric, algo_str=algo,
+                                      split_type='prediction', colname_data='performance',
+                                      title=f'RaFTS Predicted Performance Map: {ds}')
                     
                     
                 if 'obs_vs_sim_scatter' in true_keys:
@@ -158,14 +156,15 @@ if __name__ == "__main__":
 
                     # Read in the observed performance data
                     path_obs_perf = f'{dir_std_base}/{ds}/{ds}_{formulation_id}.{save_type_obs}'
-                    obs = xr.open_dataset(path_obs_perf, engine=engine)
+                    dat_obs = xr.open_dataset(path_obs_perf, engine=engine)
                     # NOTE: Below is one option, but it assumes there is only one possible .nc or .zarr file to read in (it only reads the first one it finds with that file extension)
-                    # obs = fsate._open_response_data_fs(dir_std_base=dir_std_base, ds=ds)
-                    obs = obs.to_dataframe()
+                    # dat_obs = fsate._open_response_data_fs(dir_std_base=dir_std_base, ds=ds)
+                    # Only load the metric of interest
+                    arrs_obs = fsate.sel_response_arrays(dat_obs, metrics=[metric])
+                    dat_obs.close()
 
                     # Standardize column names
-                    obs.reset_index(inplace=True)
-                    obs = obs.rename(columns={"gage_id": "identifier"})
+                    obs = pd.DataFrame({'identifier': arrs_obs['gage_id'], metric: arrs_obs[metric]})
 
                     # Subset columns
                     data = data[['identifier', 'comid', 'X', 'Y', 'prediction', 'metric', 'dataset']]
@@ -177,14 +176,10 @@ if __name__ == "__main__":
                     data = pd.merge(data, obs, how = 'inner', on = 'identifier')
 
                     # Plot the observed vs. predicted module performance
-                    fsate.plot_pred_vs_obs_regr(y_pred=data['prediction'], y_obs=data[metric], 
-                                                ds = ds, metr=metric)
-
-                    # Save the plot as a .png file
-                    output_path = fsate.std_regr_pred_obs_path(dir_out_viz_base=dir_out_viz_base,
-                                                               ds=ds, metr=metric, algo_str=algo,
-                                                            split_type='prediction')
-                    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-                    plt.clf()
-                    plt.close()
+                    plot_queue.submit('pred_vs_obs', y_pred=data['prediction'].values, y_obs=data[metric].values,
+                                      dir_out_viz_base=dir_out_viz_base, ds=ds, metr=metric,
+                                      algo_str=algo, split_type='prediction')
                 
+
+    # Wait for the remaining plots to finish rendering
+    plot_queue.wait()
@@ -1,6 +1,5 @@
 import argparse
 import yaml
-import joblib
 import fs_algo.fs_algo_train_eval as fsate
 import pandas as pd
 from pathlib import Path
@@ -52,8 +51,14 @@ if __name__ == "__main__":
     #%% prediction config
     resp_vars = pred_cfg.get('algo_response_vars')
     algos = pred_cfg.get('algo_type')
-
-
+    read_type = pred_cfg.get('read_type','all') # Arg for how to read attribute data using comids in fs_read_attr_comid(). May be 'all', 'filename', or 'store'.
+    chunk_size = pred_cfg.get('chunk_size',100000) # The maximum number of locations predicted at once
+    mmap_mode = pred_cfg.get('mmap_mode','r') # Memory-map the trained pipelines' arrays when loading. None reads fully into memory
+    model_cache = fsate.AlgoModelCache(maxsize=pred_cfg.get('model_cache_size',8), mmap_mode=mmap_mode)
+    uncertainty_config = pred_cfg.get('uncertainty_config',None) # The random forest prediction uncertainty options. None skips the uncertainty.
+    compute_cfg = pred_cfg.get('compute_config',None) or dict() # The compute resource budget
+    budget = fsate.compute_budget(n_cores=compute_cfg.get('n_cores',-1),
+                                  blas_threads=compute_cfg.get('blas_threads',1))
 
     #%% Run prediction
     for ds in datasets:
@@ -63,40 +68,15 @@ if __name__ == "__main__":
 
         comids_pred = fsate._read_pred_comid(path_pred_locs, comid_pred_col )
 
-        #%%  Read in predictor variable data (aka basin attributes) 
-        # Read the predictor variable data (basin attributes) generated by proc.attr.hydfab
-        df_attr = fsate.fs_read_attr_comid(dir_db_attrs, comids_pred, attrs_sel = attrs_sel,
-                                        _s3 = None,storage_options=None)
-        # Convert into wide format for model training
-        df_attr_wide = df_attr.pivot(index='featureID', columns = 'attribute', values = 'value')
-
-        # Run predictions & save output
+        # Run predictions in chunks of locations & save output to the partitioned prediction dataset
         dir_out_alg_ds = Path(dir_out_alg_base/Path(ds))
         print(f"PREDICTING algorithm for {ds}")
-        for metric in resp_vars:
-            for algo in algos:
-                path_algo = fsate.std_algo_path(dir_out_alg_ds, algo=algo, metric=metric, dataset_id=ds)
-                if not Path(path_algo).exists():
-                    raise FileNotFoundError(f"The following algorithm path does not exist: \n{path_algo}")
-
-
-                # Read in the algorithm's pipeline
-                pipe = joblib.load(path_algo)
-                feat_names = list(pipe.feature_names_in_)
-                df_attr_sub = df_attr_wide[feat_names]
-
-                # Perform prediction
-                resp_pred = pipe.predict(df_attr_sub)
-
-                # compile prediction results:
-                df_pred =pd.DataFrame({'comid':comids_pred,
-                             'prediction':resp_pred,
-                             'metric':metric,
-                             'dataset':ds,
-                             'algo':algo,
-                             'name_algo':Path(path_algo).name})
-                
-                path_pred_out = fsate.std_pred_path(dir_out,algo=algo,metric=metric,dataset_id=ds)
-                # Write prediction results
-                df_pred.to_parquet(path_pred_out)
-                print(f"   Completed {algo} prediction of {metric}")
\ No newline at end of file
+        dir_pred_dataset = fsate.fs_pred_batch(dir_db_attrs=dir_db_attrs, comids_pred=comids_pred,
+                                               ds=ds, resp_vars=resp_vars, algos=algos,
+                                               dir_out_alg_ds=dir_out_alg_ds, dir_out=dir_out,
+                                               attrs_sel=attrs_sel, read_type=read_type,
+                                               chunk_size=chunk_size, model_cache=model_cache,
+                                               n_jobs=budget['n_jobs_inner'],
+                                               blas_threads=budget['blas_threads'],
+                                               uncertainty_config=uncertainty_config)
+        print(f"   Completed {', '.join(algos)} prediction of {', '.join(resp_vars)}. Wrote predictions to \n{dir_pred_dataset}")
@@ -28,12 +28,22 @@ if __name__ == "__main__":
     algo_config = {k: algo_cfg['algorithms'][k] for k in algo_cfg['algorithms']}
     if algo_config['mlp'][0].get('hidden_layer_sizes',None): # purpose: evaluate string literal to a tuple
         algo_config['mlp'][0]['hidden_layer_sizes'] = ast.literal_eval(algo_config['mlp'][0]['hidden_layer_sizes'])
-    algo_config_og = algo_config.copy()
 
     verbose = algo_cfg['verbose']
     test_size = algo_cfg['test_size']
     seed = algo_cfg['seed']
-    read_type = algo_cfg.get('read_type','all') # Arg for how to read attribute data using comids in fs_read_attr_comid(). May be 'all' or 'filename'.
+    read_type = algo_cfg.get('read_type','all') # Arg for how to read attribute data using comids in fs_read_attr_comid(). May be 'all', 'filename', or 'store'.
+    n_workers = algo_cfg.get('n_workers',1) # The number of parallel workers for training the (dataset, metric) jobs
+    compress_algo = algo_cfg.get('compress_algo',0) # joblib compression level of saved pipelines. 0 permits memory-mapped loading
+    skip_unchanged = algo_cfg.get('skip_unchanged',False) # Reload saved pipelines whose input fingerprints are unchanged rather than retraining
+    search_config = algo_cfg.get('search_config',None) # The hyperparameter search strategy, e.g. grid, random, or successive halving
+    uncertainty_config = algo_cfg.get('uncertainty_config',None) # The random forest prediction uncertainty options. None skips the uncertainty.
+    compute_cfg = algo_cfg.get('compute_config',None) or dict() # The compute resource budget
+    # Divide the total cores between parallel (dataset, metric) jobs (outer) and each job's estimators/searches (inner)
+    budget = fsate.compute_budget(n_cores=compute_cfg.get('n_cores',-1),
+                                  n_jobs_outer=n_workers,
+                                  blas_threads=compute_cfg.get('blas_threads',1))
+    attr_dtype = algo_cfg.get('attr_dtype','float64') # The numeric type of the shared attribute matrix, 'float64' or 'float32'
 
     #%% Attribute configuration
     name_attr_config = algo_cfg.get('name_attr_config', Path(path_algo_config).name.replace('algo','attr')) 
@@ -69,73 +79,94 @@ if __name__ == "__main__":
     dir_out = fsate.fs_save_algo_dir_struct(dir_base).get('dir_out')
     dir_out_alg_base = fsate.fs_save_algo_dir_struct(dir_base).get('dir_out_alg_base')
     
-    # %% Looping over datasets
+    # %% Looping over datasets to retrieve the response data & comids
+    dict_ds = dict()
     for ds in datasets: 
         print(f'PROCESSING {ds} dataset inside \n {dir_std_base}')
 
-        dir_out_alg_ds = Path(dir_out_alg_base/Path(ds))
-        dir_out_alg_ds.mkdir(exist_ok=True)
-
         # TODO allow secondary option where dat_resp and metrics read in from elsewhere
         # Read in the standardized dataset generated by fs_proc
         dat_resp = fsate._open_response_data_fs(dir_std_base,ds)
-        
-        # The metrics approach. These are xarray data variables of the response(s)
-        metrics = dat_resp.attrs['metric_mappings'].split('|')
 
         # %% COMID retrieval and assignment to response variable's coordinate
         [featureSource,featureID] = fsate._find_feat_srce_id(dat_resp,attr_cfig.attr_config) # e.g. ['nwissite','USGS-{gage_id}']
         gdf_comid = fsate.fs_retr_nhdp_comids_geom(featureSource=featureSource,
                                             featureID=featureID,
-                                            gage_ids=dat_resp['gage_id'].values)
+                                            gage_ids=dat_resp['gage_id'].values,
+                                            path_cache=fsate.std_nldi_cache_path(dir_std_base))
         comids_resp = gdf_comid['comid']
         dat_resp = dat_resp.assign_coords(comid = comids_resp)
         # Remove the unknown comids:
         dat_resp = dat_resp.dropna(dim='comid',how='any')
         comids_resp = [x for x in comids_resp if x is not np.nan]
         # TODO allow secondary option where featureSource and featureIDs already provided, not COMID 
+        dict_ds[ds] = {'dat_resp': dat_resp, 'comids_resp': comids_resp}
+
+    #%%  Read in predictor variable data (aka basin attributes) 
+    # Read the predictor variable data (basin attributes) generated by proc.attr.hydfab
+    #  once for the union of comids across all datasets, then pivot into wide format
+    comids_all = [comid for dict_resp in dict_ds.values() for comid in dict_resp['comids_resp']]
+    attr_mat = fsate.AttrWideMatrix.from_attr_db(dir_db_attrs, comids_all, attrs_sel = attrs_sel,
+                                                 read_type=read_type, dtype=np.dtype(attr_dtype))
+
+    # %% Prepare the (dataset, metric) training jobs
+    ls_job_kwargs = list()
+    for ds, dict_resp in dict_ds.items():
+        dat_resp = dict_resp['dat_resp']
+        dir_out_alg_ds = Path(dir_out_alg_base/Path(ds))
+        dir_out_alg_ds.mkdir(exist_ok=True)
 
-        #%%  Read in predictor variable data (aka basin attributes) 
-        # Read the predictor variable data (basin attributes) generated by proc.attr.hydfab
-        df_attr = fsate.fs_read_attr_comid(dir_db_attrs, comids_resp, attrs_sel = attrs_sel,
-                                        _s3 = None,storage_options=None,read_type=read_type)
-        # Convert into wide format for model training
-        df_attr_wide = df_attr.pivot(index='featureID', columns = 'attribute', values = 'value')
+        # The metrics approach. These are xarray data variables of the response(s)
+        metrics = dat_resp.attrs['metric_mappings'].split('|')
+
+        # The wide-format attribute data for model training
+        df_attr_wide = attr_mat.wide_df(dict_resp['comids_resp'])
 
-    # %% Train, test, and evaluate
-        rslt_eval = dict()
         for metr in metrics:
-            print(f' - Processing {metr}')
-            if len(algo_config) == 0:
-                algo_config = algo_config_og.copy()
             # Subset response data to metric of interest & the comid
             df_metr_resp = pd.DataFrame({'comid': dat_resp['comid'],
-                                        metr : dat_resp[metr].data})
+                                        metr : fsate.sel_response_arrays(dat_resp, [metr])[metr]})
             # Join attribute data and response data
             df_pred_resp = df_metr_resp.merge(df_attr_wide, left_on = 'comid', right_on = 'featureID')
 
             # TODO may need to add additional distinguishing strings to dataset_id, e.g. in cases of probabilistic simulation
+            ls_job_kwargs.append({'df': df_pred_resp,
+                                  'attrs': attrs_sel,
+                                  'algo_config': algo_config,
+                                  'dir_out_alg_ds': dir_out_alg_ds,
+                                  'dataset_id': ds,
+                                  'metr': metr,
+                                  'test_size': test_size,
+                                  'rs': seed,
+                                  'verbose': verbose,
+                                  'compress': compress_algo,
+                                  'skip_unchanged': skip_unchanged,
+                                  'search_config': search_config,
+                                  'uncertainty_config': uncertainty_config,
+                                  'n_jobs': budget['n_jobs_inner'],
+                                  'blas_threads': budget['blas_threads']})
+        dat_resp.close()
 
-            # Instantiate the training, testing, and evaluation class
-            train_eval = fsate.AlgoTrainEval(df=df_pred_resp,
-                                        attrs=attrs_sel,
-                                        algo_config=algo_config,
-                                        dir_out_alg_ds=dir_out_alg_ds, dataset_id=ds,
-                                        metr=metr,test_size=test_size, rs = seed,
-                                        verbose=verbose)
-            train_eval.train_eval() # Train, test, eval wrapper
-
-            # Retrieve evaluation metrics dataframe
-            rslt_eval[metr] = train_eval.eval_df
-            path_eval_metr = fsate.std_eval_metrs_path(dir_out_alg_ds, ds,metr)
-            train_eval.eval_df.to_csv(path_eval_metr)
-            del train_eval
-        # Compile results and write to file
-        rslt_eval_df = pd.concat(rslt_eval).reset_index(drop=True)
+    # %% Train, test, and evaluate each (dataset, metric) job in parallel
+    ls_train_eval = fsate.train_eval_parallel_wrap(ls_job_kwargs, n_jobs=budget['n_jobs_outer'],
+                                                   blas_threads=budget['blas_threads'])
+
+    # %% Compile results and write to file
+    rslt_eval = dict()
+    for job_kwargs, train_eval in zip(ls_job_kwargs, ls_train_eval):
+        ds = job_kwargs['dataset_id']
+        metr = job_kwargs['metr']
+        # Retrieve evaluation metrics dataframe
+        rslt_eval.setdefault(ds, dict())[metr] = train_eval.eval_df
+        path_eval_metr = fsate.std_eval_metrs_path(job_kwargs['dir_out_alg_ds'], ds,metr)
+        train_eval.eval_df.to_csv(path_eval_metr)
+    del ls_train_eval
+
+    for ds, rslt_eval_ds in rslt_eval.items():
+        dir_out_alg_ds = Path(dir_out_alg_base/Path(ds))
+        rslt_eval_df = pd.concat(rslt_eval_ds).reset_index(drop=True)
         rslt_eval_df['dataset'] = ds
         rslt_eval_df.to_parquet(Path(dir_out_alg_ds)/Path('algo_eval_'+ds+'.parquet'))
 
         print(f'... Wrote training and testing evaluation to file for {ds}')
-
-        dat_resp.close()
-    print("FINISHED algorithm training, testing, & evaluation")
\ No newline at end of file
+    print("FINISHED algorithm training, testing, & evaluation")
@@ -30,15 +30,27 @@ if __name__ == "__main__":
     algo_config = {k: algo_cfg['algorithms'][k] for k in algo_cfg['algorithms']}
     if algo_config['mlp'][0].get('hidden_layer_sizes',None): # purpose: evaluate string literal to a tuple
         algo_config['mlp'][0]['hidden_layer_sizes'] = ast.literal_eval(algo_config['mlp'][0]['hidden_layer_sizes'])
-    algo_config_og = algo_config.copy()
 
     verbose = algo_cfg['verbose']
     test_size = algo_cfg['test_size']
     seed = algo_cfg['seed']
-    read_type = algo_cfg.get('read_type','all') # Arg for how to read attribute data using comids in fs_read_attr_comid(). May be 'all' or 'filename'.
+    read_type = algo_cfg.get('read_type','all') # Arg for how to read attribute data using comids in fs_read_attr_comid(). May be 'all', 'filename', or 'store'.
     metrics = algo_cfg.get('metrics',None)
     make_plots = algo_cfg.get('make_plots',False)
+    n_plot_workers = algo_cfg.get('n_plot_workers',1) # The number of plot rendering processes. 0 renders plots inline
     same_test_ids = algo_cfg.get('same_test_ids',True)
+    n_workers = algo_cfg.get('n_workers',1) # The number of parallel workers for training the (dataset, metric) jobs
+    compress_algo = algo_cfg.get('compress_algo',0) # joblib compression level of saved pipelines. 0 permits memory-mapped loading
+    skip_unchanged = algo_cfg.get('skip_unchanged',False) # Reload saved pipelines whose input fingerprints are unchanged rather than retraining
+    search_config = algo_cfg.get('search_config',None) # The hyperparameter search strategy, e.g. grid, random, or successive halving
+    uncertainty_config = algo_cfg.get('uncertainty_config',None) # The random forest prediction uncertainty options. None skips the uncertainty.
+    compute_cfg = algo_cfg.get('compute_config',None) or dict() # The compute resource budget
+    # Divide the total cores between parallel (dataset, metric) jobs (outer) and each job's estimators/searches (inner)
+    budget = fsate.compute_budget(n_cores=compute_cfg.get('n_cores',-1),
+                                  n_jobs_outer=n_workers,
+                                  blas_threads=compute_cfg.get('blas_threads',1))
+    pca_config = algo_cfg.get('pca_config',None) # The PCA diagnostics options, e.g. 'full', 'randomized', or 'incremental'
+    attr_dtype = algo_cfg.get('attr_dtype','float64') # The numeric type of the shared attribute matrix, 'float64' or 'float32'
 
     #%% Attribute configuration
     name_attr_config = algo_cfg.get('name_attr_config', Path(path_algo_config).name.replace('algo','attr')) 
@@ -90,32 +102,47 @@ if __name__ == "__main__":
     else:
         test_ids = None
 
-    # %% Looping over datasets
+    # %% Plots are saved as payloads & rendered in separate processes, so training never waits on matplotlib
+    plot_queue = fsate.PlotQueue(fsate.std_plot_payload_dir(dir_out_viz_base), n_workers=n_plot_workers)
+    if make_plots: # Seed the basemap cache once, prior to the rendering processes reading it
+        fsate.gen_conus_basemap(dir_out_basemap=dir_out_viz_base)
+
+    # %% Looping over datasets to retrieve the response data & comids
+    dict_resp_gdf_ds = dict()
+    for ds in datasets: 
+        # TODO allow secondary option where dat_resp and metrics read in from elsewhere
+        # Read in the standardized dataset generated by fs_proc & grab comids/coords
+        dict_resp_gdf_ds[ds] = fsate.combine_resp_gdf_comid_wrap(dir_std_base=dir_std_base,
+                          ds= ds, attr_config = attr_cfig.attr_config)
+
+    #%%  Read in predictor variable data (aka basin attributes)
+    # Read the predictor variable data (basin attributes) generated by proc.attr.hydfab
+    #  once for the union of comids across all datasets, then pivot into wide format
+    # NOTE some gage_ids lost inside fs_read_attr_comid. 
+    comids_all = [comid for dict_resp_gdf in dict_resp_gdf_ds.values() 
+                  for comid in dict_resp_gdf['gdf_comid']['comid'].tolist()]
+    attr_mat = fsate.AttrWideMatrix.from_attr_db(dir_db_attrs, comids_all, attrs_sel = attrs_sel,
+                                                 read_type=read_type, dtype=np.dtype(attr_dtype))
+
+    # %% Looping over datasets to prepare the (dataset, metric) training jobs
+    ls_job_kwargs = list()
+    dict_ds = dict()
     for ds in datasets: 
         print(f'PROCESSING {ds} dataset inside \n {dir_std_base}')
 
         dir_out_alg_ds = Path(dir_out_alg_base/Path(ds))
         dir_out_alg_ds.mkdir(exist_ok=True)
 
-        # TODO allow secondary option where dat_resp and metrics read in from elsewhere
-        # Read in the standardized dataset generated by fs_proc & grab comids/coords
-        dict_resp_gdf = fsate.combine_resp_gdf_comid_wrap(dir_std_base=dir_std_base,
-                          ds= ds, attr_config = attr_cfig.attr_config)
-        dat_resp = dict_resp_gdf['dat_resp']
-        gdf_comid = dict_resp_gdf['gdf_comid']
+        dat_resp = dict_resp_gdf_ds[ds]['dat_resp']
+        gdf_comid = dict_resp_gdf_ds[ds]['gdf_comid']
 
         comids_resp = gdf_comid['comid'].tolist()
         if not metrics:
             # The metrics approach. These are all xarray data variables of the response(s)
             metrics = dat_resp.attrs['metric_mappings'].split('|')
   
-        #%%  Read in predictor variable data (aka basin attributes) & NA removal
-        # Read the predictor variable data (basin attributes) generated by proc.attr.hydfab
-        # NOTE some gage_ids lost inside fs_read_attr_comid. 
-        df_attr = fsate.fs_read_attr_comid(dir_db_attrs, comids_resp, attrs_sel = attrs_sel,
-                                        _s3 = None,storage_options=None,read_type=read_type)
-        # Convert into wide format for model training
-        df_attr_wide = df_attr.pivot(index='featureID', columns = 'attribute', values = 'value')
+        #%% Subset the predictor variable data to this dataset's comids & NA removal
+        df_attr_wide = attr_mat.wide_df(comids_resp)
         comids_df_attr_wide = df_attr_wide.index.values
 
         # Prepare attribute correlation matrix w/o NA values (writes to file)
@@ -139,34 +166,37 @@ if __name__ == "__main__":
             test_ids = gdf_comid['comid'][gdf_comid['comid'].isin(test_ids)]
 
         #%% Characterize dataset correlations & principal components:
-        fig_corr_mat = fsate.plot_corr_mat_save_wrap(df_X=df_attr_wide_dropna,
-                                    title=f'Correlation matrix from {ds} dataset',
-                                    dir_out_viz_base=dir_out_viz_base,
-                                    ds=ds)
-        plt.clf()
         # Attribute correlation results based on a correlation threshold (writes to file)
         df_corr_rslt = fsate.corr_thr_write_table_wrap(df_X=df_attr_wide_dropna,
                                                        dir_out_anlys_base=dir_out_anlys_base,
                                                        ds = ds,
-                                                       corr_thr=0.8)
-        
-
-        # Principal component analysis
-        pca_rslt = fsate.plot_pca_save_wrap(df_X=df_attr_wide_dropna, 
-                        dir_out_viz_base=dir_out_viz_base,
-                        ds = ds, 
-                        std_scale=True # Apply the StandardScaler.
-                        )
-        plt.clf()
-        # %% Train, test, and evaluate
-        rslt_eval = dict()
+                                                       corr_thr=0.8,
+                                                       dtype=np.dtype(attr_dtype))
+        # Large attribute sets only plot the correlated attributes. Only the
+        # correlation matrix is sent to the plot queue, not the attribute data.
+        plot_queue.submit('corr_mat', df_corr=fsate.corr_mat_plot_df(df_attr_wide_dropna,
+                                                                     df_corr_rslt=df_corr_rslt),
+                          title=f'Correlation matrix from {ds} dataset',
+                          dir_out_viz_base=dir_out_viz_base,
+                          ds=ds)
+
+        # Principal component analysis. Only the explained variance is sent to the plot queue.
+        pca_scaled = fsate.pca_stdscaled_tfrm(df_attr_wide_dropna,
+                                              std_scale=True, # Apply the StandardScaler.
+                                              **{'random_state': seed, **(pca_config or dict())})
+        plot_queue.submit('pca', explained_variance_ratio=pca_scaled.explained_variance_ratio_,
+                          dir_out_viz_base=dir_out_viz_base,
+                          ds = ds, 
+                          std_scale=True)
+        dict_ds[ds] = {'dir_out_alg_ds': dir_out_alg_ds,
+                       'gdf_comid': gdf_comid,
+                       'test_ids': test_ids}
+
+        # %% Prepare the training job for each metric
         for metr in metrics:
-            print(f' - Processing {metr}')
-            if len(algo_config) == 0:
-                algo_config = algo_config_og.copy()
             # Subset response data to metric of interest & the comid
             df_metr_resp = pd.DataFrame({'comid': dat_resp['comid'],
-                                        metr : dat_resp[metr].data})
+                                        metr : fsate.sel_response_arrays(dat_resp, [metr])[metr]})
             # Join attribute data and response data
             df_pred_resp = df_metr_resp.merge(df_attr_wide_dropna, left_on = 'comid', right_on = 'featureID')
             if df_pred_resp.isna().any().any(): # Check for NA values and remove them if present to avoid errors during evaluation
@@ -178,117 +208,148 @@ if __name__ == "__main__":
                     raise UserWarning(f"!!!!More than 10% of data are NA values!!!!")
 
             # TODO may need to add additional distinguishing strings to dataset_id, e.g. in cases of probabilistic simulation
+            ls_job_kwargs.append({'df': df_pred_resp,
+                                  'attrs': attrs_sel,
+                                  'algo_config': algo_config,
+                                  'dir_out_alg_ds': dir_out_alg_ds,
+                                  'dataset_id': ds,
+                                  'metr': metr,
+                                  'test_size': test_size,
+                                  'rs': seed,
+                                  'test_ids': test_ids,
+                                  'verbose': verbose,
+                                  'compress': compress_algo,
+                                  'skip_unchanged': skip_unchanged,
+                                  'search_config': search_config,
+                                  'uncertainty_config': uncertainty_config,
+                                  'n_jobs': budget['n_jobs_inner'],
+                                  'blas_threads': budget['blas_threads']})
+        dat_resp.close()
 
-            # Instantiate the training, testing, and evaluation class
-            train_eval = fsate.AlgoTrainEval(df=df_pred_resp,
-                                        attrs=attrs_sel,
-                                        algo_config=algo_config,
-                                        dir_out_alg_ds=dir_out_alg_ds, dataset_id=ds,
-                                        metr=metr,test_size=test_size, rs = seed,
-                                        test_ids=test_ids,
-                                        verbose=verbose)
-            train_eval.train_eval() # Train, test, eval wrapper
-
-            # Get the comids corresponding to the testing data/run QA checks
-            if train_eval.X_test.shape[0] + train_eval.X_train.shape[0] == df_pred_resp.shape[0]:
-                if all(train_eval.X_test.index == test_ids.index):
-                    df_pred_resp_test = df_pred_resp.iloc[train_eval.X_test.index]
-                    comids_test = df_pred_resp_test['comid'].values
-                    if not all(comids_test == test_ids.values): 
-                        raise ValueError("PROBLEM: the testing comids stored using AlgoTrainEval do not match the expected testing comids")
-                else:
-                    raise ValueError("Unexpected train/test split index corruption when using AlgoTrainEval.train_eval().")
+    # %% Train, test, and evaluate each (dataset, metric) job in parallel
+    ls_train_eval = fsate.train_eval_parallel_wrap(ls_job_kwargs, n_jobs=budget['n_jobs_outer'],
+                                                   blas_threads=budget['blas_threads'])
+
+    # %% Post-process each trained (dataset, metric) job
+    rslt_eval = dict()
+    for job_kwargs, train_eval in zip(ls_job_kwargs, ls_train_eval):
+        ds = job_kwargs['dataset_id']
+        metr = job_kwargs['metr']
+        df_pred_resp = job_kwargs['df']
+        gdf_comid = dict_ds[ds]['gdf_comid']
+        test_ids = dict_ds[ds]['test_ids']
+
+        # Get the comids corresponding to the testing data/run QA checks
+        if train_eval.X_test.shape[0] + train_eval.X_train.shape[0] == df_pred_resp.shape[0]:
+            if all(train_eval.X_test.index == test_ids.index):
+                df_pred_resp_test = df_pred_resp.iloc[train_eval.X_test.index]
+                comids_test = df_pred_resp_test['comid'].values
+                if not all(comids_test == test_ids.values): 
+                    raise ValueError("PROBLEM: the testing comids stored using AlgoTrainEval do not match the expected testing comids")
             else:
-                raise ValueError("Problem with expected dimensions. Consider how missing data may be handled with AlgoTrainEval.train_eval()")
-
-            # Retrieve evaluation metrics dataframe & write to file
-            rslt_eval[metr] = train_eval.eval_df
-            path_eval_metr = fsate.std_eval_metrs_path(dir_out_viz_base, ds,metr)
-            train_eval.eval_df.to_csv(path_eval_metr)
-
-            #%% Random Forest Feature Importance
-            y_test = train_eval.y_test
-            df_X, y_all = train_eval.all_X_all_y()
+                raise ValueError("Unexpected train/test split index corruption when using AlgoTrainEval.train_eval().")
+        else:
+            raise ValueError("Problem with expected dimensions. Consider how missing data may be handled with AlgoTrainEval.train_eval()")
+
+        # Retrieve evaluation metrics dataframe & write to file
+        rslt_eval.setdefault(ds, dict())[metr] = train_eval.eval_df
+        path_eval_metr = fsate.std_eval_metrs_path(dir_out_viz_base, ds,metr)
+        train_eval.eval_df.to_csv(path_eval_metr)
+
+        #%% Random Forest Feature Importance
+        y_test = train_eval.y_test
+        df_X, y_all = train_eval.all_X_all_y()
+
+        if make_plots:
+            # See if random forest was trained in the AlgoTrainEval class object:
+            rfr = fsate._extr_rf_algo(train_eval)
+            if rfr: # Generate & save the feature importance plot
+                plot_queue.submit('feat_imp', feat_imprt=rfr.feature_importances_,
+                                  attrs=df_X.columns,
+                                  dir_out_viz_base=dir_out_viz_base,
+                                  ds=ds,metr=metr)
+
+            # Create learning curves for each algorithm, reading the trained algorithms from file
+            dict_algos_lc = {algo_str: {'path_algo': Path(job_kwargs['dir_out_alg_ds'])/v['file_pipe'],
+                                        'metric': train_eval.eval_dict[algo_str]['metric'],
+                                        'type': train_eval.eval_dict[algo_str]['type']}
+                             for algo_str, v in train_eval.algs_dict.items()}
+            plot_queue.submit('learning_curve', X=df_X, y=y_all, dict_algos=dict_algos_lc,
+                            dir_out_viz_base=dir_out_viz_base,
+                            ds=ds,
+                            cv = 5,n_jobs=max(1, budget['n_cores']//max(1, n_plot_workers)), # Cores shared by the rendering processes
+                            train_sizes = np.linspace(0.1, 1.0, 10),
+                            scoring = 'neg_mean_squared_error',
+                            ylabel_scoring = "Mean Squared Error (MSE)",
+                            training_uncn = False,
+                            blas_threads = budget['blas_threads']
+                            )
+
+        # %% Model testing results visualization
+        # TODO extract y_pred for each model
+        dict_test_gdf = dict()
+        for algo_str in train_eval.algs_dict.keys():
+
+            #%% Evaluation: learning curves
+            y_pred = train_eval.preds_dict[algo_str]['y_pred']
+            y_obs = train_eval.y_test.values
+            if make_plots:
+                # Regression of testing holdout's prediction vs observation
+                plot_queue.submit('pred_vs_obs', y_pred=y_pred, y_obs=y_obs, dir_out_viz_base=dir_out_viz_base,
+                        ds=ds, metr=metr, algo_str=algo_str,split_type=f'testing{test_size}')
+
+            # PREPARE THE GDF TO ALIGN PREDICTION VALUES BY COMIDS/COORDS
+            test_gdf = gdf_comid.loc[test_ids.index]#[gdf_comid['comid'].isin(comids_test)].copy()
+            # Ensure test_gdf is ordered in the same order of comids as y_pred
+            if all(test_gdf['comid'].values == comids_test):             
+                test_gdf['id'] = pd.Categorical(test_gdf['comid'], categories=np.unique(comids_test), ordered=True) 
+                # The comid can be used for sorting... see test_gdf.sort_values() below
+            else:
+                raise ValueError("Unable to ensure test_gdf is ordered in the same order of comids as y_pred")
+            test_gdf.loc[:,'performance'] = y_pred
+            test_gdf.loc[:,'observed'] = y_obs
+            test_gdf.loc[:,'dataset'] = ds
+            test_gdf.loc[:,'metric'] = metr
+            test_gdf.loc[:,'algo'] = algo_str
+            if 'y_var' in train_eval.preds_dict[algo_str]:
+                # The random forest prediction uncertainty
+                test_gdf.loc[:,'pred_var'] = train_eval.preds_dict[algo_str]['y_var']
+                test_gdf.loc[:,'pred_lower'] = train_eval.preds_dict[algo_str]['y_lower']
+                test_gdf.loc[:,'pred_upper'] = train_eval.preds_dict[algo_str]['y_upper']
+            if test_gdf.shape[0] != len(comids_test):
+                raise ValueError("Problem with dataset size")
+            test_gdf = test_gdf.sort_values('id').reset_index(drop=True)
+            dict_test_gdf[algo_str] = test_gdf.drop('id',axis=1)
 
             if make_plots:
-                # See if random forest was trained in the AlgoTrainEval class object:
-                rfr = fsate._extr_rf_algo(train_eval)
-                if rfr: # Generate & save the feature importance plot
-                    fsate.save_feat_imp_fig_wrap(rfr=rfr,
-                            attrs=df_X.columns,
-                            dir_out_viz_base=dir_out_viz_base,
-                            ds=ds,metr=metr)
-
-                
-                # Create learning curves for each algorithm
-                algo_plot_lc = fsate.AlgoEvalPlotLC(df_X,y_all)
-                fsate.plot_learning_curve_save_wrap(algo_plot_lc,train_eval, 
-                                dir_out_viz_base=dir_out_viz_base,
-                                ds=ds,
-                                cv = 5,n_jobs=-1,
-                                train_sizes = np.linspace(0.1, 1.0, 10),
-                                scoring = 'neg_mean_squared_error',
-                                ylabel_scoring = "Mean Squared Error (MSE)",
-                                training_uncn = False
-                                )
-
-            # %% Model testing results visualization
-            # TODO extract y_pred for each model
-            dict_test_gdf = dict()
-            for algo_str in train_eval.algs_dict.keys():
-
-                #%% Evaluation: learning curves
-                y_pred = train_eval.preds_dict[algo_str]['y_pred']
-                y_obs = train_eval.y_test.values
-                if make_plots:
-                    # Regression of testing holdout's prediction vs observation
-                    fsate.plot_pred_vs_obs_wrap(y_pred, y_obs, dir_out_viz_base,
-                            ds, metr, algo_str=algo_str,split_type=f'testing{test_size}')
-
-                # PREPARE THE GDF TO ALIGN PREDICTION VALUES BY COMIDS/COORDS
-                test_gdf = gdf_comid.loc[test_ids.index]#[gdf_comid['comid'].isin(comids_test)].copy()
-                # Ensure test_gdf is ordered in the same order of comids as y_pred
-                if all(test_gdf['comid'].values == comids_test):             
-                    test_gdf['id'] = pd.Categorical(test_gdf['comid'], categories=np.unique(comids_test), ordered=True) 
-                    # The comid can be used for sorting... see test_gdf.sort_values() below
-                else:
-                    raise ValueError("Unable to ensure test_gdf is ordered in the same order of comids as y_pred")
-                test_gdf.loc[:,'performance'] = y_pred
-                test_gdf.loc[:,'observed'] = y_obs
-                test_gdf.loc[:,'dataset'] = ds
-                test_gdf.loc[:,'metric'] = metr
-                test_gdf.loc[:,'algo'] = algo_str
-                if test_gdf.shape[0] != len(comids_test):
-                    raise ValueError("Problem with dataset size")
-                test_gdf = test_gdf.sort_values('id').reset_index(drop=True)
-                dict_test_gdf[algo_str] = test_gdf.drop('id',axis=1)
-
-                if make_plots:
-                    fsate.plot_map_pred_wrap(test_gdf,
-                                    dir_out_viz_base, ds,
-                                        metr,algo_str,
-                                        split_type='test',
-                                        colname_data='performance')
-            
-            # Generate analysis path out:
-            path_pred_obs = fsate.std_test_pred_obs_path(dir_out_anlys_base,ds, metr)
-            # TODO why does test_gdf end up with a size larger than total comids? Should be the split test amount
-            df_pred_obs_ds_metr = pd.concat(dict_test_gdf)
-            df_pred_obs_ds_metr.to_csv(path_pred_obs)
-            print(f"Wrote the prediction-observation-coordinates dataset to file\n{path_pred_obs}")
-                
-            del train_eval
-        # Compile results and write to file
-        rslt_eval_df = pd.concat(rslt_eval).reset_index(drop=True)
+                plot_queue.submit('map_pred', test_gdf=test_gdf[['geometry','performance']],
+                                dir_out_viz_base=dir_out_viz_base, ds=ds,
+                                    metr=metr,algo_str=algo_str,
+                                    split_type='test',
+                                    colname_data='performance')
+        
+        # Generate analysis path out:
+        path_pred_obs = fsate.std_test_pred_obs_path(dir_out_anlys_base,ds, metr)
+        # TODO why does test_gdf end up with a size larger than total comids? Should be the split test amount
+        df_pred_obs_ds_metr = pd.concat(dict_test_gdf)
+        df_pred_obs_ds_metr.to_csv(path_pred_obs)
+        print(f"Wrote the prediction-observation-coordinates dataset to file\n{path_pred_obs}")
+    del ls_train_eval
+
+    # Compile results and write to file
+    for ds, rslt_eval_ds in rslt_eval.items():
+        dir_out_alg_ds = dict_ds[ds]['dir_out_alg_ds']
+        rslt_eval_df = pd.concat(rslt_eval_ds).reset_index(drop=True)
         rslt_eval_df['dataset'] = ds
         rslt_eval_df.to_parquet(Path(dir_out_alg_ds)/Path('algo_eval_'+ds+'.parquet'))
         print(f'... Wrote training and testing evaluation to file for {ds}')
 
-        dat_resp.close()
     #%% Cross-comparison across all datasets: determining where the best metric lives
     if same_test_ids and len(datasets)>1:
         print("Cross-comparison across multiple datasets possible.\n"+
         f"Refer to custom script processing example inside scripts/analysis/fs_proc_viz_best_ealstm.py")
 
+    # Wait for the remaining plots to finish rendering
+    plot_queue.wait()
     print("FINISHED algorithm training, testing, & evaluation")
 
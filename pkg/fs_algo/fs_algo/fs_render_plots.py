@@ -0,0 +1,28 @@
+"""Plot rendering script
+Regenerate the plots from the plot payloads saved by fs_proc_algo_viz.py or
+fs_perf_viz.py, without retraining algorithms or re-reading data.
+
+Details:
+Each plot job is saved as a .joblib payload inside the `plot_payloads`
+directory of the data visualization directory (refer to
+`fsate.std_plot_payload_dir()`). The payloads are rendered by a pool of
+worker processes using the Agg backend, applying the matplotlib style saved
+inside each payload unless `--style_path` is provided.
+
+Usage:
+python fs_render_plots.py "/path/to/data_visualizations/plot_payloads" --n_workers 4
+"""
+
+import argparse
+import fs_algo.fs_algo_train_eval as fsate
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'render the saved plot payloads')
+    parser.add_argument('dir_payloads', type=str, help='Path to the directory containing the plot payload .joblib files')
+    parser.add_argument('--n_workers', type=int, default=1, help='Number of plot rendering processes. Default 1.')
+    parser.add_argument('--style_path', type=str, default=None, help='Path to a matplotlib style file, e.g. RaFTS_theme.mplstyle. Default uses the style saved inside each payload.')
+    args = parser.parse_args()
+
+    ls_failed = fsate.render_plot_payloads(args.dir_payloads, n_workers=args.n_workers,
+                                           style_path=args.style_path)
+    print(f"FINISHED rendering plots. {len(ls_failed)} plot(s) could not be rendered.")
@@ -0,0 +1,41 @@
+"""Synthetic data generation script
+Generate a synthetic attribute database, standardized response dataset,
+location metadata and config files for testing the algorithm training &
+prediction workflows at scale, with no network access.
+
+Details:
+Attributes are written as per-COMID parquet files in the proc.attr.hydfab
+format. The NLDI COMID cache is pre-populated with every synthetic gage, so
+fs_proc_algo.py does not query NLDI. Refer to :mod:`fs_algo.synth_attr_db`.
+
+Usage:
+python fs_synth_data.py "/path/to/dir_base" --n_comids 100000 --n_attrs 50 --n_gages 5000
+python fs_proc_algo.py "/path/to/dir_base/synth_algo_config.yaml"
+python fs_pred_algo.py "/path/to/dir_base/synth_pred_config.yaml"
+"""
+
+import argparse
+from fs_algo.synth_attr_db import gen_synth_dataset
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'generate a synthetic attribute database & standardized response dataset')
+    parser.add_argument('dir_base', type=str, help='The base directory where the synthetic data & config files are written')
+    parser.add_argument('--n_comids', type=int, default=10000, help='Number of COMIDs with attributes, all of which are prediction locations. Default 10000.')
+    parser.add_argument('--n_attrs', type=int, default=30, help='Number of attributes of each COMID. Default 30.')
+    parser.add_argument('--n_gages', type=int, default=None, help='Number of gaged COMIDs with response data. Default all COMIDs.')
+    parser.add_argument('--ds', type=str, default='synthetic', help="The dataset name. Default 'synthetic'.")
+    parser.add_argument('--metrics', type=str, nargs='+', default=['NSE','KGE'], help='The standardized metric names. Default NSE KGE.')
+    parser.add_argument('--frac_missing', type=float, default=0.0, help='Fraction of (COMID, attribute) pairs omitted. Default 0.')
+    parser.add_argument('--frac_dupes', type=float, default=0.0, help='Fraction of attribute rows duplicated with a later dl_timestamp. Default 0.')
+    parser.add_argument('--seed', type=int, default=32, help='The random seed. Default 32.')
+    parser.add_argument('--n_workers', type=int, default=4, help='Number of threads writing attribute files. Default 4.')
+    args = parser.parse_args()
+
+    dict_synth = gen_synth_dataset(dir_base=args.dir_base, n_comids=args.n_comids,
+                                   n_attrs=args.n_attrs, n_gages=args.n_gages, ds=args.ds,
+                                   metrics=args.metrics, frac_missing=args.frac_missing,
+                                   frac_dupes=args.frac_dupes, seed=args.seed,
+                                   n_workers=args.n_workers)
+    print("Wrote the synthetic data config files:")
+    for path_cfig in dict_synth['configs'].values():
+        print(f"   {path_cfig}")
@@ -0,0 +1,438 @@
+"""
+Synthetic attribute database & standardized response data generation
+
+Writes COMID attribute data in the per-COMID parquet format of the
+proc.attr.hydfab R package, along with the matching fs_proc standardized
+response dataset, location metadata and NLDI COMID cache. The
+algorithm training and prediction workflows may then be exercised at scale
+without the real data pipeline or network access.
+
+example::
+> python fs_synth_data.py "/path/to/dir_base" --n_comids 100000 --n_attrs 50
+> python fs_proc_algo.py "/path/to/dir_base/synth_algo_config.yaml"
+"""
+
+import pandas as pd
+import numpy as np
+import xarray as xr
+import yaml
+import os
+from pathlib import Path
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Iterable
+import pyarrow as pa
+import pyarrow.parquet as pq
+import fs_algo.fs_algo_train_eval as fsate
+from fs_algo.tfrm_attr import _std_attr_filepath
+
+# The dl_timestamp format of proc.attr.hydfab, e.g. '2024-07-26 09:01:53'
+_FMT_DL_TIMESTAMP = '%Y-%m-%d %H:%M:%S'
+
+
+def synth_comids(n_comids: int, start: int = 1000000) -> np.ndarray:
+    """Synthetic COMIDs
+
+    :param n_comids: The number of COMIDs
+    :type n_comids: int
+    :param start: The first COMID, defaults to 1000000
+    :type start: int, optional
+    :return: consecutive COMIDs as strings
+    :rtype: np.ndarray
+    """
+    return np.arange(start, start + n_comids).astype(str)
+
+def synth_gage_ids(n_gages: int) -> np.ndarray:
+    """Synthetic USGS-style gage ids
+
+    :param n_gages: The number of gage ids
+    :type n_gages: int
+    :return: zero-padded, 8-digit gage ids
+    :rtype: np.ndarray
+    """
+    return np.char.zfill(np.arange(1, n_gages + 1).astype(str), 8)
+
+def synth_attr_names(n_attrs: int) -> list:
+    """Synthetic attribute names
+
+    :param n_attrs: The number of attributes
+    :type n_attrs: int
+    :return: attribute names, e.g. 'synth_attr_0000'
+    :rtype: list
+    """
+    return [f'synth_attr_{idx:04d}' for idx in range(n_attrs)]
+
+def _synth_attr_values(comid_idxs: np.ndarray, n_attrs: int, seed: int) -> np.ndarray:
+    """Deterministic attribute values of the requested COMID positions
+
+    Values depend only on the COMID position, attribute count & seed, so
+    chunks may be generated in any order or in parallel.
+
+    :param comid_idxs: The positions of the COMIDs, e.g. 0 for the first COMID
+    :type comid_idxs: np.ndarray
+    :param n_attrs: The number of attributes
+    :type n_attrs: int
+    :param seed: The random seed
+    :type seed: int
+    :return: values with shape (len(comid_idxs), n_attrs)
+    :rtype: np.ndarray
+    """
+    arr = np.empty((len(comid_idxs), n_attrs), dtype=np.float64)
+    for row, idx in enumerate(comid_idxs):
+        arr[row] = np.random.default_rng([seed, int(idx)]).random(n_attrs)
+    return arr
+
+def synth_response(arr_attr: np.ndarray, n_metrics: int, seed: int = 32,
+                   noise: float = 0.05) -> np.ndarray:
+    """Synthetic response metrics that depend on the attributes
+
+    Each metric is a noisy, nonlinear function of a few attributes, so trained
+    algorithms have a learnable signal.
+
+    :param arr_attr: The attribute values, with one row per location
+    :type arr_attr: np.ndarray
+    :param n_metrics: The number of metrics
+    :type n_metrics: int
+    :param seed: The random seed, defaults to 32
+    :type seed: int, optional
+    :param noise: The standard deviation of the added noise, defaults to 0.05
+    :type noise: float, optional
+    :return: metric values with shape (arr_attr.shape[0], n_metrics)
+    :rtype: np.ndarray
+    """
+    rng = np.random.default_rng(seed)
+    n_attrs = arr_attr.shape[1]
+    arr_resp = np.empty((arr_attr.shape[0], n_metrics), dtype=np.float64)
+    for idx in range(n_metrics):
+        idxs_attr = rng.choice(n_attrs, size=min(3, n_attrs), replace=False)
+        wts = rng.uniform(0.5, 1.5, size=len(idxs_attr))
+        signal = np.tanh(arr_attr[:, idxs_attr] @ wts - wts.sum()/2)
+        arr_resp[:, idx] = signal + rng.normal(0, noise, arr_attr.shape[0])
+    return arr_resp
+
+def _write_attr_chunk(dir_db_attrs: Path, comids: np.ndarray, comid_idxs: np.ndarray,
+                      attrs: list, seed: int, frac_missing: float, frac_dupes: float,
+                      featureSource: str, data_source: str, timestamp: datetime) -> int:
+    """Generate & write the per-COMID attribute parquet files of a chunk of COMIDs
+
+    :param dir_db_attrs: directory where the attribute parquet files are written
+    :type dir_db_attrs: Path
+    :param comids: The COMIDs of this chunk
+    :type comids: np.ndarray
+    :param comid_idxs: The positions of these COMIDs among all COMIDs
+    :type comid_idxs: np.ndarray
+    :param attrs: The attribute names
+    :type attrs: list
+    :param seed: The random seed
+    :type seed: int
+    :param frac_missing: The fraction of (COMID, attribute) pairs omitted
+    :type frac_missing: float
+    :param frac_dupes: The fraction of attribute rows written twice
+    :type frac_dupes: float
+    :param featureSource: The featureSource column value
+    :type featureSource: str
+    :param data_source: The data_source column value
+    :type data_source: str
+    :param timestamp: The dl_timestamp of the first acquisition
+    :type timestamp: datetime
+    :return: The number of attribute rows written
+    :rtype: int
+    """
+    n_attrs = len(attrs)
+    arr = _synth_attr_values(comid_idxs, n_attrs, seed)
+    rng = np.random.default_rng([seed, int(comid_idxs[0]), 1])
+    idx_comid = np.repeat(np.arange(len(comids)), n_attrs)
+    idx_attr = np.tile(np.arange(n_attrs), len(comids))
+    mask_keep = rng.random(idx_comid.size) >= frac_missing
+    idx_comid, idx_attr = idx_comid[mask_keep], idx_attr[mask_keep]
+    ts = np.full(idx_comid.size, timestamp.strftime(_FMT_DL_TIMESTAMP), dtype=object)
+
+    # Duplicates are re-acquisitions of the same value with a later timestamp
+    mask_dupe = rng.random(idx_comid.size) < frac_dupes
+    if mask_dupe.any():
+        idx_comid = np.concatenate([idx_comid, idx_comid[mask_dupe]])
+        idx_attr = np.concatenate([idx_attr, idx_attr[mask_dupe]])
+        ts_dupe = (timestamp + timedelta(days=1)).strftime(_FMT_DL_TIMESTAMP)
+        ts = np.concatenate([ts, np.full(mask_dupe.sum(), ts_dupe, dtype=object)])
+        order = np.argsort(idx_comid, kind='stable')
+        idx_comid, idx_attr, ts = idx_comid[order], idx_attr[order], ts[order]
+
+    # The attribute column is dictionary-encoded, as are the R factors written by proc.attr.hydfab
+    type_idx = pa.int8() if n_attrs <= np.iinfo(np.int8).max else pa.int32()
+    tbl = pa.table({'data_source': pa.array(np.full(idx_comid.size, data_source), pa.string()),
+                    'dl_timestamp': pa.array(ts, pa.string()),
+                    'attribute': pa.DictionaryArray.from_arrays(pa.array(idx_attr, type_idx),
+                                                                pa.array(attrs, pa.string())),
+                    'value': pa.array(arr[idx_comid, idx_attr], pa.float64()),
+                    'featureID': pa.array(comids[idx_comid], pa.string()),
+                    'featureSource': pa.array(np.full(idx_comid.size, featureSource), pa.string())})
+    bounds = np.searchsorted(idx_comid, np.arange(len(comids) + 1))
+    for pos, comid in enumerate(comids):
+        n_rows = bounds[pos + 1] - bounds[pos]
+        if n_rows > 0:
+            pq.write_table(tbl.slice(bounds[pos], n_rows), _std_attr_filepath(dir_db_attrs, comid, 'attr'))
+    return tbl.num_rows
+
+def gen_synth_attr_db(dir_db_attrs: str | os.PathLike, n_comids: int, n_attrs: int,
+                      frac_missing: float = 0.0, frac_dupes: float = 0.0,
+                      seed: int = 32, featureSource: str = 'COMID',
+                      data_source: str = 'synthetic', chunk_size: int = 10000,
+                      n_workers: int = 1) -> dict:
+    """Write a synthetic attribute database of one parquet file per COMID
+
+    Each file follows the proc.attr.hydfab standard format, with columns
+    data_source, dl_timestamp, attribute, value, featureID & featureSource,
+    and is named using :func:`fs_algo.tfrm_attr._std_attr_filepath`.
+
+    :param dir_db_attrs: directory where the attribute parquet files are written
+    :type dir_db_attrs: str | os.PathLike
+    :param n_comids: The number of COMIDs
+    :type n_comids: int
+    :param n_attrs: The number of attributes of each COMID
+    :type n_attrs: int
+    :param frac_missing: The fraction of (COMID, attribute) pairs omitted, defaults to 0.0
+    :type frac_missing: float, optional
+    :param frac_dupes: The fraction of attribute rows written twice, the second
+        time with a later dl_timestamp, defaults to 0.0
+    :type frac_dupes: float, optional
+    :param seed: The random seed. The same seed always generates the same values. Defaults to 32
+    :type seed: int, optional
+    :param featureSource: The featureSource column value, defaults to 'COMID'
+    :type featureSource: str, optional
+    :param data_source: The data_source column value, defaults to 'synthetic'
+    :type data_source: str, optional
+    :param chunk_size: The number of COMIDs generated at once, defaults to 10000
+    :type chunk_size: int, optional
+    :param n_workers: The number of threads writing chunks of files, defaults to 1
+    :type n_workers: int, optional
+    :return: dict of the `'comids'`, the `'attrs'` & the number of attribute rows written, `'n_rows'`
+    :rtype: dict
+    """
+    dir_db_attrs = Path(dir_db_attrs)
+    dir_db_attrs.mkdir(parents=True, exist_ok=True)
+    comids = synth_comids(n_comids)
+    attrs = synth_attr_names(n_attrs)
+    timestamp = datetime(2025, 1, 1, 9, 1, 53)
+    starts = range(0, n_comids, chunk_size)
+    def _write_chunk(start):
+        stop = min(start + chunk_size, n_comids)
+        return _write_attr_chunk(dir_db_attrs, comids[start:stop], np.arange(start, stop),
+                                 attrs, seed, frac_missing, frac_dupes,
+                                 featureSource, data_source, timestamp)
+    print(f"Writing synthetic attributes of {n_comids} comids x {n_attrs} attributes to {dir_db_attrs}")
+    if n_workers > 1:
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            n_rows = sum(executor.map(_write_chunk, starts))
+    else:
+        n_rows = sum(map(_write_chunk, starts))
+    return {'comids': comids, 'attrs': attrs, 'n_rows': n_rows}
+
+def write_synth_response(dir_std_base: str | os.PathLike, ds: str, gage_ids: Iterable[str],
+                         arr_resp: np.ndarray, metrics: Iterable[str],
+                         featureSource: str = 'nwissite',
+                         featureID: str = 'USGS-{gage_id}') -> Path:
+    """Write a standardized response dataset in the netcdf format generated by
+        :func:`fs_proc.proc_eval_metrics.proc_col_schema`
+
+    :param dir_std_base: The directory of standardized datasets, e.g. 'dir_std_base' in the attribute config
+    :type dir_std_base: str | os.PathLike
+    :param ds: The dataset name
+    :type ds: str
+    :param gage_ids: The location identifiers
+    :type gage_ids: Iterable[str]
+    :param arr_resp: The metric values, with shape (len(gage_ids), len(metrics))
+    :type arr_resp: np.ndarray
+    :param metrics: The standardized metric names, e.g. ['NSE','KGE']
+    :type metrics: Iterable[str]
+    :param featureSource: The featureSource of the gage ids, defaults to 'nwissite'
+    :type featureSource: str, optional
+    :param featureID: The conversion format of gage ids into featureIDs, defaults to 'USGS-{gage_id}'
+    :type featureID: str, optional
+    :return: path to the netcdf file
+    :rtype: Path
+    """
+    metrics = list(metrics)
+    dat_resp = xr.Dataset({metr: ('gage_id', arr_resp[:, idx]) for idx, metr in enumerate(metrics)},
+                          coords={'gage_id': np.asarray(gage_ids, dtype=str)})
+    dat_resp.attrs = {'gage_id': 'gage_id', 'featureID': featureID, 'featureSource': featureSource,
+                      'metric_cols': '|'.join(metrics), 'metric_mappings': '|'.join(metrics),
+                      'save_type': 'netcdf', 'save_loc': 'local', 'dataset_name': ds,
+                      'formulation_base': 'synthetic', 'formulation_id': 'synthetic',
+                      'temporal_res': 'daily', 'target_var': 'Q', 'cal_status': 'N'}
+    path_nc = Path(dir_std_base)/ds/f'{ds}_synthetic.nc'
+    path_nc.parent.mkdir(parents=True, exist_ok=True)
+    dat_resp.to_netcdf(path_nc)
+    return path_nc
+
+def write_synth_loc_meta(path_meta: str | os.PathLike, comids: Iterable[str],
+                         gage_ids: Iterable[str] | None = None,
+                         featureSource: str = 'nwissite',
+                         featureID: str = 'USGS-{gage_id}') -> pd.DataFrame:
+    """Write location metadata in the format of `proc.attr.hydfab::write_meta_nldi_feat()`
+
+    :param path_meta: The metadata filepath, ending in '.parquet' or '.csv'
+    :type path_meta: str | os.PathLike
+    :param comids: The COMID of each location
+    :type comids: Iterable[str]
+    :param gage_ids: The gage id of each location, defaults to None for ungaged prediction locations
+    :type gage_ids: Iterable[str] | None, optional
+    :param featureSource: The featureSource of the gage ids, defaults to 'nwissite'
+    :type featureSource: str, optional
+    :param featureID: The conversion format of gage ids into featureIDs, defaults to 'USGS-{gage_id}'
+    :type featureID: str, optional
+    :return: the location metadata
+    :rtype: pd.DataFrame
+    """
+    comids = np.asarray(comids, dtype=str)
+    lon, lat = _synth_coords(comids)
+    df_meta = pd.DataFrame({'comid': comids, 'lon': lon, 'lat': lat})
+    if gage_ids is not None:
+        df_meta.insert(0, 'featureSource', featureSource)
+        df_meta.insert(0, 'featureID', [featureID.format(gage_id=x) for x in gage_ids])
+        df_meta.insert(0, 'gage_id', np.asarray(gage_ids, dtype=str))
+    path_meta = Path(path_meta)
+    path_meta.parent.mkdir(parents=True, exist_ok=True)
+    if path_meta.suffix == '.csv':
+        df_meta.to_csv(path_meta, index=False)
+    else:
+        df_meta.to_parquet(path_meta, index=False)
+    return df_meta
+
+def _synth_coords(comids: np.ndarray) -> tuple:
+    """Deterministic lon/lat inside CONUS for each COMID
+
+    :param comids: The COMIDs
+    :type comids: np.ndarray
+    :return: the (lon, lat) arrays
+    :rtype: tuple
+    """
+    vals = np.asarray(comids, dtype=np.int64)
+    return (-124 + (vals * 0.6180339887 % 1) * 57, 25 + (vals * 0.4142135624 % 1) * 24)
+
+def write_synth_configs(dir_base: str | os.PathLike, ds: str, attrs: Iterable[str],
+                        metrics: Iterable[str], name_cfig: str = 'synth') -> dict:
+    """Write attribute, algorithm & prediction config files pointing to the synthetic data
+
+    The config files are written inside `dir_base`. Following the standard
+    layout, the attribute config's 'dir_base' is `dir_base/'input'`, so
+    algorithm output is written to `dir_base/'output'`. Refer to
+    :func:`fs_algo.fs_algo_train_eval.fs_save_algo_dir_struct`.
+
+    :param dir_base: The base directory of the synthetic data
+    :type dir_base: str | os.PathLike
+    :param ds: The dataset name
+    :type ds: str
+    :param attrs: The attribute names used for training
+    :type attrs: Iterable[str]
+    :param metrics: The metric names predicted
+    :type metrics: Iterable[str]
+    :param name_cfig: The prefix of the config filenames, defaults to 'synth'
+    :type name_cfig: str, optional
+    :return: paths to the `'attr'`, `'algo'` & `'pred'` config files
+    :rtype: dict
+    """
+    dir_base = Path(dir_base)
+    path_meta = "{dir_std_base}/{ds}/nldi_feat_{ds}_{ds_type}.{write_type}"
+    attr_cfg = {'col_schema': [{'featureID': 'USGS-{gage_id}'}, {'featureSource': 'nwissite'}],
+                'file_io': [{'save_loc': 'local'}, {'dir_base': str(dir_base/'input')},
+                            {'dir_std_base': '{dir_base}/user_data_std'},
+                            {'dir_db_attrs': '{dir_base}/attributes'},
+                            {'ds_type': 'training'}, {'write_type': 'parquet'},
+                            {'path_meta': path_meta}],
+                'formulation_metadata': [{'datasets': [ds]}, {'formulation_base': 'synthetic'}],
+                'attr_select': [{'synth_vars': list(attrs)}]}
+    algo_cfg = {'algorithms': {'rf': [{'n_estimators': 100}],
+                               'mlp': [{'hidden_layer_sizes': '(4,)'}, {'max_iter': 2000}]},
+                'test_size': 0.3, 'seed': 32, 'verbose': True, 'read_type': 'filename',
+                'name_attr_config': f'{name_cfig}_attr_config.yaml'}
+    pred_cfg = {'name_attr_config': f'{name_cfig}_attr_config.yaml', 'path_meta': path_meta,
+                'pred_file_comid_colname': 'comid', 'write_type': 'parquet',
+                'ds_type': 'prediction', 'read_type': 'filename',
+                'algo_response_vars': list(metrics), 'algo_type': ['rf']}
+    dict_paths = dict()
+    for key, cfg in {'attr': attr_cfg, 'algo': algo_cfg, 'pred': pred_cfg}.items():
+        dict_paths[key] = dir_base/f'{name_cfig}_{key}_config.yaml'
+        with open(dict_paths[key], 'w') as file:
+            yaml.safe_dump(cfg, file, sort_keys=False)
+    return dict_paths
+
+def gen_synth_dataset(dir_base: str | os.PathLike, n_comids: int, n_attrs: int,
+                      n_gages: int | None = None, ds: str = 'synthetic',
+                      metrics: Iterable[str] = ('NSE','KGE'),
+                      frac_missing: float = 0.0, frac_dupes: float = 0.0,
+                      seed: int = 32, chunk_size: int = 10000, n_workers: int = 1,
+                      write_configs: bool = True) -> dict:
+    """Generate a complete synthetic dataset for algorithm training & prediction
+
+    Creates the following inside `dir_base/'input'`, using the same layout as the attribute config files:
+        - `attributes/`: the per-COMID attribute database, refer to :func:`gen_synth_attr_db`
+        - `user_data_std/{ds}/`: the standardized response dataset of the gaged locations,
+          refer to :func:`write_synth_response`
+        - `user_data_std/{ds}/nldi_feat_{ds}_training.parquet` &
+          `nldi_feat_{ds}_prediction.parquet`: the gaged & all location metadata
+        - `user_data_std/nldi_comid_cache.csv`: the gage id to COMID mapping, so
+          :func:`fs_algo.fs_algo_train_eval.fs_retr_nhdp_comids_geom` needs no network access
+    along with `synth_attr_config.yaml`, `synth_algo_config.yaml` & `synth_pred_config.yaml`
+    inside `dir_base` if `write_configs`, refer to :func:`write_synth_configs`
+
+    :param dir_base: The base directory of the synthetic data
+    :type dir_base: str | os.PathLike
+    :param n_comids: The number of COMIDs with attributes. All are prediction locations.
+    :type n_comids: int
+    :param n_attrs: The number of attributes
+    :type n_attrs: int
+    :param n_gages: The number of gaged COMIDs with response data, defaults to None meaning all COMIDs
+    :type n_gages: int | None, optional
+    :param ds: The dataset name, defaults to 'synthetic'
+    :type ds: str, optional
+    :param metrics: The standardized metric names, defaults to ('NSE','KGE')
+    :type metrics: Iterable[str], optional
+    :param frac_missing: The fraction of (COMID, attribute) pairs omitted, defaults to 0.0
+    :type frac_missing: float, optional
+    :param frac_dupes: The fraction of attribute rows duplicated, defaults to 0.0
+    :type frac_dupes: float, optional
+    :param seed: The random seed, defaults to 32
+    :type seed: int, optional
+    :param chunk_size: The number of COMIDs generated at once, defaults to 10000
+    :type chunk_size: int, optional
+    :param n_workers: The number of threads writing attribute files, defaults to 1
+    :type n_workers: int, optional
+    :param write_configs: Should the config files be written? defaults to True
+    :type write_configs: bool, optional
+    :return: dict of the `'comids'`, `'gage_ids'`, `'attrs'`, `'dir_db_attrs'`,
+        `'dir_std_base'`, `'path_resp'` & `'configs'` (dict of config paths, empty if not written)
+    :rtype: dict
+    """
+    dir_base = Path(dir_base)
+    dir_db_attrs = dir_base/'input'/'attributes'
+    dir_std_base = dir_base/'input'/'user_data_std'
+    n_gages = n_comids if n_gages is None else min(n_gages, n_comids)
+    metrics = list(metrics)
+
+    dict_attr = gen_synth_attr_db(dir_db_attrs, n_comids, n_attrs, frac_missing=frac_missing,
+                                  frac_dupes=frac_dupes, seed=seed, chunk_size=chunk_size,
+                                  n_workers=n_workers)
+    comids = dict_attr['comids']
+
+    # The gaged locations are spread evenly among all COMIDs
+    idxs_gage = np.linspace(0, n_comids - 1, n_gages).round().astype(int)
+    gage_ids = synth_gage_ids(n_gages)
+    arr_resp = np.concatenate([synth_response(_synth_attr_values(idxs_gage[idx:idx + chunk_size], n_attrs, seed),
+                                              len(metrics), seed=seed)
+                               for idx in range(0, n_gages, chunk_size)]) if n_gages > 0 \
+        else np.empty((0, len(metrics)))
+    print(f"Writing the synthetic {ds} response data of {n_gages} gages to {dir_std_base}")
+    path_resp = write_synth_response(dir_std_base, ds, gage_ids, arr_resp, metrics)
+
+    lon, lat = _synth_coords(comids[idxs_gage])
+    fsate._write_nldi_cache(fsate.std_nldi_cache_path(dir_std_base),
+                            {('nwissite', f'USGS-{gid}'): (comid, x, y) for gid, comid, x, y
+                             in zip(gage_ids, comids[idxs_gage], lon, lat)})
+    write_synth_loc_meta(dir_std_base/ds/f'nldi_feat_{ds}_training.parquet',
+                         comids[idxs_gage], gage_ids)
+    write_synth_loc_meta(dir_std_base/ds/f'nldi_feat_{ds}_prediction.parquet', comids)
+
+    dict_cfig = write_synth_configs(dir_base, ds, dict_attr['attrs'], metrics) if write_configs else dict()
+    return {'comids': comids, 'gage_ids': gage_ids, 'attrs': dict_attr['attrs'],
+            'dir_db_attrs': dir_db_attrs, 'dir_std_base': dir_std_base,
+            'path_resp': path_resp, 'configs': dict_cfig}
@@ -17,8 +17,14 @@ if __name__ == '__main__':
 import unittest
 from unittest.mock import patch, MagicMock, mock_open
 import pandas as pd
+import numpy as np
 import dask.dataframe as dd
 from sklearn.ensemble import RandomForestRegressor
+from sklearn.pipeline import make_pipeline
+import joblib
+import pynhd
+import pyarrow.parquet as pq
+import matplotlib.image
 from sklearn.neural_network import MLPRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score
@@ -26,9 +32,13 @@ import tempfile
 from pathlib import Path
 from fs_algo.fs_algo_train_eval import AlgoTrainEval, AttrConfigAndVars
 from fs_algo import fs_algo_train_eval
+from fs_algo import synth_attr_db
 import warnings
 import xarray as xr
 import os
+import json
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
 
 # %% UNIT TESTING FOR AttrConfigAndVars
 
@@ -116,7 +126,58 @@ class TestFsReadAttrComid(unittest.TestCase):
             fs_algo_train_eval.fs_read_attr_comid(dir_db_attrs=dir_db_attrs,
                                             comids_resp= comids_resp,
                                             attrs_sel= ['nonexistent'])
-            
+
+    def test_fs_read_attr_comid_pushdown(self):
+        print("    Testing fs_read_attr_comid filter pushdown")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for comid in ['1520007','1623207']:
+                pd.DataFrame({'data_source': 'hydroatlas__v1',
+                              'dl_timestamp': '2024-07-26 08:59:36',
+                              'attribute': ['pet_mm_s01', 'cly_pc_sav'],
+                              'value': [58.0, 21.0],
+                              'featureID': comid,
+                              'featureSource': 'COMID'}
+                             ).to_parquet(Path(temp_dir)/f'comid_{comid}_attrs.parquet')
+            with patch('fs_algo.fs_algo_train_eval.dd.read_parquet',
+                       wraps=dd.read_parquet) as mock_read_parquet:
+                result = fs_algo_train_eval.fs_read_attr_comid(dir_db_attrs=temp_dir,
+                                                               comids_resp=[1623207],
+                                                               attrs_sel=['cly_pc_sav'])
+            filters = mock_read_parquet.call_args.kwargs['filters']
+            self.assertIn(('featureID','in',['1623207']), filters)
+            self.assertIn(('attribute','in',['cly_pc_sav']), filters)
+            self.assertEqual(result.shape[0], 1)
+            self.assertEqual(result['featureID'].iloc[0], '1623207')
+
+
+class TestAttrWideMatrix(unittest.TestCase):
+    def setUp(self):
+        self.df_attr = pd.DataFrame({
+            'featureID': ['1','1','2','2','3','3','4'],
+            'attribute': ['a','b','a','b','a','b','a'],
+            'value': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]})
+        self.attr_mat = fs_algo_train_eval.AttrWideMatrix.from_df_attr(self.df_attr)
+
+    def test_matches_pivot(self):
+        df_pivot = self.df_attr.pivot(index='featureID', columns='attribute', values='value')
+        pd.testing.assert_frame_equal(self.attr_mat.wide_df(), df_pivot)
+        sub = ['3','1']
+        pd.testing.assert_frame_equal(self.attr_mat.wide_df(sub), df_pivot.loc[['1','3']])
+
+    def test_contiguous_subset_is_view(self):
+        df_sub = self.attr_mat.wide_df([2,3])
+        self.assertTrue(np.shares_memory(df_sub.to_numpy(), self.attr_mat.arr))
+        self.assertEqual(list(df_sub.index), ['2','3'])
+
+    def test_drop_empty_attrs_and_dtype(self):
+        attr_mat = fs_algo_train_eval.AttrWideMatrix.from_df_attr(self.df_attr, dtype=np.float32)
+        self.assertEqual(attr_mat.arr.dtype, np.float32)
+        # Attribute 'b' is absent for comid 4
+        self.assertEqual(list(attr_mat.wide_df(['4']).columns), ['a'])
+        self.assertEqual(list(attr_mat.wide_df(['4'], drop_empty_attrs=False).columns), ['a','b'])
+        with self.assertWarns(UserWarning):
+            df_sub = attr_mat.wide_df(['1','999'])
+        self.assertEqual(list(df_sub.index), ['1'])
 
 class TestCheckAttributesExist(unittest.TestCase):
     print('Testing _check_attributes_exist')
@@ -139,7 +200,88 @@ class TestCheckAttributesExist(unittest.TestCase):
         mock_pdf_bad.drop(index=0, inplace = True)
         with self.assertWarns(UserWarning):
             fs_algo_train_eval._check_attributes_exist(mock_pdf_bad,pd.Series(['pet_mm_s01','cly_pc_sav']))
-        
+
+class TestFsCompactAttrStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir_db_attrs = Path(self.temp_dir.name)/'attributes'
+        self.dir_db_attrs.mkdir()
+        for comid, vals in {'1520007':[58, 21],'1623207':[65, 32],'1722317':[70, 11]}.items():
+            df = pd.DataFrame({'data_source': 'hydroatlas__v1',
+                               'dl_timestamp': '2024-07-26 08:59:36',
+                               'attribute': ['pet_mm_s01', 'cly_pc_sav'],
+                               'value': vals,
+                               'featureID': comid,
+                               'featureSource': 'COMID'})
+            df.to_parquet(self.dir_db_attrs/f'comid_{comid}_attrs.parquet')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_compact_and_read_store(self):
+        print("    Testing fs_compact_attr_store")
+        dir_store = fs_algo_train_eval.fs_compact_attr_store(self.dir_db_attrs, n_buckets=2)
+        self.assertEqual(dir_store, fs_algo_train_eval.std_attr_store_path(self.dir_db_attrs))
+        self.assertFalse((dir_store/'_staging').exists())
+        df_store = pd.concat([pd.read_parquet(p) for p in dir_store.glob('bucket_*.parquet')])
+        self.assertEqual(df_store.shape[0], 6)
+
+        result = fs_algo_train_eval.fs_read_attr_comid(self.dir_db_attrs, ['1623207'],
+                                                       attrs_sel=['cly_pc_sav'], read_type='store')
+        self.assertEqual(result.shape[0], 1)
+        self.assertEqual(result['value'].iloc[0], 32.0)
+
+        # A second compaction merges with the store rather than duplicating rows
+        fs_algo_train_eval.fs_compact_attr_store(self.dir_db_attrs, n_buckets=8)
+        df_store = pd.concat([pd.read_parquet(p) for p in dir_store.glob('bucket_*.parquet')])
+        self.assertEqual(df_store.shape[0], 6)
+
+    def test_read_store_missing(self):
+        with self.assertRaises(ValueError):
+            fs_algo_train_eval.fs_read_attr_comid(self.dir_db_attrs, ['1623207'], read_type='store')
+
+class TestAttrFileIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir_db_attrs = Path(self.temp_dir.name)
+        for comid in ['1520007','1623207']:
+            pd.DataFrame({'data_source': 'hydroatlas__v1',
+                          'dl_timestamp': '2024-07-26 08:59:36',
+                          'attribute': ['pet_mm_s01'],
+                          'value': [58.0],
+                          'featureID': comid,
+                          'featureSource': 'COMID'}
+                         ).to_parquet(self.dir_db_attrs/f'comid_{comid}_attrs.parquet')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_build_and_lookup(self):
+        print("    Testing the COMID-to-file index")
+        dict_index = fs_algo_train_eval.read_attr_file_index(self.dir_db_attrs)
+        self.assertEqual(dict_index['1520007'], ['comid_1520007_attrs.parquet'])
+        self.assertTrue(fs_algo_train_eval.std_attr_file_index_path(self.dir_db_attrs).exists())
+        self.assertFalse(fs_algo_train_eval._attr_file_index_stale(self.dir_db_attrs))
+
+        result = fs_algo_train_eval.fs_read_attr_comid(self.dir_db_attrs, ['1623207'],
+                                                       read_type='filename')
+        self.assertEqual(result['featureID'].unique().tolist(), ['1623207'])
+
+    def test_incremental_update(self):
+        fs_algo_train_eval.read_attr_file_index(self.dir_db_attrs)
+        path_new = self.dir_db_attrs/'comid_1722317_tfrmattr.parquet'
+        pd.read_parquet(self.dir_db_attrs/'comid_1520007_attrs.parquet').to_parquet(path_new)
+        fs_algo_train_eval.update_attr_file_index(self.dir_db_attrs, [path_new])
+        self.assertFalse(fs_algo_train_eval._attr_file_index_stale(self.dir_db_attrs))
+        with patch('fs_algo.fs_algo_train_eval.build_attr_file_index') as mock_build:
+            dict_index = fs_algo_train_eval.read_attr_file_index(self.dir_db_attrs)
+            mock_build.assert_not_called()
+        self.assertEqual(dict_index['1722317'], ['comid_1722317_tfrmattr.parquet'])
+
+    def test_missing_comid(self):
+        with self.assertWarns(UserWarning):
+            fs_algo_train_eval.fs_read_attr_comid(self.dir_db_attrs, ['010101010'],
+                                                  attrs_sel=['pet_mm_s01'], read_type='filename')
 
 class TestFsRetrNhdpComids(unittest.TestCase):
 
@@ -156,6 +298,96 @@ class TestFsRetrNhdpComids(unittest.TestCase):
         self.assertListEqual(result['comid'].tolist(), ['1722317', '1520007'])
         self.assertEqual(result.columns.tolist(), ['comid', 'geometry'])
 
+class _StubNldiHandler(BaseHTTPRequestHandler):
+    """A local stand-in for the NLDI linked-data navigation service"""
+    features = {'USGS-01031500': ('1722317', [[-69.3, 45.2], [-69.31, 45.21]]),
+                'USGS-08070000': ('1520007', [[-95.1, 30.2], [-95.11, 30.21]])}
+    requests = []
+    def _send_json(self, obj, status=200):
+        body = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body)
+    def do_GET(self):
+        _StubNldiHandler.requests.append(self.path)
+        base = f'http://127.0.0.1:{self.server.server_port}'
+        parts = self.path.split('?')[0].strip('/').split('/')
+        if parts == ['linked-data']:
+            return self._send_json([{'source': 'nwissite', 'sourceName': 'NWIS Surface Water Sites'}])
+        fid = parts[2]
+        if fid not in self.features:
+            return self._send_json({'type': 'error', 'description': f'{fid} not found'}, status=404)
+        url_fid = f'{base}/linked-data/nwissite/{fid}/navigation'
+        if parts[3:] == ['navigation']:
+            return self._send_json({'upstreamMain': f'{url_fid}/UM'})
+        if parts[3:] == ['navigation', 'UM']:
+            return self._send_json([{'source': 'Flowlines', 'sourceName': 'NHDPlus flowlines',
+                                     'features': f'{url_fid}/UM/flowlines'}])
+        comid, coords = self.features[fid]
+        self._send_json({'type': 'FeatureCollection',
+                         'features': [{'type': 'Feature',
+                                       'properties': {'nhdplus_comid': comid},
+                                       'geometry': {'type': 'LineString',
+                                                    'coordinates': coords}}]})
+    def log_message(self, *args):
+        pass
+
+class TestFsRetrNhdpComidsStub(unittest.TestCase):
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), _StubNldiHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        nldi_url = f'http://127.0.0.1:{self.server.server_port}'
+        class _StubNLDI(pynhd.NLDI):
+            def _update_base_url(self):
+                self.base_url = nldi_url
+        self.nldi = _StubNLDI()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path_cache = Path(self.temp_dir.name)/'nldi_comid_cache.csv'
+        _StubNldiHandler.requests.clear()
+        fs_algo_train_eval._NLDI_COMID_CACHE.clear()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+        fs_algo_train_eval._NLDI_COMID_CACHE.clear()
+
+    def test_resolve_and_cache(self):
+        print("    Testing fs_retr_nhdp_comids_geom against a stub NLDI")
+        gage_ids = ["01031500", "08070000", "99999999"]
+        result = fs_algo_train_eval.fs_retr_nhdp_comids_geom('nwissite', 'USGS-{gage_id}', gage_ids,
+                                                             path_cache=self.path_cache,
+                                                             navigate_byid=self.nldi.navigate_byid, backoff=0)
+        self.assertEqual(result.columns.tolist(), ['comid', 'geometry'])
+        self.assertListEqual(result['comid'].tolist()[:2], ['1722317', '1520007'])
+        self.assertTrue(pd.isna(result['comid'].iloc[2]))
+        self.assertEqual(result.geometry.iloc[0].x, -69.3)
+        n_requests = len(_StubNldiHandler.requests)
+        self.assertGreater(n_requests, 0)
+
+        # A repeat run, even in a new process, makes zero network calls
+        fs_algo_train_eval._NLDI_COMID_CACHE.clear()
+        result_rpt = fs_algo_train_eval.fs_retr_nhdp_comids_geom('nwissite', 'USGS-{gage_id}', gage_ids,
+                                                                 path_cache=self.path_cache,
+                                                                 navigate_byid=self.nldi.navigate_byid)
+        self.assertEqual(len(_StubNldiHandler.requests), n_requests)
+        self.assertListEqual(result_rpt['comid'].tolist()[:2], ['1722317', '1520007'])
+        self.assertTrue(pd.isna(result_rpt['comid'].iloc[2]))
+
+    def test_retry_transient(self):
+        calls = []
+        def _navigate_flaky(**kwargs):
+            calls.append(kwargs['fid'])
+            if len(calls) < 3:
+                raise ConnectionError('transient')
+            return self.nldi.navigate_byid(**kwargs)
+        result = fs_algo_train_eval.fs_retr_nhdp_comids_geom('nwissite', 'USGS-{gage_id}', ['01031500'],
+                                                             navigate_byid=_navigate_flaky, backoff=0)
+        self.assertEqual(len(calls), 3)
+        self.assertListEqual(result['comid'].tolist(), ['1722317'])
+
 class TestFindFeatSrceId(unittest.TestCase):
 
     def test_find_feat_srce_id(self):
@@ -258,6 +490,37 @@ class TestOpenResponseDataFs(unittest.TestCase):
 
         with self.assertRaisesRegex(ValueError, 'Could not identify an approach to read in dataset'):
             fs_algo_train_eval._open_response_data_fs(self.dir_std_base,ds='not_a_ds')
+class TestFsReadResponseArrays(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        dat = pd.DataFrame({'gage_id': ['01','02','03','04'],
+                            'basin_name': ['a','b','c','d'],
+                            'NSE': [0.1, 0.2, 0.3, 0.4],
+                            'KGE': [1.0, 2.0, 3.0, 4.0]}).set_index('gage_id').to_xarray()
+        dat.attrs = {'metric_mappings': 'NSE|KGE'}
+        Path(self.tmpdir.name, 'ds').mkdir()
+        # Named as written by fs_proc.proc_eval_metrics.proc_col_schema()
+        dat.to_zarr(Path(self.tmpdir.name, 'ds', 'ds_form_zarr'), consolidated=True)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_all(self):
+        arrs = fs_algo_train_eval.fs_read_response_arrays(self.tmpdir.name, 'ds')
+        self.assertEqual(list(arrs.keys()), ['gage_id','NSE','KGE'])
+        np.testing.assert_array_equal(arrs['KGE'], [1.0, 2.0, 3.0, 4.0])
+
+    def test_subset_aligned(self):
+        arrs = fs_algo_train_eval.fs_read_response_arrays(self.tmpdir.name, 'ds', metrics=['NSE'],
+                                                          gage_ids=['04','missing','02'])
+        self.assertEqual(list(arrs.keys()), ['gage_id','NSE'])
+        np.testing.assert_array_equal(arrs['gage_id'], ['04','missing','02'])
+        np.testing.assert_array_equal(arrs['NSE'], [0.4, np.nan, 0.2])
+
+    def test_missing_metric(self):
+        with self.assertRaisesRegex(ValueError, 'not in the response dataset'):
+            fs_algo_train_eval.fs_read_response_arrays(self.tmpdir.name, 'ds', metrics=['RMSE'])
+
 #%% ALGO TRAIN & EVAL
 class TestStdAlgoPath(unittest.TestCase):
 
@@ -521,6 +784,48 @@ class TestAlgoTrainEvalMlti(unittest.TestCase):
         self.assertEqual(d, {'a': [1, 2], 'b': {'sub1': [3, 4]}})
 
 
+class TestAlgoTrainEvalSearchConfig(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(32)
+        self.df = pd.DataFrame({'attr1': rng.random(60), 'attr2': rng.random(60)})
+        self.df['metric'] = self.df['attr1'] + 0.1*rng.random(60)
+        self.attrs = ['attr1', 'attr2']
+
+    def _train_eval(self, algo_config, search_config):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            train_eval = AlgoTrainEval(df=self.df, attrs=self.attrs, algo_config=algo_config,
+                                       dir_out_alg_ds=temp_dir, dataset_id='test_ds',
+                                       metr='metric', test_size=0.2, rs=32,
+                                       search_config=search_config)
+            train_eval.train_eval()
+        return train_eval
+
+    def test_random_search(self):
+        train_eval = self._train_eval({'rf': [{'n_estimators': [5, 10, 15], 'max_depth': [2, 4]}]},
+                                      {'search_type': 'random', 'n_iter': 3, 'cv': 3})
+        srch = train_eval.algs_dict['rf']['gridsearchcv']
+        self.assertIsInstance(srch, fs_algo_train_eval.RandomizedSearchCV)
+        self.assertEqual(len(srch.cv_results_['params']), 3)
+
+    def test_halving_n_estimators(self):
+        train_eval = self._train_eval({'rf': [{'n_estimators': [4, 12], 'max_depth': [2, 4]}]},
+                                      {'search_type': 'halving_grid', 'resource': 'n_estimators',
+                                       'factor': 3, 'cv': 3})
+        srch = train_eval.algs_dict['rf']['gridsearchcv']
+        self.assertIsInstance(srch, fs_algo_train_eval.HalvingGridSearchCV)
+        self.assertEqual(srch.max_resources_, 12)
+        self.assertIn('rf', train_eval.eval_dict)
+
+    def test_halving_random_n_samples(self):
+        train_eval = self._train_eval({'mlp': [{'hidden_layer_sizes': [(4,), (8,)], 'max_iter': [500]}]},
+                                      {'search_type': 'halving_random', 'resource': 'n_estimators', 'cv': 3})
+        self.assertIsInstance(train_eval.algs_dict['mlp']['pipeline'], fs_algo_train_eval.HalvingRandomSearchCV)
+
+    def test_unrecognized_search_type(self):
+        with self.assertRaises(ValueError):
+            self._train_eval({'rf': [{'n_estimators': [5, 10]}]}, {'search_type': 'bayes'})
+
 class TestAlgoTrainEvalSngl(unittest.TestCase):
     # An algo_config with singular hyperparameter value
     def setUp(self):
@@ -641,8 +946,572 @@ class TestAlgoTrainEvalBasic(unittest.TestCase):
         self.assertIsInstance(self.algo.eval_df, pd.DataFrame)
         self.assertFalse(self.algo.eval_df.empty)
 
+class TestTrainEvalParallelWrap(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        df = pd.DataFrame({
+            'attr1': [1, 2, 3, 4, 5,1, 2, 3, 4, 5,1, 2, 3, 4, 5],
+            'attr2': [5, 4, 3, 2, 1,5, 4, 3, 2, 1,5, 4, 3, 2, 1],
+            'metr1': [10, 15, 20, 25, 30,10, 15, 20, 25, 30,10, 15, 20, 25, 30],
+            'metr2': [0.1, 0.9, 0.3, 0.1, 0.8,0.1, 0.9, 0.3, 0.1, 0.8,0.1, 0.9, 0.3, 0.1, 0.8]
+        })
+        # A grid-search algo config, which AlgoTrainEval modifies in place
+        self.algo_config = {'rf': [{'n_estimators': [5, 10]}]}
+        self.ls_job_kwargs = [{'df': df[['attr1','attr2',metr]],
+                               'attrs': ['attr1','attr2'],
+                               'algo_config': self.algo_config,
+                               'dir_out_alg_ds': self.tmpdir.name,
+                               'dataset_id': 'test_ds',
+                               'metr': metr,
+                               'test_size': 0.2,
+                               'rs': 42} for metr in ['metr1','metr2']]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_parallel_matches_serial(self):
+        ls_srl = fs_algo_train_eval.train_eval_parallel_wrap(self.ls_job_kwargs, n_jobs=1)
+        ls_prl = fs_algo_train_eval.train_eval_parallel_wrap(self.ls_job_kwargs, n_jobs=2)
+        # The shared algo config must remain untouched for every job
+        self.assertEqual(self.algo_config, {'rf': [{'n_estimators': [5, 10]}]})
+        self.assertEqual([te.metric for te in ls_prl], ['metr1','metr2'])
+        for te_srl, te_prl in zip(ls_srl, ls_prl):
+            self.assertIn('rf', te_prl.grid_search_algs)
+            self.assertAlmostEqual(te_srl.eval_dict['rf']['mse'], te_prl.eval_dict['rf']['mse'])
+            path_algo = fs_algo_train_eval.std_algo_path(self.tmpdir.name, 'rf', te_prl.metric, 'test_ds')
+            self.assertTrue(Path(path_algo).exists())
+
+class TestFsPredBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir_db_attrs = Path(self.tmpdir.name)/'attributes'
+        self.dir_db_attrs.mkdir()
+        self.dir_out = Path(self.tmpdir.name)/'output'
+        self.dir_out_alg_ds = self.dir_out/'trained_algorithms'/'test_ds'
+        self.comids = [str(x) for x in range(100, 125)]
+        rng = np.random.default_rng(32)
+        for comid in self.comids:
+            pd.DataFrame({'data_source': 'hydroatlas__v1',
+                          'dl_timestamp': '2024-07-26 08:59:36',
+                          'attribute': ['attr1', 'attr2'],
+                          'value': rng.random(2),
+                          'featureID': comid,
+                          'featureSource': 'COMID'}
+                         ).to_parquet(self.dir_db_attrs/f'comid_{comid}_attrs.parquet')
+        X = pd.DataFrame(rng.random((30,2)), columns=['attr1','attr2'])
+        for metric in ['NSE','KGE']:
+            pipe = make_pipeline(RandomForestRegressor(n_estimators=5, random_state=32))
+            pipe.fit(X, rng.random(30))
+            joblib.dump(pipe, fs_algo_train_eval.std_algo_path(self.dir_out_alg_ds, 'rf', metric, 'test_ds'))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_model_cache(self):
+        model_cache = fs_algo_train_eval.AlgoModelCache(maxsize=1)
+        path_nse = fs_algo_train_eval.std_algo_path(self.dir_out_alg_ds, 'rf', 'NSE', 'test_ds')
+        path_kge = fs_algo_train_eval.std_algo_path(self.dir_out_alg_ds, 'rf', 'KGE', 'test_ds')
+        pipe_nse = model_cache.get(path_nse)
+        self.assertIs(model_cache.get(path_nse), pipe_nse)
+        model_cache.get(path_kge)
+        self.assertEqual(list(model_cache._cache.keys()), [str(path_kge)])
+        with self.assertRaises(FileNotFoundError):
+            model_cache.get(self.dir_out_alg_ds/'missing.joblib')
+
+    def test_uncertainty_columns(self):
+        dir_pred_dataset = fs_algo_train_eval.fs_pred_batch(self.dir_db_attrs, self.comids, ds='test_ds',
+                                                            resp_vars=['NSE'], algos=['rf'],
+                                                            dir_out_alg_ds=self.dir_out_alg_ds, dir_out=self.dir_out,
+                                                            attrs_sel=['attr1','attr2'], chunk_size=10,
+                                                            uncertainty_config={'chunk_size': 4})
+        df_pred = fs_algo_train_eval.read_pred_dataset(self.dir_out, ds='test_ds', metric='NSE', algo='rf')
+        self.assertEqual(df_pred.shape[0], len(self.comids))
+        self.assertTrue(df_pred['pred_var'].notna().all())
+        self.assertTrue((df_pred['pred_lower'] <= df_pred['pred_upper']).all())
+
+    def test_mmap_load(self):
+        df = pd.DataFrame({'attr1': np.linspace(0,1,20), 'attr2': np.linspace(1,0,20),
+                           'NSE': np.linspace(0,1,20)**2})
+        train_eval = AlgoTrainEval(df=df, attrs=['attr1','attr2'],
+                                   algo_config={'mlp': [{'hidden_layer_sizes': (4,), 'max_iter': 500}]},
+                                   dir_out_alg_ds=self.dir_out_alg_ds, dataset_id='mmap_ds',
+                                   metr='NSE', test_size=0.2, rs=32)
+        train_eval.train_eval()
+        path_algo = fs_algo_train_eval.std_algo_path(self.dir_out_alg_ds, 'mlp', 'NSE', 'mmap_ds')
+        model_cache = fs_algo_train_eval.AlgoModelCache(mmap_mode='r')
+        pipe = model_cache.get(path_algo)
+        self.assertIsInstance(pipe.named_steps['mlpregressor'].coefs_[0], np.memmap)
+        np.testing.assert_allclose(pipe.predict(train_eval.X_test),
+                                   train_eval.preds_dict['mlp']['y_pred'])
+
+    def test_chunked_prediction_dataset(self):
+        dir_pred_dataset = fs_algo_train_eval.fs_pred_batch(dir_db_attrs=self.dir_db_attrs,
+                                comids_pred=self.comids, ds='test_ds',
+                                resp_vars=['NSE','KGE'], algos=['rf'],
+                                dir_out_alg_ds=self.dir_out_alg_ds, dir_out=self.dir_out,
+                                attrs_sel=['attr1','attr2'], read_type='filename',
+                                chunk_size=10)
+        # 25 comids in 3 chunks
+        self.assertEqual(len(list(Path(dir_pred_dataset).rglob('*.parquet'))), 6)
+        df_pred = fs_algo_train_eval.read_pred_dataset(self.dir_out, 'test_ds', 'NSE', 'rf')
+        self.assertEqual(sorted(df_pred['comid']), self.comids)
+        # Predictions match a single, unchunked prediction
+        df_attr = fs_algo_train_eval.fs_read_attr_comid(self.dir_db_attrs, self.comids,
+                                                         attrs_sel=['attr1','attr2'])
+        df_attr_wide = df_attr.pivot(index='featureID', columns='attribute', values='value')
+        pipe = joblib.load(fs_algo_train_eval.std_algo_path(self.dir_out_alg_ds, 'rf', 'NSE', 'test_ds'))
+        y_pred = pd.Series(pipe.predict(df_attr_wide), index=df_attr_wide.index)
+        np.testing.assert_allclose(df_pred.set_index('comid')['prediction'].loc[y_pred.index], y_pred.values)
+
+
+    def test_chunks_discover_once(self):
+        with patch('fs_algo.fs_algo_train_eval._attr_db_dataset',
+                   wraps=fs_algo_train_eval._attr_db_dataset) as mock_ds:
+            ls_chunks = list(fs_algo_train_eval.iter_attr_wide_chunks(self.dir_db_attrs, self.comids,
+                                                                      attrs_sel=['attr1','attr2'],
+                                                                      chunk_size=10, read_type='all'))
+        self.assertEqual(mock_ds.call_count, 1)
+        self.assertEqual([df.shape[0] for df in ls_chunks], [10, 10, 5])
+        df_attr = fs_algo_train_eval.fs_read_attr_comid(self.dir_db_attrs, self.comids,
+                                                         attrs_sel=['attr1','attr2'], read_type='filename')
+        df_attr_wide = df_attr.pivot(index='featureID', columns='attribute', values='value')
+        pd.testing.assert_frame_equal(pd.concat(ls_chunks).sort_index(), df_attr_wide.sort_index())
+
+    def test_missing_attribute(self):
+        with self.assertRaises(KeyError):
+            fs_algo_train_eval.fs_pred_batch(self.dir_db_attrs, self.comids, ds='test_ds',
+                                             resp_vars=['NSE'], algos=['rf'],
+                                             dir_out_alg_ds=self.dir_out_alg_ds, dir_out=self.dir_out,
+                                             attrs_sel=['attr1'], chunk_size=10)
+
+    def test_cached_pipeline_n_jobs(self):
+        model_cache = fs_algo_train_eval.AlgoModelCache()
+        path_algo = fs_algo_train_eval.std_algo_path(self.dir_out_alg_ds, 'rf', 'NSE', 'test_ds')
+        pipe = model_cache.get(path_algo)
+        fs_algo_train_eval.fs_pred_batch(self.dir_db_attrs, self.comids, ds='test_ds',
+                                         resp_vars=['NSE'], algos=['rf'],
+                                         dir_out_alg_ds=self.dir_out_alg_ds, dir_out=self.dir_out,
+                                         attrs_sel=['attr1','attr2'], chunk_size=10,
+                                         model_cache=model_cache, n_jobs=2)
+        self.assertIs(model_cache.get(path_algo), pipe)
+        self.assertIsNone(pipe[-1].n_jobs)
+
+class TestComputeBudget(unittest.TestCase):
+
+    @patch('fs_algo.fs_algo_train_eval.joblib.cpu_count', return_value=8)
+    def test_compute_budget(self, mock_cpu_count):
+        budget = fs_algo_train_eval.compute_budget(n_cores=-1, n_jobs_outer=2, blas_threads=None)
+        self.assertEqual(budget, {'n_cores': 8, 'n_jobs_outer': 2, 'n_jobs_inner': 4, 'blas_threads': 1})
+        budget = fs_algo_train_eval.compute_budget(n_cores=6, n_jobs_outer=-1)
+        self.assertEqual(budget['n_jobs_outer'], 6)
+        self.assertEqual(budget['n_jobs_inner'], 1)
+        with self.assertWarns(UserWarning):
+            budget = fs_algo_train_eval.compute_budget(n_cores=16)
+        self.assertEqual(budget['n_cores'], 8)
+
+    def test_estimator_n_jobs(self):
+        rng = np.random.default_rng(32)
+        df = pd.DataFrame({'attr1': rng.random(40), 'attr2': rng.random(40)})
+        df['metric'] = df['attr1']
+        with tempfile.TemporaryDirectory() as temp_dir:
+            train_eval = AlgoTrainEval(df=df, attrs=['attr1', 'attr2'],
+                                       algo_config={'rf': [{'n_estimators': 5}]},
+                                       dir_out_alg_ds=temp_dir, dataset_id='test_ds',
+                                       metr='metric', test_size=0.2, rs=32,
+                                       n_jobs=2, blas_threads=1)
+            train_eval.train_eval()
+            self.assertEqual(train_eval.algs_dict['rf']['algo'].n_jobs, 2)
+
+            train_eval = AlgoTrainEval(df=df, attrs=['attr1', 'attr2'],
+                                       algo_config={'rf': [{'n_estimators': [5, 10]}]},
+                                       dir_out_alg_ds=temp_dir, dataset_id='test_ds',
+                                       metr='metric', test_size=0.2, rs=32,
+                                       n_jobs=2)
+            train_eval.train_eval()
+            srch = train_eval.algs_dict['rf']['gridsearchcv']
+            self.assertEqual(srch.n_jobs, 2)
+            self.assertEqual(srch.best_estimator_.named_steps['randomforestregressor'].n_jobs, 1)
+
+class TestRfUncertainty(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(32)
+        self.X_train = pd.DataFrame(rng.random((40, 2)), columns=['attr1', 'attr2'])
+        self.X_test = pd.DataFrame(rng.random((30, 2)), columns=['attr1', 'attr2'])
+        self.forest = RandomForestRegressor(n_estimators=20, random_state=32)
+        self.forest.fit(self.X_train, self.X_train['attr1'] + 0.1*rng.random(40))
+
+    def test_chunked_matches_forestci(self):
+        var_fci = fs_algo_train_eval.fci.random_forest_error(self.forest, self.X_train.shape,
+                                                             self.X_test, calibrate=False)
+        var_chunk = fs_algo_train_eval.rf_uncertainty_chunked(self.forest, self.X_test, chunk_size=7,
+                                                              calibrate=False, n_jobs=2)
+        np.testing.assert_allclose(var_chunk, var_fci)
+
+    def test_calibrated(self):
+        var = fs_algo_train_eval.rf_uncertainty_chunked(self.forest, self.X_test, chunk_size=7,
+                                                        random_state=32)
+        self.assertEqual(var.shape, (30,))
+        self.assertTrue(np.all(var >= 0))
+        y_pred = self.forest.predict(self.X_test)
+        y_lower, y_upper = fs_algo_train_eval.rf_pred_interval(y_pred, var, ci_level=0.9)
+        self.assertTrue(np.all(y_lower <= y_pred) and np.all(y_pred <= y_upper))
+
+    def test_train_eval_uncertainty(self):
+        df = self.X_train.assign(metric=self.X_train['attr1'])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            train_eval = AlgoTrainEval(df=df, attrs=['attr1', 'attr2'],
+                                       algo_config={'rf': [{'n_estimators': 10}]},
+                                       dir_out_alg_ds=temp_dir, dataset_id='test_ds',
+                                       metr='metric', test_size=0.5, rs=32,
+                                       uncertainty_config={'chunk_size': 5, 'ci_level': 0.9})
+            train_eval.train_eval()
+        preds = train_eval.preds_dict['rf']
+        self.assertEqual(len(preds['y_var']), len(preds['y_pred']))
+        self.assertTrue(np.all(preds['y_lower'] <= preds['y_upper']))
+
+class TestAlgoEvalPlotLC(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(32)
+        self.X = pd.DataFrame(rng.random((50, 2)), columns=['attr1', 'attr2'])
+        self.y = self.X['attr1'] + 0.1*rng.random(50)
+        self.algo_plot = fs_algo_train_eval.AlgoEvalPlotLC(self.X, self.y)
+        self.train_sizes = np.linspace(0.3, 1.0, 3)
+
+    def test_cached_learning_curve(self):
+        pipe = make_pipeline(RandomForestRegressor(n_estimators=5, random_state=32))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path_cache = Path(temp_dir)/'lc.npz'
+            self.algo_plot.gen_learning_curve(pipe, cv=3, n_jobs=1, train_sizes=self.train_sizes,
+                                              path_cache=path_cache)
+            self.assertTrue(path_cache.exists())
+            valid_mean = self.algo_plot.valid_mean_lc.copy()
+            # Regenerating from the cache does not refit
+            with patch('fs_algo.fs_algo_train_eval.learning_curve') as mock_lc:
+                self.algo_plot.gen_learning_curve(pipe, cv=3, n_jobs=1, train_sizes=self.train_sizes,
+                                                  path_cache=path_cache)
+                mock_lc.assert_not_called()
+            np.testing.assert_allclose(self.algo_plot.valid_mean_lc, valid_mean)
+            # A different model configuration invalidates the cache
+            pipe_new = make_pipeline(RandomForestRegressor(n_estimators=6, random_state=32))
+            self.algo_plot.gen_learning_curve(pipe_new, cv=3, n_jobs=1, train_sizes=self.train_sizes,
+                                              path_cache=path_cache)
+            self.assertFalse(np.allclose(self.algo_plot.valid_mean_lc, valid_mean))
+
+    def test_shared_folds_incremental(self):
+        mlp = MLPRegressor(hidden_layer_sizes=(4,), solver='adam', max_iter=50, random_state=32)
+        with patch('fs_algo.fs_algo_train_eval.learning_curve',
+                   wraps=fs_algo_train_eval.learning_curve) as mock_lc:
+            self.algo_plot.gen_learning_curve(mlp, cv=3, n_jobs=1, train_sizes=self.train_sizes)
+            self.algo_plot.gen_learning_curve(mlp, cv=3, n_jobs=1, train_sizes=self.train_sizes,
+                                              exploit_incremental_learning=True)
+            self.algo_plot.gen_learning_curve(make_pipeline(RandomForestRegressor(n_estimators=5)),
+                                              cv=3, n_jobs=1, train_sizes=self.train_sizes,
+                                              exploit_incremental_learning=True)
+        kwargs_mlp, kwargs_mlp_inc, kwargs_rf = [call.kwargs for call in mock_lc.call_args_list]
+        # Incremental learning is opt-in, and only applies to estimators with partial_fit
+        self.assertFalse(kwargs_mlp['exploit_incremental_learning'])
+        self.assertTrue(kwargs_mlp_inc['exploit_incremental_learning'])
+        self.assertFalse(kwargs_rf['exploit_incremental_learning'])
+        self.assertIs(kwargs_mlp['cv'], kwargs_rf['cv'])
+        self.assertEqual(len(self.algo_plot.cv_splits[3]), 3)
+
+class TestCorrAttrsThrTable(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(32)
+        base = rng.random((40, 3))
+        # Attributes that are correlated with one of the base attributes
+        X = np.hstack([base, base + 0.05*rng.random((40, 3)), -base[:, :2], rng.random((40, 2))])
+        self.df_X = pd.DataFrame(X, columns=[f'attr{i}' for i in range(X.shape[1])])
+        self.df_X['const'] = 1.0
+
+    def _dense_pairs(self, df_X, corr_thr):
+        df_corr = df_X.corr()
+        return {(a, b): df_corr.loc[a, b] for i, a in enumerate(df_corr.columns)
+                for b in df_corr.columns[i+1:] if abs(df_corr.loc[a, b]) > corr_thr}
+
+    def test_blockwise_matches_dense(self):
+        df_corr_rslt = fs_algo_train_eval.corr_attrs_thr_table(self.df_X, corr_thr=0.8, block_size=3)
+        dict_pairs = {(a, b): c for a, b, c in df_corr_rslt.itertuples(index=False)}
+        dict_dense = self._dense_pairs(self.df_X, 0.8)
+        self.assertEqual(set(dict_pairs), set(dict_dense))
+        for pair, corr in dict_dense.items():
+            self.assertAlmostEqual(dict_pairs[pair], corr)
+
+    def test_float32_and_na(self):
+        df_corr_rslt = fs_algo_train_eval.corr_attrs_thr_table(self.df_X, corr_thr=0.8, block_size=4,
+                                                               dtype=np.float32)
+        self.assertEqual(df_corr_rslt.shape[0], len(self._dense_pairs(self.df_X, 0.8)))
+        df_X_na = self.df_X.copy()
+        df_X_na.iloc[0, 0] = np.nan
+        df_corr_rslt = fs_algo_train_eval.corr_attrs_thr_table(df_X_na, corr_thr=0.8)
+        self.assertEqual(set(zip(df_corr_rslt['attr1'], df_corr_rslt['attr2'])),
+                         set(self._dense_pairs(df_X_na, 0.8)))
+
+    def test_plot_sparse_corr_mat(self):
+        df_corr_rslt = fs_algo_train_eval.corr_attrs_thr_table(self.df_X, corr_thr=0.8)
+        fig = fs_algo_train_eval.plot_corr_mat(self.df_X, df_corr_rslt=df_corr_rslt, max_attrs=5)
+        attrs_plot = [lbl.get_text() for lbl in fig.axes[0].get_xticklabels()]
+        self.assertNotIn('const', attrs_plot)
+        fs_algo_train_eval.plt.close(fig)
+        # The sparse correlation matrix is compatible with copy-on-write
+        with pd.option_context('mode.copy_on_write', True):
+            fig = fs_algo_train_eval.plot_corr_mat(self.df_X, df_corr_rslt=df_corr_rslt, max_attrs=5)
+        arr_plot = fig.axes[0].collections[0].get_array()
+        self.assertGreater(np.sum(~np.ma.getmaskarray(arr_plot)), len(attrs_plot))
+        fs_algo_train_eval.plt.close(fig)
+
+class TestPcaStdscaledTfrm(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(32)
+        latent = rng.random((60, 2))
+        X = latent @ rng.random((2, 8)) + 0.01*rng.random((60, 8))
+        self.df_X = pd.DataFrame(X, columns=[f'attr{i}' for i in range(8)])
+
+    def test_full_var_thr(self):
+        pca_full = fs_algo_train_eval.pca_stdscaled_tfrm(self.df_X)
+        self.assertEqual(pca_full.n_components_, 8)
+        pca_thr = fs_algo_train_eval.pca_stdscaled_tfrm(self.df_X, var_thr=0.95)
+        self.assertLess(pca_thr.n_components_, 8)
+        self.assertGreaterEqual(np.sum(pca_thr.explained_variance_ratio_), 0.95)
+        np.testing.assert_allclose(pca_thr.explained_variance_ratio_,
+                                   pca_full.explained_variance_ratio_[:pca_thr.n_components_])
+
+    def test_randomized_incremental(self):
+        pca_full = fs_algo_train_eval.pca_stdscaled_tfrm(self.df_X)
+        pca_rand = fs_algo_train_eval.pca_stdscaled_tfrm(self.df_X, pca_type='randomized', n_components=1,
+                                                         var_thr=0.95, random_state=32)
+        self.assertGreaterEqual(np.sum(pca_rand.explained_variance_ratio_), 0.95)
+        pca_inc = fs_algo_train_eval.pca_stdscaled_tfrm(self.df_X, pca_type='incremental', batch_size=20)
+        np.testing.assert_allclose(pca_inc.explained_variance_ratio_[:2],
+                                   pca_full.explained_variance_ratio_[:2], rtol=1e-3)
+        with self.assertRaises(ValueError):
+            fs_algo_train_eval.pca_stdscaled_tfrm(self.df_X, pca_type='sparse')
+
+    def test_save_wrap_random_state(self):
+        with tempfile.TemporaryDirectory() as temp_dir, \
+            patch('fs_algo.fs_algo_train_eval.pca_stdscaled_tfrm',
+                  wraps=fs_algo_train_eval.pca_stdscaled_tfrm) as mock_pca:
+            fs_algo_train_eval.plot_pca_save_wrap(self.df_X, temp_dir, 'test_ds',
+                                                  pca_config={'pca_type': 'randomized', 'random_state': 32})
+        self.assertEqual(mock_pca.call_args.kwargs['pca_type'], 'randomized')
+        self.assertEqual(mock_pca.call_args.kwargs['random_state'], 32)
+
+class TestGenConusBasemap(unittest.TestCase):
+
+    def setUp(self):
+        from shapely.geometry import box
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir_src = Path(self.tmpdir.name)/'src'
+        self.dir_src.mkdir()
+        gdf = fs_algo_train_eval.gpd.GeoDataFrame({'NAME': ['A', 'B']},
+                                                  geometry=[box(0, 0, 1e5, 1e5), box(1e5, 0, 2e5, 1e5)],
+                                                  crs='EPSG:3857')
+        gdf.to_file(self.dir_src/'states.shp')
+        self.dir_out = Path(self.tmpdir.name)/'data_visualizations'
+        fs_algo_train_eval._BASEMAP_MEMO.clear()
+
+    def tearDown(self):
+        fs_algo_train_eval._BASEMAP_MEMO.clear()
+        self.tmpdir.cleanup()
+
+    @patch('fs_algo.fs_algo_train_eval.urllib.request.urlretrieve', side_effect=OSError('offline'))
+    def test_cache_offline(self, mock_urlretrieve):
+        states = fs_algo_train_eval.gen_conus_basemap(self.dir_out, fn_basemap='states.shp',
+                                                      path_local=self.dir_src/'states.shp')
+        self.assertEqual(states.crs.to_epsg(), 4326)
+        path_cache = fs_algo_train_eval.std_basemap_cache_path(self.dir_out, 'states.shp', 0.005)
+        self.assertTrue(path_cache.exists())
+        # The same process reuses the basemap in memory
+        with patch('fs_algo.fs_algo_train_eval.gpd.read_parquet') as mock_read:
+            fs_algo_train_eval.gen_conus_basemap(self.dir_out, fn_basemap='states.shp')
+            mock_read.assert_not_called()
+        # A new process reads the cached GeoParquet without a download
+        fs_algo_train_eval._BASEMAP_MEMO.clear()
+        states_cache = fs_algo_train_eval.gen_conus_basemap(self.dir_out, fn_basemap='states.shp')
+        self.assertEqual(list(states_cache['NAME']), ['A', 'B'])
+        mock_urlretrieve.assert_not_called()
+
+class TestPlotQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir_out_viz_base = Path(self.tmpdir.name)/'data_visualizations'
+        self.dir_payloads = fs_algo_train_eval.std_plot_payload_dir(self.dir_out_viz_base)
+        self.kwargs_feat_imp = {'feat_imprt': np.array([0.7, 0.3]), 'attrs': ['attr1', 'attr2'],
+                                'dir_out_viz_base': self.dir_out_viz_base, 'ds': 'test_ds', 'metr': 'NSE'}
+        self.path_feat_imp = fs_algo_train_eval.std_feat_imp_plot_path(self.dir_out_viz_base, 'test_ds', 'NSE')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_render_workers(self):
+        with fs_algo_train_eval.PlotQueue(self.dir_payloads, n_workers=1) as plot_queue:
+            path_payload = plot_queue.submit('feat_imp', **self.kwargs_feat_imp)
+            plot_queue.submit('pred_vs_obs', y_pred=np.array([0.1, 0.5, 0.9]), y_obs=np.array([0.2, 0.4, 0.8]),
+                              dir_out_viz_base=self.dir_out_viz_base, ds='test_ds', metr='NSE', algo_str='rf')
+        self.assertTrue(path_payload.exists())
+        self.assertTrue(self.path_feat_imp.exists())
+        self.assertTrue(fs_algo_train_eval.std_regr_pred_obs_path(self.dir_out_viz_base, 'test_ds',
+                                                                  'NSE', 'rf').exists())
+
+    def test_regenerate_payloads(self):
+        plot_queue = fs_algo_train_eval.PlotQueue(self.dir_payloads, render=False)
+        plot_queue.submit('feat_imp', **self.kwargs_feat_imp)
+        self.assertEqual(plot_queue.wait(), [])
+        self.assertFalse(self.path_feat_imp.exists())
+        ls_failed = fs_algo_train_eval.render_plot_payloads(self.dir_payloads, n_workers=0)
+        self.assertEqual(ls_failed, [])
+        self.assertTrue(self.path_feat_imp.exists())
+        with self.assertRaises(ValueError):
+            plot_queue.submit('histogram', data=[1, 2])
+
+    def test_style_workers(self):
+        path_style = Path(self.tmpdir.name)/'test.mplstyle'
+        path_style.write_text('figure.dpi: 17\n')
+        with fs_algo_train_eval.PlotQueue(self.dir_payloads, n_workers=1, style_path=path_style) as plot_queue:
+            path_payload = plot_queue.submit('feat_imp', **self.kwargs_feat_imp)
+        self.assertEqual(joblib.load(path_payload)['style_path'], str(path_style))
+        # The 10x6 inch figure is saved at the style's dpi
+        self.assertEqual(matplotlib.image.imread(self.path_feat_imp).shape[:2], (102, 170))
+
+    def test_corr_pca_small_payloads(self):
+        rng = np.random.default_rng(32)
+        df_X = pd.DataFrame(rng.normal(size=(200, 3)), columns=['attr1', 'attr2', 'attr3'])
+        pca_scaled = fs_algo_train_eval.pca_stdscaled_tfrm(df_X)
+        plot_queue = fs_algo_train_eval.PlotQueue(self.dir_payloads, n_workers=0)
+        path_corr = plot_queue.submit('corr_mat', df_corr=fs_algo_train_eval.corr_mat_plot_df(df_X),
+                                      title='Correlation matrix', dir_out_viz_base=self.dir_out_viz_base,
+                                      ds='test_ds')
+        path_pca = plot_queue.submit('pca', explained_variance_ratio=pca_scaled.explained_variance_ratio_,
+                                     dir_out_viz_base=self.dir_out_viz_base, ds='test_ds')
+        # Only the correlation matrix & explained variance are saved, not the attribute data
+        self.assertEqual(joblib.load(path_corr)['kwargs']['df_corr'].shape, (3, 3))
+        self.assertEqual(joblib.load(path_pca)['kwargs']['explained_variance_ratio'].shape, (3,))
+        self.assertTrue(fs_algo_train_eval.std_corr_mat_plot_path(self.dir_out_viz_base, 'test_ds').exists())
+        for cstm_str in ['std_scaled', 'cumulative_var_std_scaled']:
+            self.assertTrue(fs_algo_train_eval.std_pca_plot_path(self.dir_out_viz_base, 'test_ds',
+                                                                 cstm_str=cstm_str).exists())
+
+class TestAlgoTrainEvalSkipUnchanged(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.df = pd.DataFrame({
+            'attr1': [1, 2, 3, 4, 5,1, 2, 3, 4, 5],
+            'attr2': [5, 4, 3, 2, 1,5, 4, 3, 2, 1],
+            'metr1': [10, 15, 20, 25, 30,11, 16, 21, 26, 31]
+        })
+        self.algo_config = {'rf': [{'n_estimators': 10}],
+                            'mlp': [{'hidden_layer_sizes': (4,)}, {'max_iter': 200}]}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _train_eval(self, algo_config, df=None):
+        return fs_algo_train_eval._train_eval_job(df=self.df if df is None else df,
+                                                  attrs=['attr1','attr2'],
+                                                  algo_config=algo_config,
+                                                  dir_out_alg_ds=self.tmpdir.name,
+                                                  dataset_id='test_ds', metr='metr1',
+                                                  test_size=0.2, rs=42, skip_unchanged=True)
+
+    def test_reuse_unchanged(self):
+        te_first = self._train_eval(self.algo_config)
+        self.assertEqual(te_first.algs_reused, [])
+        path_algo = fs_algo_train_eval.std_algo_path(self.tmpdir.name, 'rf', 'metr1', 'test_ds')
+        path_fprt = fs_algo_train_eval.std_algo_fingerprint_path(path_algo)
+        self.assertTrue(path_fprt.exists())
+        mtime_algo = Path(path_algo).stat().st_mtime_ns
+
+        with patch.object(AlgoTrainEval, 'train_algos') as mock_train:
+            te_second = self._train_eval(self.algo_config)
+        mock_train.assert_not_called()
+        self.assertEqual(sorted(te_second.algs_reused), ['mlp','rf'])
+        self.assertEqual(Path(path_algo).stat().st_mtime_ns, mtime_algo)
+        self.assertIsInstance(te_second.algs_dict['rf']['algo'], RandomForestRegressor)
+        for algo in ['rf','mlp']:
+            self.assertAlmostEqual(te_first.eval_dict[algo]['mse'], te_second.eval_dict[algo]['mse'])
+        self.assertListEqual(list(te_second.eval_df['file_pipe']), list(te_first.eval_df['file_pipe']))
+
+    def test_retrain_changed(self):
+        self._train_eval(self.algo_config)
+        # Only the algorithm whose config changed is retrained
+        algo_config_new = {'rf': [{'n_estimators': 20}],
+                           'mlp': [{'hidden_layer_sizes': (4,)}, {'max_iter': 200}]}
+        te_cfg = self._train_eval(algo_config_new)
+        self.assertEqual(te_cfg.algs_reused, ['mlp'])
+        self.assertEqual(te_cfg.algs_dict['rf']['algo'].n_estimators, 20)
+        # Changed response data retrain every algorithm
+        df_new = self.df.assign(metr1=self.df['metr1'] + 1)
+        te_data = self._train_eval(algo_config_new, df=df_new)
+        self.assertEqual(te_data.algs_reused, [])
+
+class TestSynthAttrDb(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir_base = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_attr_db_schema(self):
+        dir_db_attrs = self.dir_base/'attributes'
+        dict_attr = synth_attr_db.gen_synth_attr_db(dir_db_attrs, 25, 6, frac_dupes=0.2,
+                                                    chunk_size=10, n_workers=2)
+        self.assertEqual(len(list(dir_db_attrs.glob('comid_*_attr.parquet'))), 25)
+        path_file = dir_db_attrs/f"comid_{dict_attr['comids'][0]}_attr.parquet"
+        # The schema of the proc.attr.hydfab attribute files
+        schema_hydfab = pq.read_schema(Path(__file__).resolve().parents[3]/'proc.attr.hydfab'/'inst'/'extdata'/
+                                       'attributes_pah'/'comid_1623207_attrs.parquet')
+        self.assertTrue(pq.read_schema(path_file).equals(schema_hydfab))
+        df_file = pd.read_parquet(path_file)
+        self.assertTrue(pd.to_datetime(df_file['dl_timestamp'], format='%Y-%m-%d %H:%M:%S').notna().all())
+        df_all = pd.read_parquet(dir_db_attrs)
+        self.assertEqual(df_all.shape[0], dict_attr['n_rows'])
+        self.assertTrue(df_all[['featureID','attribute']].duplicated().any())
+        # Duplicates are removed when read
+        df_attr = fs_algo_train_eval.fs_read_attr_comid(dir_db_attrs, dict_attr['comids'],
+                                                        read_type='filename')
+        self.assertEqual(df_attr.shape[0], 25 * 6)
+
+    def test_deterministic_missing(self):
+        dir_a, dir_b = self.dir_base/'a', self.dir_base/'b'
+        synth_attr_db.gen_synth_attr_db(dir_a, 20, 5, frac_missing=0.2, chunk_size=7)
+        synth_attr_db.gen_synth_attr_db(dir_b, 20, 5, frac_missing=0.2, chunk_size=20, n_workers=2)
+        df_a = pd.read_parquet(dir_a)
+        df_b = pd.read_parquet(dir_b)
+        self.assertLess(df_a.shape[0], 20 * 5)
+        # Attribute values do not depend on the chunking
+        df_ab = df_a.merge(df_b, on=['featureID','attribute'])
+        np.testing.assert_array_equal(df_ab['value_x'].values, df_ab['value_y'].values)
+
+    def test_dataset_offline(self):
+        dict_synth = synth_attr_db.gen_synth_dataset(self.dir_base, n_comids=30, n_attrs=5,
+                                                     n_gages=10, metrics=['NSE','KGE'])
+        dir_std_base = dict_synth['dir_std_base']
+        dat_resp = fs_algo_train_eval._open_response_data_fs(dir_std_base, 'synthetic')
+        self.assertEqual(dat_resp.attrs['metric_mappings'], 'NSE|KGE')
+        self.assertEqual(dat_resp['gage_id'].size, 10)
+        # The gage ids resolve to comids from the cache, without querying NLDI
+        with patch('fs_algo.fs_algo_train_eval._nldi_navigate_comid',
+                   side_effect=AssertionError('NLDI queried')):
+            gdf_comid = fs_algo_train_eval.fs_retr_nhdp_comids_geom(
+                'nwissite', 'USGS-{gage_id}', dat_resp['gage_id'].values,
+                path_cache=fs_algo_train_eval.std_nldi_cache_path(dir_std_base))
+        self.assertTrue(set(gdf_comid['comid']).issubset(set(dict_synth['comids'])))
+        comids_pred = fs_algo_train_eval._read_pred_comid(
+            dir_std_base/'synthetic'/'nldi_feat_synthetic_prediction.parquet', 'comid')
+        self.assertListEqual(comids_pred, dict_synth['comids'].tolist())
+        attr_cfig = AttrConfigAndVars(dict_synth['configs']['attr'])
+        attr_cfig._read_attr_config()
+        self.assertEqual(attr_cfig.attrs_cfg_dict['attrs_sel'], dict_synth['attrs'])
+        self.assertEqual(Path(attr_cfig.attrs_cfg_dict['dir_db_attrs']), dict_synth['dir_db_attrs'])
+        dat_resp.close()
 
 if __name__ == '__main__':
     unittest.main()
 
-# %%
\ No newline at end of file
+# %%
@@ -19,6 +19,8 @@ import fs_algo.tfrm_attr as fta
 import unittest
 import dask.dataframe as dd
 import os
+import numpy as np
+import tempfile
 from fs_algo.tfrm_attr import _id_need_tfrm_attrs, _gen_tform_df
 
 def test_read_df_ext_csv():
@@ -265,6 +267,66 @@ def test_multiple_featureIDs():
     else:
         raise AssertionError("Expected ValueError to be raised")
 
+#%% Tests for the bulk attribute transformation engine
+def _std_attr_df_bulk():
+    return pd.DataFrame({'data_source': 'hydroatlas__v1',
+                         'dl_timestamp': '2024-07-26 08:59:36',
+                         'attribute': ['attr1','attr2','attr1','attr2','attr1'],
+                         'value': [1.0, 3.0, 10.0, 20.0, 5.0],
+                         'featureID': ['111','111','222','222','333'],
+                         'featureSource': 'COMID'})
+
+def test_vect_tform_func():
+    arr = np.array([[1.0, 3.0],[10.0, 20.0]])
+    assert list(fta._vect_tform_func(sum, arr)) == [4.0, 30.0]
+    assert list(fta._vect_tform_func(max, arr)) == [3.0, 20.0]
+    assert list(fta._vect_tform_func(np.mean, arr)) == [2.0, 15.0]
+    # Functions without an axis argument are applied row-by-row
+    assert list(fta._vect_tform_func(lambda x: x[0] - x[1], arr)) == [-2.0, -10.0]
+
+def test_tfrm_attrs_bulk():
+    df_attr = _std_attr_df_bulk()
+    dict_retr_vars = {'attr_sum': ['attr1','attr2'], 'attr_mean': ['attr1','attr2']}
+    dict_func_objs = {'attr_sum': sum, 'attr_mean': np.mean}
+    dict_tfrm_func = {'attr_sum': 'sum', 'attr_mean': 'np.mean'}
+    df_new = fta.tfrm_attrs_bulk(df_attr, dict_retr_vars, dict_func_objs, dict_tfrm_func)
+    # comid 333 is missing attr2, so is skipped
+    assert set(df_new['featureID']) == {'111','222'}
+    df_sum = df_new[df_new['attribute'] == 'attr_sum'].set_index('featureID')
+    assert df_sum.loc['222','value'] == 30.0
+    assert df_sum.loc['111','data_source'] == 'sum([attr1,attr2])'
+    assert list(df_new.columns) == ['data_source','dl_timestamp','attribute','value','featureID','featureSource']
+
+    # Only create what is needed
+    df_exst = pd.concat([df_attr, df_new[df_new['featureID'] == '111']])
+    dict_need = fta._id_need_tfrm_attrs_bulk(df_exst, ['111','222','333'],
+                                             {'attr_sum': 'sum([attr1,attr2])',
+                                              'attr_mean': 'np.mean([attr1,attr2])'})
+    assert list(dict_need['attr_sum']) == ['222','333']
+    df_new_need = fta.tfrm_attrs_bulk(df_attr, dict_retr_vars, dict_func_objs, dict_tfrm_func,
+                                      dict_need_comids=dict_need)
+    assert set(df_new_need['featureID']) == {'222'}
+
+def test_io_std_attrs_bulk():
+    df_new = fta.tfrm_attrs_bulk(_std_attr_df_bulk(), {'attr_sum': ['attr1','attr2']},
+                                 {'attr_sum': sum}, {'attr_sum': 'sum'})
+    with tempfile.TemporaryDirectory() as dir_db_attrs:
+        ls_paths = fta.io_std_attrs_bulk(df_new, dir_db_attrs)
+        assert len(ls_paths) == 2
+        assert pd.read_parquet(Path(dir_db_attrs)/'comid_222_tfrmattr.parquet')['value'].iloc[0] == 30.0
+        assert fsate.read_attr_file_index(dir_db_attrs)['111'] == ['comid_111_tfrmattr.parquet']
+
+def test_id_missing_comid_attrs():
+    df_missing = fta.id_missing_comid_attrs(_std_attr_df_bulk(), comids=[111, '222', '333', '444'],
+                                            attrs=['attr1','attr2'], path_tfrm_cfig='/path/to/tfrm.yaml')
+    assert list(df_missing.columns) == ['comid','attribute','config_file','uniq_cmbo','dl_dataset']
+    assert set(df_missing['uniq_cmbo']) == {'333_attr2','444_attr1','444_attr2'}
+    assert (df_missing['config_file'] == 'tfrm.yaml').all()
+    # Scales to many locations via the presence matrix
+    comids = [str(x) for x in range(100000)]
+    df_missing_lrg = fta.id_missing_comid_attrs(_std_attr_df_bulk(), comids=comids, attrs=['attr1','attr2'])
+    assert df_missing_lrg.shape[0] == 2*len(comids) - 5
+
 def run_tests():
     try:
         run_tests_std_attrs()
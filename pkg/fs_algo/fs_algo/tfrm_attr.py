@@ -132,7 +132,8 @@ def _std_attr_filepath(dir_db_attrs: str | os.PathLike,
 def io_std_attrs(df_new_vars: pd.DataFrame,
                     dir_db_attrs:str | os.PathLike,
                     comid:str, 
-                    attrtype:str)->pd.DataFrame:
+                    attrtype:str,
+                    update_index:bool=True)->pd.DataFrame:
     """Write/update attributes corresponding to a single comid location
 
     :param df_new_vars: The new variables corresponding to a catchment
@@ -143,6 +144,9 @@ def io_std_attrs(df_new_vars: pd.DataFrame,
     :type comid: str
     :param attrtype: The type of attribute data. Expected to be 'attr', 'tfrmattr', or 'cstmattr'
     :type attrtype: str
+    :param update_index: Should a newly-written file be added to the COMID-to-file index?
+      Batch writers set False and update the index once. Default True.
+    :type update_index: bool, optional
     :return: The full attribute dataframe for a given catchment
     :rtype: pd.DataFrame
     """
@@ -153,7 +157,8 @@ def io_std_attrs(df_new_vars: pd.DataFrame,
                         comid=comid,
                         attrtype = 'tfrmattr')
         
-        if path_tfrm_comid.exists():
+        is_new_file = not path_tfrm_comid.exists()
+        if not is_new_file:
             print(f"Updating {path_tfrm_comid}")
             df_exst_vars_tfrm = pd.read_parquet(path_tfrm_comid)
             # Append new variables
@@ -162,8 +167,13 @@ def io_std_attrs(df_new_vars: pd.DataFrame,
             df_new_vars = fsate._check_attr_rm_dupes(df_new_vars, ascending = False)
         else:
             print(f"Writing {path_tfrm_comid}")
+            if update_index:
+                # Bring the COMID-to-file index up to date before the new file changes the directory
+                fsate.read_attr_file_index(dir_db_attrs)
         
         df_new_vars.to_parquet(path_tfrm_comid,index=False)
+        if is_new_file and update_index:
+            fsate.update_attr_file_index(dir_db_attrs, [path_tfrm_comid])
         
     return df_new_vars
 
@@ -363,6 +373,147 @@ def _id_need_tfrm_attrs(all_attr_ddf: dd.DataFrame,
     return dict_need_vars_funcs
 
 
+#%%                      BULK ATTRIBUTE TRANSFORMATION
+def _vect_tform_func(func: Callable, arr: np.ndarray) -> np.ndarray:
+    """Apply a transformation function across each row of a 2D array at once
+
+    :param func: The transformation function object, e.g. from :func:`_get_function_from_string`
+    :type func: Callable
+    :param arr: The attribute values, with one row per location and one column per attribute
+    :type arr: np.ndarray
+    :return: The transformed value for each location (row)
+    :rtype: np.ndarray
+
+    note:: Builtins without an `axis` argument (e.g. sum, max, min) are mapped to their
+    numpy equivalents. Any other function without an `axis` argument is applied row by row.
+    """
+    func_vect = {sum: np.sum, max: np.max, min: np.min}.get(func, func)
+    try:
+        vals = np.asarray(func_vect(arr, axis=1), dtype=float)
+        if vals.shape == (arr.shape[0],):
+            return vals
+    except TypeError:
+        pass
+    return np.array([func(row) for row in arr], dtype=float)
+
+def _id_need_tfrm_attrs_bulk(df_attr: pd.DataFrame, comids: Iterable,
+                             dict_cstm_func: dict, overwrite_tfrm: bool = False) -> dict:
+    """Identify the locations needing each custom attribute, for all locations at once
+
+    Like :func:`_id_need_tfrm_attrs`, a transformation is considered to exist when
+    the transformation function identifier appears in a location's 'data_source' column.
+
+    :param df_attr: Standard long-format attribute data for all locations of interest,
+      including any previously-transformed attributes
+    :type df_attr: pd.DataFrame
+    :param comids: All location identifiers (comids) of interest
+    :type comids: Iterable
+    :param dict_cstm_func: The transformation function identifier of each custom variable name,
+      i.e. 'dict_cstm_func' from :func:`_retr_cstm_funcs`
+    :type dict_cstm_func: dict
+    :param overwrite_tfrm: Should existing transformations be recreated? defaults to False
+    :type overwrite_tfrm: bool, optional
+    :return: dict of each custom variable name and the pd.Index of comids needing it
+    :rtype: dict
+    """
+    comids = pd.Index([str(x) for x in comids]).unique()
+    if overwrite_tfrm:
+        return {new_var: comids for new_var in dict_cstm_func.keys()}
+    df_srcs = df_attr[['featureID','data_source']].drop_duplicates()
+    return {new_var: comids.difference(df_srcs.loc[df_srcs['data_source'] == cstm_func,'featureID'])
+            for new_var, cstm_func in dict_cstm_func.items()}
+
+def tfrm_attrs_bulk(df_attr: pd.DataFrame, dict_retr_vars: dict,
+                    dict_func_objs: dict, dict_tfrm_func: dict,
+                    dict_need_comids: dict = None) -> pd.DataFrame:
+    """Create custom attributes for all locations in one vectorized pass
+
+    The standard long-format attribute data are pivoted into a wide matrix of
+    locations by attributes, and each transformation is a single reduction across
+    the columns of its `dict_retr_vars`. Locations missing any of the needed
+    attributes are skipped.
+
+    :param df_attr: Standard long-format attribute data, e.g. from :func:`fsate.fs_read_attr_comid`
+    :type df_attr: pd.DataFrame
+    :param dict_retr_vars: The attributes needed for each custom variable name
+    :type dict_retr_vars: dict
+    :param dict_func_objs: The transformation function object of each custom variable name
+    :type dict_func_objs: dict
+    :param dict_tfrm_func: The transformation function string of each custom variable name, e.g. 'np.mean'
+    :type dict_tfrm_func: dict
+    :param dict_need_comids: The comids needing each custom variable name, e.g. from
+      :func:`_id_need_tfrm_attrs_bulk`. Default None creates all custom variables for all locations.
+    :type dict_need_comids: dict, optional
+    :raises ValueError: A transformation unexpectedly returned NULL values
+    :return: Standard long-format dataframe of the new custom attributes
+    :rtype: pd.DataFrame
+    """
+    cols_std = ['data_source','dl_timestamp','attribute','value','featureID','featureSource']
+    if df_attr.shape[0] == 0:
+        return pd.DataFrame(columns=cols_std)
+    # Wide matrix: one row per location, one column per attribute
+    df_wide = df_attr.pivot_table(index='featureID', columns='attribute',
+                                  values='value', aggfunc='first', observed=True)
+    ser_src = df_attr.groupby('featureID', observed=True)['featureSource'].first()
+    timestamp = str(datetime.now(timezone.utc))
+
+    ls_df_new = list()
+    for new_var, retr_vars in dict_retr_vars.items():
+        df_sub = df_wide.reindex(columns=list(dict.fromkeys(retr_vars)))
+        mask_cmplt = df_sub.notna().all(axis=1)
+        if dict_need_comids is not None:
+            mask_cmplt &= df_sub.index.isin(dict_need_comids.get(new_var, []))
+        n_skip = int((~df_sub.notna().all(axis=1)).sum())
+        if n_skip > 0:
+            print(f"Skipping {new_var} for {n_skip} locations missing needed attributes")
+        if not mask_cmplt.any():
+            continue
+        df_sub = df_sub.loc[mask_cmplt]
+        vals = _vect_tform_func(dict_func_objs[new_var], df_sub.to_numpy(dtype=float))
+        if np.isnan(vals).any():
+            bad_comids = df_sub.index[np.isnan(vals)]
+            raise ValueError("Unexpected NULL value returned after " +
+                             "aggregating and transforming attributes. " +
+                             f"Inspect {new_var} with comids {', '.join(bad_comids[:10])}")
+        ls_df_new.append(pd.DataFrame({'data_source': _cstm_data_src(dict_tfrm_func[new_var],retr_vars),
+                                       'dl_timestamp': timestamp,
+                                       'attribute': new_var,
+                                       'value': vals,
+                                       'featureID': df_sub.index.astype(str),
+                                       'featureSource': ser_src.reindex(df_sub.index).values}))
+    if len(ls_df_new) == 0:
+        return pd.DataFrame(columns=cols_std)
+    return pd.concat(ls_df_new, ignore_index=True)
+
+def io_std_attrs_bulk(df_new_vars: pd.DataFrame,
+                      dir_db_attrs: str | os.PathLike,
+                      attrtype: str = 'tfrmattr') -> list:
+    """Write/update attributes for many locations in a single pass
+
+    Each location's attributes are written to its standard per-comid file
+    using :func:`io_std_attrs`, and the COMID-to-file index is updated once.
+
+    :param df_new_vars: Standard long-format attribute data for any number of locations
+    :type df_new_vars: pd.DataFrame
+    :param dir_db_attrs: Directory of attribute data
+    :type dir_db_attrs: str | os.PathLike
+    :param attrtype: The type of attribute data, defaults to 'tfrmattr'
+    :type attrtype: str, optional
+    :return: The filepaths written
+    :rtype: list
+    """
+    if df_new_vars.shape[0] == 0:
+        return list()
+    # Bring the COMID-to-file index up to date before new files change the directory
+    fsate.read_attr_file_index(dir_db_attrs)
+    ls_paths = list()
+    for comid, df_comid in df_new_vars.groupby('featureID', sort=False):
+        io_std_attrs(df_new_vars=df_comid, dir_db_attrs=dir_db_attrs, comid=comid,
+                     attrtype=attrtype, update_index=False)
+        ls_paths.append(_std_attr_filepath(dir_db_attrs, comid, 'tfrmattr'))
+    fsate.update_attr_file_index(dir_db_attrs, ls_paths)
+    return ls_paths
+
 #%% missing attributes
 
 def std_miss_path(dir_db_attrs: str | os.PathLike) -> os.PathLike:
@@ -379,6 +530,50 @@ def std_miss_path(dir_db_attrs: str | os.PathLike) -> os.PathLike:
     path_need_attrs.parent.mkdir(parents=True,exist_ok=True)
     return path_need_attrs
 
+def id_missing_comid_attrs(df_attr: pd.DataFrame, comids: Iterable,
+                           attrs: Iterable, path_tfrm_cfig: str | os.PathLike = ''
+                           ) -> pd.DataFrame:
+    """Identify all missing comid-attribute pairings at once
+
+    Builds a boolean presence matrix of comids by attributes from the 
+    (featureID, attribute) pairs that exist, and returns every pairing absent
+    from it, i.e. an anti-join of all needed pairings against the existing pairings.
+
+    :param df_attr: Standard long-format attribute data, e.g. from :func:`fsate.fs_read_attr_comid`
+    :type df_attr: pd.DataFrame
+    :param comids: All location identifiers (comids) needing the attributes
+    :type comids: Iterable
+    :param attrs: All attributes needed for each location
+    :type attrs: Iterable
+    :param path_tfrm_cfig: Filepath of config file. Optional. Used as a descriptor in 
+      missing attributes file writing to help understand which transformation
+      processing config identified missing attributes
+    :type path_tfrm_cfig: str | os.PathLike, optional
+    :return: The missing pairings in the format of :func:`std_miss_path`'s csv, with columns
+      'comid', 'attribute', 'config_file', 'uniq_cmbo', 'dl_dataset'
+    :rtype: pd.DataFrame
+    """
+    idx_comids = pd.Index([str(x) for x in comids]).unique()
+    idx_attrs = pd.Index(list(attrs)).unique()
+
+    # Presence matrix: True where a comid-attribute pairing exists
+    arr_present = np.zeros((len(idx_comids), len(idx_attrs)), dtype=bool)
+    if df_attr.shape[0] > 0:
+        codes_comid = idx_comids.get_indexer(df_attr['featureID'].astype(str))
+        codes_attr = idx_attrs.get_indexer(df_attr['attribute'].astype(str))
+        mask_valid = (codes_comid >= 0) & (codes_attr >= 0)
+        arr_present[codes_comid[mask_valid], codes_attr[mask_valid]] = True
+
+    rows_miss, cols_miss = np.nonzero(~arr_present)
+    comids_miss = idx_comids[rows_miss].astype(str)
+    attrs_miss = idx_attrs[cols_miss].astype(str)
+    df_missing = pd.DataFrame({'comid': comids_miss,
+                               'attribute': attrs_miss,
+                               'config_file': Path(path_tfrm_cfig).name,
+                               'uniq_cmbo': comids_miss + '_' + attrs_miss,
+                               'dl_dataset': np.nan})
+    return df_missing
+
 def write_missing_attrs(attrs_retr_sub:list, dir_db_attrs: str | os.PathLike,
                         comid: str, path_tfrm_cfig: str | os.PathLike = ''):
     """Append missing attributes to file
@@ -22,7 +22,8 @@ setup(
         'scikit-learn',
         'pynhd',
         'dask',
-        'dask_expr'
+        'dask_expr',
+        'pyarrow'
     ],
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -1,2 +1,3 @@
 # __init__.py
-from . import proc_eval_metrics
\ No newline at end of file
+from . import proc_eval_metrics
+from . import proc_ingest
\ No newline at end of file
@@ -18,12 +18,17 @@ from pathlib import Path
 import yaml
 import xarray as xr
 import netCDF4
+import numpy as np
+import numcodecs
+import zarr
 import warnings
 import os
 import shutil
 from importlib import resources as impresources
 from fs_proc import data
-from itertools import compress
+import functools
+import copy
+from concurrent.futures import ThreadPoolExecutor
 import pynhd as nhd
 
 
@@ -33,17 +38,31 @@ def _proc_flatten_ls_of_dict_keys(config: dict, key: str) -> list:
         keys_cs.append(list(v.keys()))
     return [x for xs in keys_cs for x in xs]
 
-def _read_std_config():
-    """Read the standardized categorical mappings used in fs_proc
+@functools.lru_cache(maxsize=1)
+def _load_std_config() -> dict:
+    """Load the standardized categorical mappings once per process
 
     :return: yaml configuration file mappings as a dict of lists of dicts
     :rtype: dict
+    :seealso: :func:`_read_std_config()`
     """
     catg_file = impresources.files(data) / 'fs_categories.yaml'
     with catg_file.open("rt") as f:
         std_config = yaml.safe_load(f)
     return std_config
 
+def _read_std_config():
+    """Read the standardized categorical mappings used in fs_proc
+
+    :return: yaml configuration file mappings as a dict of lists of dicts
+    :rtype: dict
+
+    .. note::
+        The yaml file is only read once. Each call returns a copy of the
+        mappings, so callers may modify it.
+    """
+    return copy.deepcopy(_load_std_config())
+
 def _conv_ls_dicts_df_long(config: dict):
     """transpose the yaml schema's converted dataframe into a long format
 
@@ -53,22 +72,46 @@ def _conv_ls_dicts_df_long(config: dict):
     :return: configuration schema converted to a dataframe
     :rtype: pd.DataFrame
     """
-    # Convert dict of lists into pd.DataFrame
-    ls_form = list()
-    for k, vv in config.items():
-        for v in vv:
-            df_keys = pd.DataFrame(v, index = [0])
-            df_keys.loc[1] = k # 
-            ls_form.append(df_keys)
-    df_all = pd.concat(ls_form, axis=1)
-
-    # transpose and rename cols
-    dft = df_all.transpose()
-    dft.columns = ['description','category']
-    dft.reset_index(inplace=True)
-    dft = dft.rename(columns={'index':'var'})
+    # Convert dict of lists into a long pd.DataFrame of each var's description & category
+    ls_rows = [(var, desc, k) for k, vv in config.items() for v in vv for var, desc in v.items()]
+    dft = pd.DataFrame(ls_rows, columns=['var','description','category'])
     return dft
 
+@functools.lru_cache(maxsize=None)
+def _std_category_vars(category: str) -> tuple:
+    """The standardized variable names of a category, compiled once per process
+
+    :param category: The category of interest, e.g. 'metric' or 'target_var'. Matches
+        each category in fs_categories.yaml containing this string (e.g. 'metric'
+        matches both 'metric_mappings_single_timeseries' and 'metric_mappings_hydrotools')
+    :type category: str
+    :return: The standardized variable names in the order of fs_categories.yaml
+    :rtype: tuple
+    """
+    df_std_config = _conv_ls_dicts_df_long(_load_std_config())
+    sub_std_config = df_std_config[df_std_config['category'].str.contains(category)]
+    return tuple(sub_std_config['var'])
+
+def check_std_fs_ids(dict_vars: dict) -> pd.DataFrame:
+    """
+    Check whether variables across multiple categories are listed in the 
+        standardized fs_categories.yaml, in a single vectorized lookup
+
+    :param dict_vars: The variables of each category, e.g.
+        `{'metric': ['NSE','KGE'], 'target_var': ['Q']}`
+    :type dict_vars: dict
+    :return: long format check with columns 'category', 'var', and 'valid'
+    :rtype: pd.DataFrame
+    :seealso: :func:`_proc_check_std_fs_ids`
+    """
+    df_chck = pd.DataFrame([(catg, var) for catg, vars in dict_vars.items()
+                            for var in ([vars] if isinstance(vars, str) else vars)],
+                           columns=['category','var'])
+    idx_std = pd.MultiIndex.from_tuples([(catg, var) for catg in dict_vars.keys()
+                                         for var in _std_category_vars(catg)],
+                                        names=['category','var'])
+    df_chck['valid'] = pd.MultiIndex.from_frame(df_chck[['category','var']]).isin(idx_std)
+    return df_chck
 
 def _proc_check_input_config(
     config: dict, 
@@ -205,19 +248,15 @@ def _proc_check_std_fs_ids(vars: list, category=['metric','target_var'][0]):
         
     if isinstance(category,list) and len(category)>1:
         raise ValueError(f'Expect {category} to be a single value, not list')
-
-    # Read in the standardized names
-    std_config = _read_std_config()
-    df_std_config = _conv_ls_dicts_df_long(std_config )
-    # Subset the categories (e.g. target_variables or metrics)
-    sub_std_config = df_std_config[df_std_config['category'].str.contains(category)]
+    elif isinstance(category,list):
+        category = category[0]
 
     # Check to make sure that each metric is inside the standardized names
-    bool_chck = [any(sub_std_config['var'] == x) for x in vars]
+    df_chck = check_std_fs_ids({category: vars})
     
-    if not all(bool_chck):
-        bad_vars = list(compress(vars,[not x for x in bool_chck]))
-        allowable_vars = ",".join(sub_std_config['var'])
+    if not df_chck['valid'].all():
+        bad_vars = df_chck.loc[~df_chck['valid'], 'var'].tolist()
+        allowable_vars = ",".join(_std_category_vars(category))
         raise ValueError(f'The following {category} mappings defined in the'
                             ' dataset schema do not correspond to the'
                             f' standardized {category} names:'
@@ -299,10 +338,200 @@ def _proc_check_input_df(df: pd.DataFrame,
 
     return df
 
+def _std_hier_encoding(ds: xr.Dataset, save_type: str, chunk_size: int = 10000,
+                       complevel: int = 4) -> dict:
+    """
+    Generate the chunking & compression encoding for writing a standardized
+        dataset in hierarchical format
+
+    :param ds: The standardized dataset, indexed by 'gage_id'
+    :type ds: xr.Dataset
+    :param save_type: The hierarchical file format, 'netcdf' or 'zarr'
+    :type save_type: str
+    :param chunk_size: The maximum number of gage_ids per chunk, defaults to 10000
+    :type chunk_size: int, optional
+    :param complevel: The compression level (1-9), defaults to 4
+    :type complevel: int, optional
+    :return: The encoding of each numeric data variable, for passing to
+        :meth:`xarray.Dataset.to_netcdf` or :meth:`xarray.Dataset.to_zarr`
+    :rtype: dict
+
+    .. note::
+        Text variables (e.g. basin names) keep the default encoding, because
+        netcdf does not compress variable-length strings.
+    """
+    encoding = dict()
+    for var in ds.data_vars:
+        if not np.issubdtype(ds[var].dtype, np.number):
+            continue
+        chunks = tuple(max(1, min(chunk_size, ds.sizes[dim])) if dim == 'gage_id'
+                       else ds.sizes[dim] for dim in ds[var].dims)
+        if save_type == 'netcdf':
+            encoding[var] = {'zlib': True, 'complevel': complevel,
+                             'chunksizes': chunks}
+        else:
+            encoding[var] = {'compressor': numcodecs.Blosc(cname='zstd', clevel=complevel,
+                                                           shuffle=numcodecs.Blosc.SHUFFLE),
+                             'chunks': chunks}
+    return encoding
+
+def _chunk_std_ds(ds: xr.Dataset, chunk_size: int = 10000) -> xr.Dataset:
+    """
+    Convert the numeric data variables of a standardized dataset into dask-backed
+        chunks of gage_ids, so they may be written one chunk at a time
+
+    :param ds: The standardized dataset, indexed by 'gage_id'
+    :type ds: xr.Dataset
+    :param chunk_size: The maximum number of gage_ids per chunk, defaults to 10000
+    :type chunk_size: int, optional
+    :return: The chunked dataset. Text variables remain in memory, because
+        their storage type is determined from the full array
+    :rtype: xr.Dataset
+    """
+    vars_num = [var for var in ds.data_vars if np.issubdtype(ds[var].dtype, np.number)]
+    return ds.assign({var: ds[var].chunk({'gage_id': chunk_size}) for var in vars_num})
+
+def _append_std_zarr(ds: xr.Dataset, save_path_zarr: str | os.PathLike,
+                     chunk_size: int = 10000, complevel: int = 4):
+    """
+    Append the new gage_ids and new variables (e.g. metrics) of a standardized
+        dataset to an existing zarr store, without rewriting the existing data
+
+    :param ds: The standardized dataset, indexed by 'gage_id'
+    :type ds: xr.Dataset
+    :param save_path_zarr: The existing zarr store
+    :type save_path_zarr: str | os.PathLike
+    :param chunk_size: The maximum number of gage_ids per chunk, defaults to 10000
+    :type chunk_size: int, optional
+    :param complevel: The compression level (1-9) of new variables, defaults to 4
+    :type complevel: int, optional
+
+    .. note::
+        Values of gage_ids & variables that already exist in the store are retained,
+        even if they differ in `ds`. Use `write_mode='overwrite'` to replace them.
+    """
+    ds_old = xr.open_zarr(save_path_zarr)
+    attrs_old = dict(ds_old.attrs)
+    gage_ids_old = pd.Index(ds_old['gage_id'].values)
+    vars_old = list(ds_old.data_vars)
+    dtypes_old = {var: ds_old[var].dtype for var in vars_old}
+    vars_new = [var for var in ds.data_vars if var not in vars_old]
+    ds_old.close()
+
+    # New variables for the existing gage_ids
+    if vars_new:
+        ds_vars = ds[vars_new].reindex(gage_id=gage_ids_old).drop_vars('gage_id')
+        ds_vars = _chunk_std_ds(ds_vars, chunk_size)
+        ds_vars.to_zarr(save_path_zarr, mode='a', consolidated=True,
+                        encoding=_std_hier_encoding(ds_vars, 'zarr', chunk_size, complevel))
+        print(f"Appended {len(vars_new)} new variables: {', '.join(vars_new)}")
+
+    # New gage_ids for all variables
+    is_new_gage = ~ds.indexes['gage_id'].isin(gage_ids_old)
+    n_overlap = int((~is_new_gage).sum())
+    if n_overlap > 0:
+        print(f"Retaining the existing values of {n_overlap} gage_ids already inside {save_path_zarr}")
+    if is_new_gage.any():
+        ds_gages = ds.isel(gage_id=np.flatnonzero(is_new_gage))
+        for var in vars_old:
+            if var not in ds_gages.data_vars: # Fill variables absent from ds
+                fill = np.nan if np.issubdtype(dtypes_old[var], np.number) else ''
+                ds_gages[var] = ('gage_id', np.full(ds_gages.sizes['gage_id'], fill,
+                                                    dtype=dtypes_old[var]))
+        ds_gages = _chunk_std_ds(ds_gages[vars_old + vars_new], chunk_size)
+        ds_gages.to_zarr(save_path_zarr, append_dim='gage_id', consolidated=True)
+        print(f"Appended {int(is_new_gage.sum())} new gage_ids")
+
+    # Appending replaces the store's attributes with those of ds, so restore the combined metadata
+    grp = zarr.open_group(str(save_path_zarr), mode='r+')
+    grp.attrs.clear()
+    grp.attrs.update(_merge_std_attrs(attrs_old, ds.attrs))
+    zarr.consolidate_metadata(str(save_path_zarr))
+
+def _merge_std_attrs(attrs_old: dict, attrs_new: dict) -> dict:
+    """
+    Combine the metadata of an existing standardized dataset with the metadata
+        of data appended to it
+
+    :param attrs_old: The attributes of the existing dataset
+    :type attrs_old: dict
+    :param attrs_new: The attributes of the appended dataset
+    :type attrs_new: dict
+    :return: The existing attributes, with any new attribute keys added and
+        'metric_mappings' & 'metric_cols' holding the ordered union of
+        the existing and appended metrics
+    :rtype: dict
+    """
+    attrs = {**attrs_new, **attrs_old}
+    for key in ['metric_mappings','metric_cols']:
+        ls_vals = [x for val in [attrs_old.get(key), attrs_new.get(key)]
+                   if val for x in str(val).split('|')]
+        if ls_vals:
+            attrs[key] = '|'.join(dict.fromkeys(ls_vals))
+    return attrs
+
+def write_std_hier_ds(ds: xr.Dataset, save_path: str | os.PathLike, save_type: str,
+                      chunk_size: int = 10000, complevel: int = 4,
+                      write_mode: str = 'overwrite'):
+    """
+    Write a standardized dataset in hierarchical format with explicit
+        chunking & compression
+
+    :param ds: The standardized dataset, indexed by 'gage_id'
+    :type ds: xr.Dataset
+    :param save_path: The netcdf file or zarr store path
+    :type save_path: str | os.PathLike
+    :param save_type: The hierarchical file format, 'netcdf' or 'zarr'
+    :type save_type: str
+    :param chunk_size: The maximum number of gage_ids per chunk, defaults to 10000
+    :type chunk_size: int, optional
+    :param complevel: The compression level (1-9), defaults to 4
+    :type complevel: int, optional
+    :param write_mode: 'overwrite' replaces any existing data. 'append' adds the
+        new gage_ids and new variables (e.g. metrics) to existing data, defaults to 'overwrite'
+    :type write_mode: str, optional
+    :raises ValueError: when an unrecognized `save_type` or `write_mode` is provided
+
+    .. note::
+        The dataset is converted into dask-backed chunks of `chunk_size` gage_ids
+        that are written one at a time. A zarr store is only appended with the new
+        data, whereas appending to a netcdf file rewrites the combined file.
+    """
+    if write_mode not in ['overwrite','append']:
+        raise ValueError(f"Unrecognized write_mode: {write_mode}. Expected 'overwrite' or 'append'")
+    if save_type not in ['netcdf','zarr']:
+        raise ValueError(f"Unrecognized hierarchical save_type: {save_type}. Expected 'netcdf' or 'zarr'")
+    save_path = Path(save_path)
+    is_append = write_mode == 'append' and save_path.exists()
+
+    if save_type == 'zarr':
+        if is_append:
+            _append_std_zarr(ds, save_path, chunk_size, complevel)
+            return
+        if save_path.exists():
+            shutil.rmtree(save_path) # Delete any pre-existing zarr data with the same name
+        ds_chunk = _chunk_std_ds(ds, chunk_size)
+        ds_chunk.to_zarr(save_path, mode='w', consolidated=True,
+                         encoding=_std_hier_encoding(ds_chunk, save_type, chunk_size, complevel))
+    else:
+        if is_append:
+            # Existing values take precedence. The combined file is rewritten.
+            with xr.open_dataset(save_path) as ds_old:
+                attrs = _merge_std_attrs(ds_old.attrs, ds.attrs)
+                ds = ds_old.load().combine_first(ds)
+            ds.attrs = attrs
+        ds_chunk = _chunk_std_ds(ds, chunk_size)
+        ds_chunk.to_netcdf(save_path, mode='w',
+                           encoding=_std_hier_encoding(ds_chunk, save_type, chunk_size, complevel))
+
 def proc_col_schema(df: pd.DataFrame, 
                     col_schema_df: pd.DataFrame, 
                     dir_save: str | os.PathLike, 
-                    check_nwis: bool = False) -> xr.Dataset:
+                    check_nwis: bool = False,
+                    chunk_size: int = 10000,
+                    complevel: int = 4,
+                    write_mode: str = 'overwrite',
+                    path_gageid_registry: str | os.PathLike = None) -> xr.Dataset:
     """
     Process model evaluation metrics into individual standardized files 
         and save a standardized metadata file.
@@ -322,6 +551,19 @@ def proc_col_schema(df: pd.DataFrame,
         are missing leading zeros and provides a correction if needed. Also
         expects `col_schema_df['featureSource'] == 'nwissite'`.
     :type check_nwis: bool
+    :param chunk_size: The maximum number of gage_ids per chunk when saving
+        hierarchical file formats, defaults to 10000
+    :type chunk_size: int, optional
+    :param complevel: The compression level (1-9) when saving hierarchical
+        file formats, defaults to 4
+    :type complevel: int, optional
+    :param write_mode: 'overwrite' replaces any existing hierarchical file.
+        'append' adds the new gage_ids and new metrics to the existing file,
+        defaults to 'overwrite'. Refer to :func:`write_std_hier_ds`
+    :type write_mode: str, optional
+    :param path_gageid_registry: path to a csv of known NWIS gage ids, used when
+        `check_nwis` is True. Refer to :func:`check_fix_nwissite_gageids`. Defaults to None.
+    :type path_gageid_registry: str | os.PathLike, optional
     :raises ValueError: when dir_save does not contain the expected directory
         structure in cases when saving non-hierarchical file formats
     :return: dataset of the standardized data/metadata
@@ -386,7 +628,9 @@ def proc_col_schema(df: pd.DataFrame,
             gage_id_col = col_schema_df['gage_id'].values[0],
             featureSource = col_schema_df['featureSource'].values[0], 
             featureID=col_schema_df['featureID'].values[0],
-            replace_orig_gage_id_col=True)
+            replace_orig_gage_id_col=True,
+            path_registry=path_gageid_registry,
+            path_cache=std_gageid_cache_path(dir_save))
         
         check_equal_df = df_new.equals(df)
         if not check_equal_df == None:
@@ -445,22 +689,130 @@ def proc_col_schema(df: pd.DataFrame,
         print(f"Saved files within a sub-directory structure inside {dir_save}")
     elif save_type == 'netcdf':
         save_path_nc = Path(_save_dir_base/Path(f'{uniq_filename}.nc'))
-        ds.to_netcdf(save_path_nc)
+        write_std_hier_ds(ds, save_path_nc, save_type, chunk_size=chunk_size,
+                          complevel=complevel, write_mode=write_mode)
         print(f"Saved netcdf file as {save_path_nc}")
     elif save_type == 'zarr':
         save_path_zarr = Path(_save_dir_base/Path(f'{uniq_filename}_zarr'))
-        if os.path.exists(save_path_zarr):
-            shutil.rmtree(save_path_zarr) # Delete any pre-existing zarr data with the same name
-                                            # (BChoat-THIS MAY BE RISKY)
-        ds.to_zarr(save_path_zarr)   # Re-write to directory
+        write_std_hier_ds(ds, save_path_zarr, save_type, chunk_size=chunk_size,
+                          complevel=complevel, write_mode=write_mode)
         print(f"Saved zarr files inside {save_path_zarr}")
     return ds # Returning not intended use case, but it's an option
 
 
+def std_gageid_cache_path(dir_save: str | os.PathLike) -> Path:
+    """
+    Standardized path of the persistent gage id validation cache
+
+    :param dir_save: Path for saving the standardized metric data, e.g. `dir_save` in :func:`proc_col_schema`
+    :type dir_save: str | os.PathLike
+    :return: path to the cache csv, `Path(dir_save)/'user_data_std'/'gageid_check_cache.csv'`
+    :rtype: Path
+    """
+    return Path(dir_save)/'user_data_std'/'gageid_check_cache.csv'
+
+def _read_gageid_registry(path_registry: str | os.PathLike) -> set:
+    """
+    Read a local registry of known gage ids
+
+    :param path_registry: path to a csv of known gage ids. Uses the 'gage_id'
+        column if it exists, otherwise the first column.
+    :type path_registry: str | os.PathLike
+    :return: The known gage ids
+    :rtype: set
+    """
+    df_reg = pd.read_csv(path_registry, dtype=str)
+    col = 'gage_id' if 'gage_id' in df_reg.columns else df_reg.columns[0]
+    return set(df_reg[col].dropna().str.strip())
+
+def _read_gageid_cache(path_cache: str | os.PathLike, featureSource: str) -> dict:
+    """
+    Read the persistent gage id validation cache
+
+    :param path_cache: path to the cache csv
+    :type path_cache: str | os.PathLike
+    :param featureSource: The featureSource of interest, e.g. 'nwissite'
+    :type featureSource: str
+    :return: mapping of featureID to whether the featureSource recognizes it
+    :rtype: dict
+    """
+    if not Path(path_cache).exists():
+        return dict()
+    df_cache = pd.read_csv(path_cache, dtype={'featureSource':str,'featureID':str,'valid':bool})
+    df_cache = df_cache[df_cache['featureSource'] == featureSource]
+    return dict(zip(df_cache['featureID'], df_cache['valid']))
+
+def _write_gageid_cache(path_cache: str | os.PathLike, featureSource: str, dict_new: dict):
+    """
+    Append newly checked gage ids to the persistent gage id validation cache
+
+    :param path_cache: path to the cache csv
+    :type path_cache: str | os.PathLike
+    :param featureSource: The featureSource, e.g. 'nwissite'
+    :type featureSource: str
+    :param dict_new: mapping of featureID to whether the featureSource recognizes it
+    :type dict_new: dict
+    """
+    if len(dict_new) == 0:
+        return
+    Path(path_cache).parent.mkdir(parents=True, exist_ok=True)
+    df_new = pd.DataFrame({'featureSource': featureSource,
+                           'featureID': list(dict_new.keys()),
+                           'valid': list(dict_new.values())})
+    df_new.to_csv(path_cache, mode='a', header=not Path(path_cache).exists(), index=False)
+
+def _nldi_gageid_resolver(featureSource: str = 'nwissite'):
+    """
+    Generate the default resolver, which checks whether NLDI recognizes a featureID
+
+    :param featureSource: The featureSource, defaults to 'nwissite'
+    :type featureSource: str, optional
+    :return: function of a featureID, returning True if recognized, False if
+        not recognized, or None when the check failed (e.g. a service outage)
+    :rtype: Callable
+    """
+    nldi = nhd.NLDI()
+    def _resolve(fid: str) -> bool | None:
+        try:
+            nldi.navigate_byid(fsource=featureSource,fid=fid,
+                               navigation='upstreamMain',
+                               source='flowlines',
+                               distance=1 # the shortest distance
+                               ).loc[0]['nhdplus_comid']
+            return True
+        except (KeyError, IndexError, nhd.exceptions.ZeroMatchedError): # No match
+            return False
+        except Exception as e: # Could not complete the check
+            print(f"Could not check featureID {fid}: {e}")
+            return None
+    return _resolve
+
+def _resolve_gageids(fids: list, resolver, max_workers: int = 8) -> dict:
+    """
+    Check whether each featureID is recognized, using concurrent resolver calls
+
+    :param fids: The unique featureIDs to check
+    :type fids: list
+    :param resolver: function of a featureID returning True, False, or None. Refer to :func:`_nldi_gageid_resolver`
+    :type resolver: Callable
+    :param max_workers: The maximum number of concurrent checks, defaults to 8
+    :type max_workers: int, optional
+    :return: mapping of featureID to the resolver result
+    :rtype: dict
+    """
+    if len(fids) == 0:
+        return dict()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(fids)))) as executor:
+        return dict(zip(fids, executor.map(resolver, fids)))
+
 def check_fix_nwissite_gageids(df:pd.DataFrame, gage_id_col:str,
                                 featureSource:str = 'nwissite', 
                                 featureID:str='USGS-{gage_id}',
-                                replace_orig_gage_id_col:bool=True) -> pd.DataFrame:
+                                replace_orig_gage_id_col:bool=True,
+                                path_registry: str | os.PathLike = None,
+                                path_cache: str | os.PathLike = None,
+                                max_workers: int = 8,
+                                resolver = None) -> pd.DataFrame:
     """Checks whether USGS gage ID values corresponding to nwissite data follow expected format
 
     :param df: DataFrame containing a column with nwissite gage id column for format checking
@@ -473,47 +825,75 @@ def check_fix_nwissite_gageids(df:pd.DataFrame, gage_id_col:str,
     :type featureID: str, optional
     :param replace_orig_gage_id_col: Should the data inside `df[gage_id_col`] be replaced with the corrected values? If not, an added column named `'fix'` is added, defaults to True
     :type replace_orig_gage_id_col: bool, optional
+    :param path_registry: path to a csv of known gage ids, which are accepted without
+        querying the service. Refer to :func:`_read_gageid_registry`. Defaults to None.
+    :type path_registry: str | os.PathLike, optional
+    :param path_cache: path to the persistent cache csv of previously checked gage ids,
+        e.g. :func:`std_gageid_cache_path`. Defaults to None, meaning no persistent cache.
+    :type path_cache: str | os.PathLike, optional
+    :param max_workers: The maximum number of concurrent service checks, defaults to 8
+    :type max_workers: int, optional
+    :param resolver: function of a featureID returning True if recognized, False if not,
+        or None if the check failed. Defaults to None, meaning the :mod:`pynhd` NLDI service.
+        Refer to :func:`_nldi_gageid_resolver`
+    :type resolver: Callable, optional
     :return: The provided `df`, modified in cases when inappropriate `gage_id_col`'s data format found
     :rtype: pd.DataFrame
 
+    .. note::
+        The gage ids are first checked offline. Gage ids in the registry are valid, and
+        those whose '0'-prefixed value is in the registry are fixed. Digit-only gage ids
+        shorter than the 8-digit minimum of USGS site numbers are zero-padded to 8 digits.
+        Only the remaining gage ids are checked by the `resolver`, followed by a second
+        check of the '0'-prefixed values of those not recognized. Checks are cached in
+        `path_cache`, and failed checks are not cached.
     """
 
     ls_still_bad = list()
     if featureSource == 'nwissite':
-        print(f"Checking {df.shape[0]} total USGS gage station IDs for appropriate nwissite format.")
-        print(f"This may take {round(df.shape[0]/60/3.2,2)} minutes for the first check")
-        nldi = nhd.NLDI()
-        ls_bad_ids = list()
-        for ix, row  in df.iterrows():
-            gid = row[gage_id_col]
-            try:
-                comid = nldi.navigate_byid(fsource=featureSource,fid= featureID.format(gage_id=gid),
-                                        navigation='upstreamMain',
-                                        source='flowlines',
-                                        distance=1 # the shortest distance
-                                        ).loc[0]['nhdplus_comid'] 
-            except: # Could not process this particular gid
-                ls_bad_ids.append(gid)                                                     
-        ls_prezero = ['0'+x for x in ls_bad_ids]
-
-        print(f"Checking whether prepending '0' fixes {len(ls_prezero)} total gage_ids that were not recognized during the first check")
-        print(f"This may take {round(len(ls_prezero)/60/3.2,2)} minutes for the second check.")
-        for prezero in ls_prezero:
-            try:
-                nldi.navigate_byid(fsource=featureSource,fid= featureID.format(gage_id=prezero),
-                                                navigation='upstreamMain',
-                                                source='flowlines',
-                                                distance=1 # the shortest distance
-                                                ).loc[0]['nhdplus_comid']
-            except:
-                ls_still_bad.append(prezero)
-                pass
-
-        
-        if len(ls_bad_ids) > 0:
+        gids = pd.Series(pd.unique(df[gage_id_col].astype(str)), dtype=str)
+        registry = _read_gageid_registry(path_registry) if path_registry else set()
+        dict_fix = dict() # The bad gage ids & their fix
+
+        # Offline format pass
+        is_known = gids.isin(registry)
+        is_short = ~is_known & gids.str.fullmatch(r'\d{1,7}')
+        is_known_prezero = ~is_known & ~is_short & ('0' + gids).isin(registry)
+        dict_fix.update(dict(zip(gids[is_short], gids[is_short].str.zfill(8))))
+        dict_fix.update(dict(zip(gids[is_known_prezero], '0' + gids[is_known_prezero])))
+        gids_check = gids[~(is_known | is_short | is_known_prezero)].tolist()
+        print(f"Checking {len(gids)} total USGS gage station IDs for appropriate nwissite format. "
+              f"{len(gids) - len(gids_check)} resolved offline.")
+
+        if len(gids_check) > 0:
+            dict_cache = _read_gageid_cache(path_cache, featureSource) if path_cache else dict()
+            if resolver is None:
+                resolver = _nldi_gageid_resolver(featureSource)
+            def _check(ls_gids: list) -> dict:
+                fids = {gid: featureID.format(gage_id=gid) for gid in ls_gids}
+                fids_need = [fid for fid in dict.fromkeys(fids.values()) if fid not in dict_cache]
+                print(f"Querying {len(fids_need)} of {len(fids)} gage ids not already cached")
+                dict_new = {fid: bool(v) for fid, v in
+                            _resolve_gageids(fids_need, resolver, max_workers).items()
+                            if v is not None} # Failed checks are not cached
+                dict_cache.update(dict_new)
+                if path_cache:
+                    _write_gageid_cache(path_cache, featureSource, dict_new)
+                return {gid: dict_cache.get(fid, False) for gid, fid in fids.items()}
+
+            dict_valid = _check(gids_check)
+            ls_bad_ids = [gid for gid in gids_check if not dict_valid[gid]]
+            ls_prezero = ['0'+x for x in ls_bad_ids]
+            print(f"Checking whether prepending '0' fixes {len(ls_prezero)} total gage_ids that were not recognized during the first check")
+            dict_valid_prezero = _check(ls_prezero)
+            ls_still_bad = [x for x in ls_prezero if not dict_valid_prezero[x]]
+            dict_fix.update(dict(zip(ls_bad_ids, ls_prezero)))
+
+        if len(dict_fix) > 0:
             print('Some improvements to nwissite IDs found')
-            conv_df = pd.DataFrame({'wrong_id': ls_bad_ids,
-                                    'good_id' : ls_prezero})
+            conv_df = pd.DataFrame({'wrong_id': list(dict_fix.keys()),
+                                    'good_id' : list(dict_fix.values())})
+            df = df.astype({gage_id_col: str}) # Fixed gage ids are strings
             cmbo_df = df.merge(conv_df, left_on = gage_id_col, right_on ='wrong_id', how='left') 
             cmbo_df['fix'] = cmbo_df['good_id']
             cmbo_df.fillna({'fix':cmbo_df[gage_id_col]},inplace=True)
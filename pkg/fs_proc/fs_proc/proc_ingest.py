@@ -0,0 +1,207 @@
+'''
+proc_ingest.py
+
+Helper functions for ingesting evaluation metrics datasets spread across many files
+
+:description: discover per-location source files, reduce each location's files
+    into standardized metrics in parallel, and stream the results into
+    :func:`fs_proc.proc_eval_metrics.proc_col_schema`
+:note: developed using python v3.12
+
+'''
+
+import pandas as pd
+from pathlib import Path
+import os
+import re
+import warnings
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from fs_proc.proc_eval_metrics import proc_col_schema
+
+
+def discover_loc_files(dir_data: str | os.PathLike,
+                       pattern: str = '*',
+                       key_regex: str = r'^(\d+)_') -> dict:
+    """
+    Discover the source files in a directory and group them by location
+
+    :param dir_data: The directory containing the source files
+    :type dir_data: str | os.PathLike
+    :param pattern: The glob pattern of source files, defaults to '*'
+    :type pattern: str, optional
+    :param key_regex: The regular expression whose first group extracts the
+        location key (e.g. a USGS gage id) from each filename. Files that do
+        not match are ignored. Defaults to r'^(\\d+)_', a numeric prefix
+        before the first underscore.
+    :type key_regex: str, optional
+    :return: mapping of each location key to its sorted list of file paths,
+        in sorted key order
+    :rtype: dict
+    """
+    rgx = re.compile(key_regex)
+    dict_files = dict()
+    for path in sorted(Path(dir_data).glob(pattern)):
+        mtch = rgx.search(path.name)
+        if mtch and path.is_file():
+            dict_files.setdefault(mtch.group(1), list()).append(path)
+    return dict(sorted(dict_files.items()))
+
+def _reduce_loc(reducer: Callable, key: str, paths: list,
+                reducer_kwargs: dict) -> pd.DataFrame | None:
+    """
+    Apply the reducer to a single location's files,
+        returning None rather than raising on failure
+
+    :param reducer: function of the location key & its file paths, returning
+        a DataFrame of the standardized data
+    :type reducer: Callable
+    :param key: The location key
+    :type key: str
+    :param paths: The location's file paths
+    :type paths: list
+    :param reducer_kwargs: Additional keyword arguments passed to `reducer`
+    :type reducer_kwargs: dict
+    :return: The reduced data, or None if the reducer failed
+    :rtype: pd.DataFrame | None
+    """
+    try:
+        return reducer(key, paths, **reducer_kwargs)
+    except Exception as e:
+        print(f"Could not reduce the files for {key}: {e}")
+        return None
+
+def reduce_loc_files(dict_files: dict,
+                     reducer: Callable,
+                     reducer_kwargs: dict = None,
+                     n_workers: int = 1) -> pd.DataFrame:
+    """
+    Reduce each location's files into standardized data,
+        optionally in a pool of worker processes
+
+    :param dict_files: mapping of each location key to its file paths,
+        e.g. from :func:`discover_loc_files`
+    :type dict_files: dict
+    :param reducer: function of the location key & its file paths, returning
+        a DataFrame (typically one row per location) of the standardized data.
+        Must be defined at the top level of a module, so it may be pickled into
+        the worker processes.
+    :type reducer: Callable
+    :param reducer_kwargs: Additional keyword arguments passed to `reducer`,
+        defaults to None
+    :type reducer_kwargs: dict, optional
+    :param n_workers: The number of worker processes. Default 1 reduces each
+        location sequentially inside the current process. -1 uses all
+        available cores.
+    :type n_workers: int, optional
+    :return: The reduced data of all locations, concatenated once
+    :rtype: pd.DataFrame
+
+    .. note::
+        Locations whose reducer raises an error are skipped with a warning,
+        so a single malformed file does not stop the ingest.
+    """
+    reducer_kwargs = reducer_kwargs if reducer_kwargs else dict()
+    keys = list(dict_files.keys())
+    ls_paths = [dict_files[k] for k in keys]
+    n_reducer = [reducer] * len(keys)
+    n_kwargs = [reducer_kwargs] * len(keys)
+
+    if n_workers is None or n_workers == 1 or len(keys) <= 1:
+        ls_rslt = list(map(_reduce_loc, n_reducer, keys, ls_paths, n_kwargs))
+    else:
+        n_workers = os.cpu_count() if n_workers < 1 else n_workers
+        n_workers = min(n_workers, len(keys))
+        print(f"Reducing the files of {len(keys)} locations across {n_workers} workers")
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            ls_rslt = list(executor.map(_reduce_loc, n_reducer, keys, ls_paths, n_kwargs,
+                                        chunksize=max(1, len(keys) // (4 * n_workers))))
+
+    keys_bad = [k for k, rslt in zip(keys, ls_rslt) if rslt is None]
+    if keys_bad:
+        warnings.warn(f"Could not reduce the files of {len(keys_bad)} locations: "
+                      f"{', '.join(keys_bad[:10])}{' ...' if len(keys_bad) > 10 else ''}",
+                      UserWarning)
+    ls_df = [rslt for rslt in ls_rslt if rslt is not None]
+    if len(ls_df) == 0:
+        return pd.DataFrame()
+    return pd.concat(ls_df, ignore_index=True)
+
+def ingest_loc_files(dir_data: str | os.PathLike,
+                     reducer: Callable,
+                     col_schema_df: pd.DataFrame,
+                     dir_save: str | os.PathLike,
+                     pattern: str = '*',
+                     key_regex: str = r'^(\d+)_',
+                     reducer_kwargs: dict = None,
+                     n_workers: int = 1,
+                     batch_size: int = None,
+                     write_mode: str = 'overwrite',
+                     **kwargs) -> list:
+    """
+    Ingest an evaluation metrics dataset stored as per-location source files
+        into the standardized format
+
+    :param dir_data: The directory containing the source files
+    :type dir_data: str | os.PathLike
+    :param reducer: function of the location key & its file paths, returning
+        a DataFrame of the standardized data containing the `col_schema_df`
+        gage_id & metric columns. Refer to :func:`reduce_loc_files`
+    :type reducer: Callable
+    :param col_schema_df: The column schema naming convention ingested from
+        the yaml file corresponding to the dataset. Refer to
+        :func:`fs_proc.proc_eval_metrics.read_schm_ls_of_dict`
+    :type col_schema_df: pd.DataFrame
+    :param dir_save: Path for saving the standardized metric data file(s)
+    :type dir_save: str | os.PathLike
+    :param pattern: The glob pattern of source files, defaults to '*'
+    :type pattern: str, optional
+    :param key_regex: The regular expression extracting each location key from
+        the filenames. Refer to :func:`discover_loc_files`
+    :type key_regex: str, optional
+    :param reducer_kwargs: Additional keyword arguments passed to `reducer`,
+        defaults to None
+    :type reducer_kwargs: dict, optional
+    :param n_workers: The number of worker processes, defaults to 1
+    :type n_workers: int, optional
+    :param batch_size: The number of locations reduced & written at once.
+        Defaults to None, meaning all locations are written at once. Batches
+        after the first are appended, which requires a 'zarr' `save_type`.
+        A netcdf file is rewritten by each append, so netcdf output is
+        written at once.
+    :type batch_size: int, optional
+    :param write_mode: The write mode of the first batch, 'overwrite' or
+        'append'. Refer to :func:`fs_proc.proc_eval_metrics.write_std_hier_ds`
+    :type write_mode: str, optional
+    :param kwargs: Additional keyword arguments passed to
+        :func:`fs_proc.proc_eval_metrics.proc_col_schema`, e.g. `check_nwis`
+    :raises ValueError: when batches are requested for a `save_type` other than 'zarr'
+    :return: The location keys successfully ingested
+    :rtype: list
+    """
+    save_type = col_schema_df.loc[0, 'save_type']
+    dict_files = discover_loc_files(dir_data, pattern=pattern, key_regex=key_regex)
+    keys = list(dict_files.keys())
+    print(f"Discovered the files of {len(keys)} locations inside {dir_data}")
+    if batch_size is None or batch_size >= len(keys):
+        batch_size = max(1, len(keys))
+    elif save_type != 'zarr':
+        raise ValueError(f"Writing in batches requires a save_type of 'zarr', not {save_type}. "
+                         "Each netcdf append rewrites the entire file, so set batch_size=None instead.")
+
+    gage_id_col = col_schema_df.loc[0, 'gage_id']
+    ls_keys_done = list()
+    for idx in range(0, len(keys), batch_size):
+        keys_batch = keys[idx:idx + batch_size]
+        df = reduce_loc_files({k: dict_files[k] for k in keys_batch}, reducer,
+                              reducer_kwargs=reducer_kwargs, n_workers=n_workers)
+        if df.empty:
+            continue
+        # proc_col_schema() renames the gage id column of its df inplace
+        keys_df = df[gage_id_col].astype(str).tolist() \
+            if gage_id_col in df.columns else df.index.astype(str).tolist()
+        proc_col_schema(df, col_schema_df, dir_save,
+                        write_mode=write_mode if len(ls_keys_done) == 0 else 'append',
+                        **kwargs)
+        ls_keys_done.extend(keys_df)
+    return ls_keys_done
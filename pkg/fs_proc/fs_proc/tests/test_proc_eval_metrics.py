@@ -24,7 +24,10 @@ import yaml
 import xarray as xr
 from fs_proc.proc_eval_metrics import read_schm_ls_of_dict, proc_col_schema,\
       _proc_check_input_config, _proc_flatten_ls_of_dict_keys, \
-      _proc_check_input_df, _proc_check_std_fs_ids, check_fix_nwissite_gageids
+      _proc_check_input_df, _proc_check_std_fs_ids, check_fix_nwissite_gageids, \
+      write_std_hier_ds, std_gageid_cache_path, check_std_fs_ids, _read_std_config, \
+      _load_std_config
+from fs_proc.proc_ingest import discover_loc_files, reduce_loc_files, ingest_loc_files
 import numpy as np
 from unittest.mock import patch, MagicMock
 import pynhd as nhd
@@ -102,6 +105,73 @@ class TestProcColSchemaHier(unittest.TestCase):
     def test_hier_file_exists(self):
          self.assertTrue(list(Path(dir_save/Path('user_data_std/juliemai-xSSA/')).glob('*/*.zattrs'))[0].is_file())
 
+class TestWriteStdHierDs(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.ds = pd.DataFrame({'gage_id': ['01','02','03'],
+                                'basin_name': ['a','b','c'],
+                                'NSE': [0.1, 0.2, 0.3]}).set_index('gage_id').to_xarray()
+        # An overlapping gage_id, a new gage_id, and a new metric
+        self.ds_add = pd.DataFrame({'gage_id': ['03','04'],
+                                    'basin_name': ['c','d'],
+                                    'NSE': [9.9, 0.4],
+                                    'KGE': [3.0, 4.0]}).set_index('gage_id').to_xarray()
+        self.ds.attrs = {'metric_cols': 'nse', 'metric_mappings': 'NSE', 'dataset_name': 'test'}
+        self.ds_add.attrs = {'metric_cols': 'kge|nse', 'metric_mappings': 'KGE|NSE', 'dataset_name': 'test'}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _check_append(self, save_path, save_type, engine):
+        write_std_hier_ds(self.ds, save_path, save_type, chunk_size=2)
+        write_std_hier_ds(self.ds_add, save_path, save_type, chunk_size=2, write_mode='append')
+        with xr.open_dataset(save_path, engine=engine) as ds_rslt:
+            df_rslt = ds_rslt.to_dataframe().sort_index()
+            attrs_rslt = dict(ds_rslt.attrs)
+            self.assertEqual(ds_rslt['NSE'].encoding['preferred_chunks'], {'gage_id': 2})
+        self.assertEqual(list(df_rslt.index), ['01','02','03','04'])
+        # Existing values are retained
+        np.testing.assert_array_almost_equal(df_rslt['NSE'].values, [0.1, 0.2, 0.3, 0.4])
+        np.testing.assert_array_almost_equal(df_rslt['KGE'].values, [np.nan, np.nan, 3.0, 4.0])
+        self.assertEqual(df_rslt.loc['04','basin_name'], 'd')
+        # The metadata lists the metrics of both writes
+        self.assertEqual(attrs_rslt['metric_mappings'], 'NSE|KGE')
+        self.assertEqual(attrs_rslt['metric_cols'], 'nse|kge')
+        self.assertEqual(attrs_rslt['dataset_name'], 'test')
+
+    def _check_append_metric_only(self, save_path, save_type, engine):
+        ds_kge = self.ds_add[['KGE']]
+        ds_kge.attrs = {'metric_cols': 'kge', 'metric_mappings': 'KGE'}
+        write_std_hier_ds(self.ds, save_path, save_type)
+        write_std_hier_ds(ds_kge, save_path, save_type, write_mode='append')
+        with xr.open_dataset(save_path, engine=engine) as ds_rslt:
+            self.assertEqual(ds_rslt.attrs['metric_mappings'], 'NSE|KGE')
+            self.assertEqual(ds_rslt.attrs['metric_cols'], 'nse|kge')
+            self.assertIn('KGE', ds_rslt.data_vars)
+
+    def test_append_metric_zarr(self):
+        self._check_append_metric_only(Path(self.tmpdir.name)/'test_zarr', 'zarr', 'zarr')
+
+    def test_append_metric_netcdf(self):
+        self._check_append_metric_only(Path(self.tmpdir.name)/'test.nc', 'netcdf', 'netcdf4')
+
+    def test_append_zarr(self):
+        self._check_append(Path(self.tmpdir.name)/'test_zarr', 'zarr', 'zarr')
+
+    def test_append_netcdf(self):
+        self._check_append(Path(self.tmpdir.name)/'test.nc', 'netcdf', 'netcdf4')
+
+    def test_overwrite(self):
+        save_path = Path(self.tmpdir.name)/'test_zarr'
+        write_std_hier_ds(self.ds, save_path, 'zarr')
+        write_std_hier_ds(self.ds_add, save_path, 'zarr')
+        with xr.open_dataset(save_path, engine='zarr') as ds_rslt:
+            self.assertEqual(list(ds_rslt['gage_id'].values), ['03','04'])
+
+    def test_bad_write_mode(self):
+        with self.assertRaises(ValueError):
+            write_std_hier_ds(self.ds, Path(self.tmpdir.name)/'test_zarr', 'zarr', write_mode='update')
+
 class TestProcCheckInputDf(unittest.TestCase):
     global test_df
     global raw_test_df
@@ -136,6 +206,23 @@ class TestProcCheckStdFsIds(unittest.TestCase):
     def test_atomic_var(self,mock_print):
         _proc_check_std_fs_ids(vars= 'NSE', category = 'metric')
         mock_print.assert_called_with('The metric mappings from the dataset schema match expected format.')
+
+    def test_batch(self):
+        df_chck = check_std_fs_ids({'metric': ['NSE','notavar','KGE'], 'target_var': 'Q'})
+        self.assertListEqual(df_chck['var'].tolist(), ['NSE','notavar','KGE','Q'])
+        self.assertListEqual(df_chck['valid'].tolist(), [True, False, True, True])
+        # Standard names of another category are not valid
+        self.assertFalse(check_std_fs_ids({'target_var': ['NSE']})['valid'].iloc[0])
+
+    def test_config_read_once(self):
+        _load_std_config()
+        with patch('yaml.safe_load') as mock_load:
+            std_config = _read_std_config()
+            _proc_check_std_fs_ids(vars=['NSE','KGE'], category='metric')
+        mock_load.assert_not_called()
+        # Callers receive a copy
+        std_config.clear()
+        self.assertIn('target_var_mappings', _read_std_config())
     
 class TestProcCheckInputConfig(unittest.TestCase):
     
@@ -302,5 +389,129 @@ class TestCheckFixNwissiteGageIds(unittest.TestCase):
         
         # Assertions
         self.assertTrue(result_df.empty)  # Should return an empty DataFrame
+class TestCheckFixNwissiteGageIdsOffline(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        # A local stub of the NLDI service, which recognizes these featureIDs
+        self.known = {'USGS-01013500', 'USGS-012345678', 'USGS-87654321'}
+        self.ls_calls = list()
+        def _stub_resolver(fid):
+            self.ls_calls.append(fid)
+            return fid in self.known
+        self.resolver = _stub_resolver
+        self.df = pd.DataFrame({'basin_id': ['1013500', '12345678', '87654321', '99999999']})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_format_pass_and_resolver(self):
+        with self.assertWarns(UserWarning):
+            result_df = check_fix_nwissite_gageids(self.df, gage_id_col='basin_id',
+                                                   resolver=self.resolver, max_workers=2)
+        self.assertListEqual(result_df['basin_id'].tolist(),
+                             ['01013500', '012345678', '87654321', '099999999'])
+        # The 7-digit gage id is zero-padded without querying the service
+        self.assertNotIn('USGS-1013500', self.ls_calls)
+        self.assertEqual(len(self.ls_calls), 5)
+
+    def test_registry(self):
+        path_registry = Path(self.tmpdir.name)/'registry.csv'
+        pd.DataFrame({'gage_id': ['012345678', '87654321', '099999999']}).to_csv(path_registry, index=False)
+        result_df = check_fix_nwissite_gageids(self.df, gage_id_col='basin_id',
+                                               path_registry=path_registry,
+                                               resolver=self.resolver)
+        self.assertListEqual(result_df['basin_id'].tolist(),
+                             ['01013500', '012345678', '87654321', '099999999'])
+        self.assertEqual(self.ls_calls, [])
+
+    def test_persistent_cache(self):
+        path_cache = std_gageid_cache_path(self.tmpdir.name)
+        with self.assertWarns(UserWarning):
+            check_fix_nwissite_gageids(self.df, gage_id_col='basin_id',
+                                       path_cache=path_cache, resolver=self.resolver)
+        self.assertTrue(path_cache.exists())
+        self.ls_calls.clear()
+        with self.assertWarns(UserWarning):
+            result_df = check_fix_nwissite_gageids(self.df, gage_id_col='basin_id',
+                                                   path_cache=path_cache, resolver=self.resolver)
+        self.assertEqual(self.ls_calls, [])
+        self.assertEqual(result_df['basin_id'].iloc[1], '012345678')
+
+    def test_failed_checks_not_cached(self):
+        path_cache = std_gageid_cache_path(self.tmpdir.name)
+        with self.assertWarns(UserWarning):
+            check_fix_nwissite_gageids(self.df, gage_id_col='basin_id', path_cache=path_cache,
+                                       resolver=lambda fid: None)
+        self.assertFalse(path_cache.exists())
+
+def _reduce_test_gage(gage_id, paths, metrics):
+    # Temporally aggregate a single gage's daily metrics, as a top-level (picklable) reducer
+    dat = pd.concat([pd.read_csv(path) for path in paths])
+    df = dat[metrics].mean().to_frame().transpose()
+    df['basin_id'] = gage_id
+    return df
+
+class TestIngestLocFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir_data = Path(self.tmpdir.name)/'data'
+        self.dir_data.mkdir()
+        self.gage_ids = ['01013500', '01022500', '01030500', '01031500']
+        for idx, gid in enumerate(self.gage_ids):
+            for part in ['a', 'b']:
+                pd.DataFrame({'date': ['2000-01-01', '2000-01-02'],
+                              'nse': [0.1*idx, 0.1*idx + 0.2],
+                              'rmse': [float(idx), float(idx)],
+                              'kge': [0.5, 0.7]}).to_csv(self.dir_data/f'{gid}_{part}.csv', index=False)
+        # Files without a location key are ignored
+        pd.DataFrame({'nse': [1.0]}).to_csv(self.dir_data/'readme.csv', index=False)
+        self.reducer_kwargs = {'metrics': ['nse','rmse','kge']}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_discover(self):
+        dict_files = discover_loc_files(self.dir_data, pattern='*.csv')
+        self.assertListEqual(list(dict_files.keys()), self.gage_ids)
+        self.assertListEqual([x.name for x in dict_files['01013500']],
+                             ['01013500_a.csv', '01013500_b.csv'])
+
+    def test_serial_parallel_identical(self):
+        dict_files = discover_loc_files(self.dir_data, pattern='*.csv')
+        df_serial = reduce_loc_files(dict_files, _reduce_test_gage, self.reducer_kwargs)
+        df_par = reduce_loc_files(dict_files, _reduce_test_gage, self.reducer_kwargs, n_workers=2)
+        pd.testing.assert_frame_equal(df_serial, df_par)
+        self.assertListEqual(df_serial['basin_id'].tolist(), self.gage_ids)
+        np.testing.assert_array_almost_equal(df_serial['nse'].values, [0.1, 0.2, 0.3, 0.4])
+
+    def test_bad_file_skipped(self):
+        pd.DataFrame({'date': ['2000-01-01']}).to_csv(self.dir_data/'09999999_a.csv', index=False)
+        dict_files = discover_loc_files(self.dir_data, pattern='*.csv')
+        with self.assertWarns(UserWarning):
+            df = reduce_loc_files(dict_files, _reduce_test_gage, self.reducer_kwargs)
+        self.assertNotIn('09999999', df['basin_id'].tolist())
+
+    def test_ingest_batches(self):
+        zarr_config_df = exp_config_df.copy()
+        zarr_config_df['save_type'] = 'zarr'
+        dir_save_ingest = Path(self.tmpdir.name)/'save'
+        keys = ingest_loc_files(self.dir_data, _reduce_test_gage, zarr_config_df, dir_save_ingest,
+                                pattern='*.csv', reducer_kwargs=self.reducer_kwargs,
+                                batch_size=3)
+        self.assertListEqual(keys, self.gage_ids)
+        path_zarr = list(Path(dir_save_ingest/'user_data_std/juliemai-xSSA/').glob('*_zarr'))[0]
+        with xr.open_dataset(path_zarr, engine='zarr') as ds_rslt:
+            self.assertListEqual(sorted(ds_rslt['gage_id'].values.tolist()), self.gage_ids)
+            self.assertListEqual(sorted(ds_rslt.data_vars), ['KGE','NSE','RMSE'])
+
+    def test_batches_need_zarr(self):
+        nc_config_df = exp_config_df.copy()
+        nc_config_df['save_type'] = 'netcdf'
+        for config_df in [exp_config_df, nc_config_df]:
+            with self.assertRaises(ValueError):
+                ingest_loc_files(self.dir_data, _reduce_test_gage, config_df,
+                                 Path(self.tmpdir.name)/'save', pattern='*.csv',
+                                 reducer_kwargs=self.reducer_kwargs, batch_size=2)
+
 if __name__ == '__main__':
     unittest.main()
@@ -14,6 +14,7 @@ setup(
     description="A simple package for processing data in the formulation selection decision support tool",
     packages=find_packages(),
     install_requires=[ 
+        'dask',
         'pandas',
         'pyyaml',
         'wheel',
@@ -0,0 +1,204 @@
+'''
+@title: Micro-benchmarks of the fs_algo and fs_proc hot paths
+@description: Times attribute reading, reshaping, de-duplication & transformation,
+    algorithm training & prediction, and standardized metric writing on synthetic
+    data, for each combination of COMID & attribute counts. Each run appends its
+    timings to a csv alongside the git commit, so results may be compared across commits.
+@usage: python bench_hot_paths.py --n_comids 500 5000 --n_attrs 20 100 --path_out bench_results.csv
+    python bench_hot_paths.py --path_out bench_results.csv --compare <git hash>
+
+Changelog/contributions
+    2026-10-18 Originally created
+'''
+import argparse
+import copy
+import subprocess
+import tempfile
+import time
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import sklearn
+import fs_algo.fs_algo_train_eval as fsate
+import fs_algo.tfrm_attr as fta
+from fs_algo.synth_attr_db import gen_synth_attr_db
+from fs_proc.proc_eval_metrics import read_schm_ls_of_dict, proc_col_schema
+
+DIR_REPO = Path(__file__).resolve().parents[2]
+PATH_SCHEMA_TEST = DIR_REPO/'pkg/fs_proc/fs_proc/tests/user_data_schema.yaml'
+
+def git_commit(dir_repo: Path = DIR_REPO) -> str:
+    """
+    The git commit of the benchmarked code, suffixed with '-dirty' if uncommitted changes exist
+
+    :param dir_repo: The repository directory, defaults to DIR_REPO
+    :type dir_repo: Path, optional
+    :return: the short commit hash, or 'unknown' outside of a git repository
+    :rtype: str
+    """
+    try:
+        commit = subprocess.run(['git','rev-parse','--short','HEAD'], cwd=dir_repo,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git','status','--porcelain','--untracked-files=no'], cwd=dir_repo,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return 'unknown'
+    return f'{commit}-dirty' if dirty else commit
+
+def time_func(func, repeat: int = 3) -> dict:
+    """
+    Time a function call
+
+    :param func: The function of no arguments to time
+    :type func: Callable
+    :param repeat: The number of timed calls, defaults to 3
+    :type repeat: int, optional
+    :return: the minimum & median elapsed seconds
+    :rtype: dict
+    """
+    ls_secs = list()
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        ls_secs.append(time.perf_counter() - t0)
+    return {'min_s': min(ls_secs), 'median_s': float(np.median(ls_secs))}
+
+def bench_case(n_comids: int, n_attrs: int, dir_tmp: Path, repeat: int = 3,
+               benches: list | None = None) -> list:
+    """
+    Run the micro-benchmarks for a single combination of COMID & attribute counts
+
+    :param n_comids: The number of COMIDs
+    :type n_comids: int
+    :param n_attrs: The number of attributes
+    :type n_attrs: int
+    :param dir_tmp: A scratch directory for the synthetic data & outputs
+    :type dir_tmp: Path
+    :param repeat: The number of timed calls of each benchmark, defaults to 3
+    :type repeat: int, optional
+    :param benches: The benchmark names to run, defaults to None meaning all
+    :type benches: list | None, optional
+    :return: the timings of each benchmark, one dict per benchmark
+    :rtype: list
+    """
+    dir_db_attrs = dir_tmp/'attrs'
+    gen_synth_attr_db(dir_db_attrs, n_comids, n_attrs, frac_dupes=0.05)
+    df_attr_dupes = pd.read_parquet(dir_db_attrs)
+    df_attr = df_attr_dupes.drop_duplicates(subset=['featureID','attribute'], keep='first')
+    comids = df_attr['featureID'].unique().tolist()
+    attrs = df_attr['attribute'].unique().tolist()
+    fsate.fs_compact_attr_store(dir_db_attrs)
+
+    # Transformation aggregation: the mean of each consecutive group of 5 attributes
+    dict_retr_vars = {f'tfrm_mean_{idx}': attrs[idx:idx+5] for idx in range(0, n_attrs, 5)}
+    dict_func_objs = {k: np.mean for k in dict_retr_vars.keys()}
+    dict_tfrm_func = {k: 'np.mean' for k in dict_retr_vars.keys()}
+
+    # Algorithm training & prediction on a synthetic response of the attributes
+    df_wide = fsate.AttrWideMatrix.from_df_attr(df_attr).wide_df()
+    rng = np.random.default_rng(32)
+    df_wide['metric'] = df_wide[attrs[:5]].sum(axis=1) + rng.normal(0, 0.1, n_comids)
+    algo_config = {'rf': [{'n_estimators': 50}]}
+    dir_out_alg_ds = dir_tmp/'algo'
+    dir_out_alg_ds.mkdir(exist_ok=True)
+    def _train_eval():
+        train_eval = fsate.AlgoTrainEval(df=df_wide, attrs=attrs, algo_config=copy.deepcopy(algo_config),
+                                         dir_out_alg_ds=dir_out_alg_ds, dataset_id='bench',
+                                         metr='metric', test_size=0.3, rs=32, n_jobs=1)
+        train_eval.train_eval()
+        return train_eval
+    path_algo = fsate.std_algo_path(dir_out_alg_ds, 'rf', 'metric', 'bench')
+    X_pred = df_wide[attrs]
+
+    # Standardized metric writing
+    col_schema_df = read_schm_ls_of_dict(PATH_SCHEMA_TEST)
+    df_metr = pd.DataFrame({'basin_id': [f'{x:08d}' for x in range(n_comids)],
+                            'nse': rng.random(n_comids), 'rmse': rng.random(n_comids),
+                            'kge': rng.random(n_comids)})
+    def _proc_col_schema(save_type):
+        col_schema_save = col_schema_df.copy()
+        col_schema_save['save_type'] = save_type
+        return lambda: proc_col_schema(df_metr.copy(), col_schema_save, dir_tmp/'metrics')
+
+    dict_bench = {
+        'fs_read_attr_comid_all': lambda: fsate.fs_read_attr_comid(dir_db_attrs, comids, read_type='all'),
+        'fs_read_attr_comid_filename': lambda: fsate.fs_read_attr_comid(dir_db_attrs, comids, read_type='filename'),
+        'fs_read_attr_comid_store': lambda: fsate.fs_read_attr_comid(dir_db_attrs, comids, read_type='store'),
+        'pivot_long_wide': lambda: fsate.AttrWideMatrix.from_df_attr(df_attr),
+        'check_attr_rm_dupes': lambda: fsate._check_attr_rm_dupes(df_attr_dupes),
+        'tfrm_attrs_bulk': lambda: fta.tfrm_attrs_bulk(df_attr, dict_retr_vars, dict_func_objs, dict_tfrm_func),
+        'train_eval_rf': _train_eval,
+        'predict_rf': lambda: fsate.load_algo_pipeline(path_algo).predict(X_pred),
+        'proc_col_schema_netcdf': _proc_col_schema('netcdf'),
+        'proc_col_schema_zarr': _proc_col_schema('zarr'),
+    }
+    if benches:
+        dict_bench = {k: v for k, v in dict_bench.items() if k in benches}
+    if 'predict_rf' in dict_bench and not path_algo.exists():
+        _train_eval()
+
+    ls_rslt = list()
+    for name, func in dict_bench.items():
+        print(f"   {name}: {n_comids} comids x {n_attrs} attributes")
+        ls_rslt.append({'bench': name, 'n_comids': n_comids, 'n_attrs': n_attrs,
+                        'repeat': repeat, **time_func(func, repeat)})
+    return ls_rslt
+
+def compare_commits(df_rslt: pd.DataFrame, commit_base: str) -> pd.DataFrame:
+    """
+    Compare the latest timings of each commit against a baseline commit
+
+    :param df_rslt: The benchmark results, e.g. as appended to `--path_out`
+    :type df_rslt: pd.DataFrame
+    :param commit_base: The baseline git commit
+    :type commit_base: str
+    :return: the minimum seconds of each benchmark case & commit, with the
+        speedup relative to the baseline commit
+    :rtype: pd.DataFrame
+    """
+    cols_case = ['bench','n_comids','n_attrs']
+    df_last = df_rslt.sort_values('timestamp').groupby(cols_case + ['commit']).last().reset_index()
+    df_base = df_last.loc[df_last['commit'] == commit_base, cols_case + ['min_s']]
+    if df_base.empty:
+        raise ValueError(f"No benchmark results exist for the baseline commit {commit_base}")
+    df_cmpr = df_last.merge(df_base, on=cols_case, suffixes=('', '_base'))
+    df_cmpr['speedup'] = df_cmpr['min_s_base'] / df_cmpr['min_s']
+    return df_cmpr[cols_case + ['commit','min_s','min_s_base','speedup']]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Micro-benchmark the fs_algo and fs_proc hot paths.')
+    parser.add_argument('--n_comids', type=int, nargs='+', default=[500, 5000], help='The COMID counts to benchmark')
+    parser.add_argument('--n_attrs', type=int, nargs='+', default=[20, 100], help='The attribute counts to benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='The number of timed calls of each benchmark')
+    parser.add_argument('--benches', type=str, nargs='+', default=None, help='Subset of benchmark names to run. Default runs all.')
+    parser.add_argument('--path_out', type=str, default='bench_results.csv', help='The csv that timings are appended to')
+    parser.add_argument('--compare', type=str, default=None, help='A git commit in --path_out to compare the latest timings against')
+    args = parser.parse_args()
+
+    path_out = Path(args.path_out)
+    commit = git_commit()
+    dict_meta = {'commit': commit,
+                 'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                 'python': platform.python_version(),
+                 'pandas': pd.__version__,
+                 'sklearn': sklearn.__version__,
+                 'machine': platform.node()}
+    print(f"Benchmarking commit {commit}")
+
+    ls_rslt = list()
+    for n_comids in args.n_comids:
+        for n_attrs in args.n_attrs:
+            with tempfile.TemporaryDirectory() as dir_tmp:
+                ls_rslt.extend(bench_case(n_comids, n_attrs, Path(dir_tmp),
+                                          repeat=args.repeat, benches=args.benches))
+    df_new = pd.DataFrame(ls_rslt).assign(**dict_meta)
+    print(df_new[['bench','n_comids','n_attrs','min_s','median_s']].to_string(index=False))
+
+    df_new.to_csv(path_out, mode='a', header=not path_out.exists(), index=False)
+    print(f"Appended benchmark results to {path_out}")
+
+    if args.compare:
+        df_cmpr = compare_commits(pd.read_csv(path_out, dtype={'commit': str}), args.compare)
+        print(df_cmpr.to_string(index=False))